@@ -13,7 +13,6 @@ from time import sleep, time
 from subprocess import Popen, run as srun
 from os import remove as osremove, path as ospath, environ, getcwd
 from aria2p import API as ariaAPI, Client as ariaClient
-from qbittorrentapi import Client as qbClient
 from socket import setdefaulttimeout
 from logging import (
     getLogger,
@@ -28,6 +27,9 @@ from logging import (
     warning as log_warning,
 )
 from uvloop import install
+from bot.helper.ext_utils.bootstrap import Bootstrap
+from bot.helper.ext_utils.qbit_client import qbit_client
+from bot.helper.ext_utils.task_registry import TaskRegistry
 
 # from faulthandler import enable as faulthandler_enable
 # faulthandler_enable()
@@ -65,8 +67,6 @@ shorteners_list = []
 categories_dict = {}
 aria2_options = {}
 qbit_options = {}
-queued_dl = {}
-queued_up = {}
 bot_cache = {}
 bot_cache["pkgs"] = ["7z", "rclone", "ffmpeg"]
 non_queued_dl = set()
@@ -85,7 +85,7 @@ status_reply_dict_lock = Lock()
 queue_dict_lock = Lock()
 qb_listener_lock = Lock()
 status_reply_dict = {}
-download_dict = {}
+download_dict = TaskRegistry()
 rss_dict = {}
 
 BOT_TOKEN = environ.get("BOT_TOKEN", "")
@@ -95,6 +95,22 @@ if len(BOT_TOKEN) == 0:
 
 bot_id = BOT_TOKEN.split(":", 1)[0]
 
+bootstrap = Bootstrap()
+
+
+def extract_accounts():
+    if ospath.exists("accounts"):
+        srun(["rm", "-rf", "accounts"])
+    srun(["7z", "x", "-o.", "-aoa", "accounts.zip", "accounts/*.json"])
+    srun(["chmod", "-R", "777", "accounts"])
+    osremove("accounts.zip")
+
+
+# daemons boot while the config, database and telegram clients load
+bootstrap.launch(
+    "qbittorrent", srun, ["qbittorrent-nox", "-d", f"--profile={getcwd()}"]
+)
+
 DATABASE_URL = environ.get("DATABASE_URL", "")
 if len(DATABASE_URL) == 0:
     DATABASE_URL = ""
@@ -138,6 +154,17 @@ if DATABASE_URL:
 else:
     config_dict = {}
 
+# .netrc and accounts.zip may have just been restored from the database
+if not ospath.exists(".netrc"):
+    with open(".netrc", "w"):
+        pass
+srun(["chmod", "600", ".netrc"])
+srun(["cp", ".netrc", "/root/.netrc"])
+srun(["chmod", "+x", "aria.sh"])
+bootstrap.launch("aria2", srun, "./aria.sh", shell=True)
+if ospath.exists("accounts.zip"):
+    bootstrap.launch("accounts", extract_accounts)
+
 OWNER_ID = environ.get("OWNER_ID", "")
 if len(OWNER_ID) == 0:
     log_error("OWNER_ID variable is missing! Exiting now")
@@ -388,6 +415,18 @@ QUEUE_DOWNLOAD = "" if len(QUEUE_DOWNLOAD) == 0 else int(QUEUE_DOWNLOAD)
 QUEUE_UPLOAD = environ.get("QUEUE_UPLOAD", "")
 QUEUE_UPLOAD = "" if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+QUEUE_CPU = environ.get("QUEUE_CPU", "")
+QUEUE_CPU = "" if len(QUEUE_CPU) == 0 else int(QUEUE_CPU)
+
+EXECUTOR_IO_LONG = environ.get("EXECUTOR_IO_LONG", "")
+EXECUTOR_IO_LONG = int(EXECUTOR_IO_LONG) if EXECUTOR_IO_LONG.isdigit() else 64
+
+EXECUTOR_IO_SHORT = environ.get("EXECUTOR_IO_SHORT", "")
+EXECUTOR_IO_SHORT = int(EXECUTOR_IO_SHORT) if EXECUTOR_IO_SHORT.isdigit() else 32
+
+EXECUTOR_CPU = environ.get("EXECUTOR_CPU", "")
+EXECUTOR_CPU = int(EXECUTOR_CPU) if EXECUTOR_CPU.isdigit() else 0
+
 INCOMPLETE_TASK_NOTIFIER = environ.get("INCOMPLETE_TASK_NOTIFIER", "")
 INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == "true"
 
@@ -418,6 +457,9 @@ SHOW_MEDIAINFO = SHOW_MEDIAINFO.lower() == "true"
 SCREENSHOTS_MODE = environ.get("SCREENSHOTS_MODE", "")
 SCREENSHOTS_MODE = SCREENSHOTS_MODE.lower() == "true"
 
+SCREENSHOTS_SHEET = environ.get("SCREENSHOTS_SHEET", "")
+SCREENSHOTS_SHEET = SCREENSHOTS_SHEET.lower() == "true"
+
 SOURCE_LINK = environ.get("SOURCE_LINK", "")
 SOURCE_LINK = SOURCE_LINK.lower() == "true"
 
@@ -430,6 +472,17 @@ EQUAL_SPLITS = EQUAL_SPLITS.lower() == "true"
 MEDIA_GROUP = environ.get("MEDIA_GROUP", "")
 MEDIA_GROUP = MEDIA_GROUP.lower() == "true"
 
+LEECH_PARALLEL_UPLOADS = environ.get("LEECH_PARALLEL_UPLOADS", "")
+LEECH_PARALLEL_UPLOADS = (
+    int(LEECH_PARALLEL_UPLOADS) if LEECH_PARALLEL_UPLOADS.isdigit() else 1
+)
+
+UPLOAD_DEDUPE = environ.get("UPLOAD_DEDUPE", "")
+UPLOAD_DEDUPE = UPLOAD_DEDUPE.lower() == "true"
+
+UPLOAD_DEDUPE_VERIFY = environ.get("UPLOAD_DEDUPE_VERIFY", "")
+UPLOAD_DEDUPE_VERIFY = UPLOAD_DEDUPE_VERIFY.lower() == "true"
+
 BASE_URL_PORT = environ.get("BASE_URL_PORT", "")
 BASE_URL_PORT = 80 if len(BASE_URL_PORT) == 0 else int(BASE_URL_PORT)
 
@@ -453,6 +506,13 @@ RCLONE_SERVE_URL = environ.get("RCLONE_SERVE_URL", "")
 if len(RCLONE_SERVE_URL) == 0:
     RCLONE_SERVE_URL = ""
 
+RCLONE_RCD = environ.get("RCLONE_RCD", "")
+RCLONE_RCD = RCLONE_RCD.lower() == "true"
+
+RCLONE_RCD_BWLIMIT = environ.get("RCLONE_RCD_BWLIMIT", "")
+if len(RCLONE_RCD_BWLIMIT) == 0:
+    RCLONE_RCD_BWLIMIT = ""
+
 RCLONE_SERVE_PORT = environ.get("RCLONE_SERVE_PORT", "")
 RCLONE_SERVE_PORT = 8080 if len(RCLONE_SERVE_PORT) == 0 else int(RCLONE_SERVE_PORT)
 
@@ -473,6 +533,16 @@ TORRENT_LIMIT = "" if len(TORRENT_LIMIT) == 0 else float(TORRENT_LIMIT)
 DIRECT_LIMIT = environ.get("DIRECT_LIMIT", "")
 DIRECT_LIMIT = "" if len(DIRECT_LIMIT) == 0 else float(DIRECT_LIMIT)
 
+DIRECT_PARALLEL_DOWNLOADS = environ.get("DIRECT_PARALLEL_DOWNLOADS", "")
+DIRECT_PARALLEL_DOWNLOADS = (
+    int(DIRECT_PARALLEL_DOWNLOADS) if DIRECT_PARALLEL_DOWNLOADS.isdigit() else 4
+)
+
+DIRECT_DOWNLOAD_RETRIES = environ.get("DIRECT_DOWNLOAD_RETRIES", "")
+DIRECT_DOWNLOAD_RETRIES = (
+    int(DIRECT_DOWNLOAD_RETRIES) if DIRECT_DOWNLOAD_RETRIES.isdigit() else 2
+)
+
 YTDLP_LIMIT = environ.get("YTDLP_LIMIT", "")
 YTDLP_LIMIT = "" if len(YTDLP_LIMIT) == 0 else float(YTDLP_LIMIT)
 
@@ -563,6 +633,12 @@ GD_INFO = environ.get("GD_INFO", "")
 if len(GD_INFO) == 0:
     GD_INFO = "Uploaded by WZML-X"
 
+GD_CLONE_WORKERS = environ.get("GD_CLONE_WORKERS", "")
+GD_CLONE_WORKERS = int(GD_CLONE_WORKERS) if GD_CLONE_WORKERS.isdigit() else 8
+
+GD_UPLOAD_WORKERS = environ.get("GD_UPLOAD_WORKERS", "")
+GD_UPLOAD_WORKERS = int(GD_UPLOAD_WORKERS) if GD_UPLOAD_WORKERS.isdigit() else 4
+
 SAVE_MSG = environ.get("SAVE_MSG", "")
 SAVE_MSG = SAVE_MSG.lower() == "true"
 
@@ -659,6 +735,8 @@ config_dict = {
     "STORAGE_THRESHOLD": STORAGE_THRESHOLD,
     "TORRENT_LIMIT": TORRENT_LIMIT,
     "DIRECT_LIMIT": DIRECT_LIMIT,
+    "DIRECT_PARALLEL_DOWNLOADS": DIRECT_PARALLEL_DOWNLOADS,
+    "DIRECT_DOWNLOAD_RETRIES": DIRECT_DOWNLOAD_RETRIES,
     "YTDLP_LIMIT": YTDLP_LIMIT,
     "GDRIVE_LIMIT": GDRIVE_LIMIT,
     "CLONE_LIMIT": CLONE_LIMIT,
@@ -688,6 +766,8 @@ config_dict = {
     "TITLE_NAME": TITLE_NAME,
     "TIMEZONE": TIMEZONE,
     "GD_INFO": GD_INFO,
+    "GD_CLONE_WORKERS": GD_CLONE_WORKERS,
+    "GD_UPLOAD_WORKERS": GD_UPLOAD_WORKERS,
     "GDTOT_CRYPT": GDTOT_CRYPT,
     "JIODRIVE_TOKEN": JIODRIVE_TOKEN,
     "EQUAL_SPLITS": EQUAL_SPLITS,
@@ -708,6 +788,9 @@ config_dict = {
     "TOKEN_TIMEOUT": TOKEN_TIMEOUT,
     "MDL_TEMPLATE": MDL_TEMPLATE,
     "MEDIA_GROUP": MEDIA_GROUP,
+    "LEECH_PARALLEL_UPLOADS": LEECH_PARALLEL_UPLOADS,
+    "UPLOAD_DEDUPE": UPLOAD_DEDUPE,
+    "UPLOAD_DEDUPE_VERIFY": UPLOAD_DEDUPE_VERIFY,
     "MEGA_EMAIL": MEGA_EMAIL,
     "MEGA_PASSWORD": MEGA_PASSWORD,
     "METADATA": METADATA,
@@ -715,9 +798,15 @@ config_dict = {
     "QUEUE_ALL": QUEUE_ALL,
     "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
     "QUEUE_UPLOAD": QUEUE_UPLOAD,
+    "QUEUE_CPU": QUEUE_CPU,
+    "EXECUTOR_IO_LONG": EXECUTOR_IO_LONG,
+    "EXECUTOR_IO_SHORT": EXECUTOR_IO_SHORT,
+    "EXECUTOR_CPU": EXECUTOR_CPU,
     "RCLONE_FLAGS": RCLONE_FLAGS,
     "RCLONE_PATH": RCLONE_PATH,
     "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
+    "RCLONE_RCD": RCLONE_RCD,
+    "RCLONE_RCD_BWLIMIT": RCLONE_RCD_BWLIMIT,
     "RCLONE_SERVE_USER": RCLONE_SERVE_USER,
     "RCLONE_SERVE_PASS": RCLONE_SERVE_PASS,
     "RCLONE_SERVE_PORT": RCLONE_SERVE_PORT,
@@ -731,6 +820,7 @@ config_dict = {
     "SET_COMMANDS": SET_COMMANDS,
     "SHOW_MEDIAINFO": SHOW_MEDIAINFO,
     "SCREENSHOTS_MODE": SCREENSHOTS_MODE,
+    "SCREENSHOTS_SHEET": SCREENSHOTS_SHEET,
     "CLEAN_LOG_MSG": CLEAN_LOG_MSG,
     "SHOW_EXTRA_CMDS": SHOW_EXTRA_CMDS,
     "SOURCE_LINK": SOURCE_LINK,
@@ -804,34 +894,28 @@ if BASE_URL:
         shell=True,
     )
 
-srun(["qbittorrent-nox", "-d", f"--profile={getcwd()}"])
-if not ospath.exists(".netrc"):
-    with open(".netrc", "w"):
-        pass
-srun(["chmod", "600", ".netrc"])
-srun(["cp", ".netrc", "/root/.netrc"])
-srun(["chmod", "+x", "aria.sh"])
-srun("./aria.sh", shell=True)
-if ospath.exists("accounts.zip"):
-    if ospath.exists("accounts"):
-        srun(["rm", "-rf", "accounts"])
-    srun(["7z", "x", "-o.", "-aoa", "accounts.zip", "accounts/*.json"])
-    srun(["chmod", "-R", "777", "accounts"])
-    osremove("accounts.zip")
+log_info("Creating client from BOT_TOKEN")
+bot = wztgClient(
+    "bot",
+    TELEGRAM_API,
+    TELEGRAM_HASH,
+    bot_token=BOT_TOKEN,
+    workers=1000,
+    parse_mode=enums.ParseMode.HTML,
+).start()
+bot_loop = bot.loop
+bot_name = bot.me.username
+scheduler = AsyncIOScheduler(timezone=str(get_localzone()), event_loop=bot_loop)
+
+bootstrap.join("accounts")
 if not ospath.exists("accounts"):
     config_dict["USE_SERVICE_ACCOUNTS"] = False
-sleep(0.5)
 
 aria2 = ariaAPI(ariaClient(host="http://localhost", port=6800, secret=""))
 
 
 def get_client():
-    return qbClient(
-        host="localhost",
-        port=8090,
-        VERIFY_WEBUI_CERTIFICATE=False,
-        REQUESTS_ARGS={"timeout": (30, 60)},
-    )
+    return qbit_client
 
 
 def aria2c_init():
@@ -848,8 +932,10 @@ def aria2c_init():
         log_error(f"Aria2c initializing error: {e}")
 
 
+bootstrap.wait_all(
+    {"aria2": aria2.client.get_version, "qbittorrent": qbit_client.app_version}
+)
 Thread(target=aria2c_init).start()
-sleep(1.5)
 
 aria2c_global = [
     "bt-max-open-files",
@@ -886,16 +972,3 @@ else:
         if v in ["", "*"]:
             del qb_opt[k]
     qb_client.app_set_preferences(qb_opt)
-
-log_info("Creating client from BOT_TOKEN")
-bot = wztgClient(
-    "bot",
-    TELEGRAM_API,
-    TELEGRAM_HASH,
-    bot_token=BOT_TOKEN,
-    workers=1000,
-    parse_mode=enums.ParseMode.HTML,
-).start()
-bot_loop = bot.loop
-bot_name = bot.me.username
-scheduler = AsyncIOScheduler(timezone=str(get_localzone()), event_loop=bot_loop)
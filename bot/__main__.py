@@ -32,6 +32,7 @@ from bot import (
     QbInterval,
     INCOMPLETE_TASK_NOTIFIER,
     scheduler,
+    bootstrap,
 )
 from bot.version import get_version
 from .helper.ext_utils.fs_utils import start_cleanup, clean_all, exit_clean_up
@@ -43,8 +44,12 @@ from .helper.ext_utils.bot_utils import (
     set_commands,
     update_user_ldata,
     get_stats,
+    get_all_versions,
 )
 from .helper.ext_utils.db_handler import DbManger
+from .helper.ext_utils.sa_pool import sa_pool
+from .helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
+from .helper.mirror_utils.rclone_utils.rcd import rcd_pool
 from .helper.telegram_helper.bot_commands import BotCommands
 from .helper.telegram_helper.message_utils import (
     sendMessage,
@@ -176,6 +181,9 @@ async def restart(client, message):
         if interval:
             interval[0].cancel()
     await sync_to_async(clean_all)
+    await rcd_pool.stop()
+    if DATABASE_URL:
+        await DbManger().close()
     proc1 = await create_subprocess_exec(
         "pkill", "-9", "-f", "gunicorn|aria2c|qbittorrent-nox|ffmpeg|rclone"
     )
@@ -377,12 +385,15 @@ async def log_check():
 
 async def main():
     await gather(
-        start_cleanup(),
-        torrent_search.initiate_search_tools(),
-        restart_notification(),
-        search_images(),
-        set_commands(bot),
-        log_check(),
+        bootstrap.timed("cleanup", start_cleanup()),
+        bootstrap.timed("search tools", torrent_search.initiate_search_tools()),
+        bootstrap.timed("restart notify", restart_notification()),
+        bootstrap.timed("images", search_images()),
+        bootstrap.timed("commands", set_commands(bot)),
+        bootstrap.timed("log check", log_check()),
+        bootstrap.timed("service accounts", sa_pool.load()),
+        bootstrap.timed("rclone serve", rclone_serve_booter()),
+        bootstrap.timed("versions", sync_to_async(get_all_versions)),
     )
     await sync_to_async(start_aria2_listener, wait=False)
 
@@ -430,10 +441,14 @@ async def main():
     LOGGER.info(f"WZML-X Bot [@{bot_name}] Started!")
     if user:
         LOGGER.info(f"WZ's User [@{user.me.username}] Ready!")
+    bootstrap.report()
     signal(SIGINT, exit_clean_up)
 
 
 async def stop_signals():
+    await rcd_pool.stop()
+    if DATABASE_URL:
+        await DbManger().close()
     if user:
         await gather(bot.stop(), user.stop())
     else:
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+from logging import getLogger
+from threading import Lock, Thread
+from time import monotonic, sleep
+
+LOGGER = getLogger(__name__)
+
+PROBE_TIMEOUT = 60
+PROBE_INTERVAL = 0.2
+
+
+class Bootstrap:
+    """
+    Starts the independent boot steps (daemons, account extraction) in
+    threads and waits on their readiness probes instead of fixed sleeps,
+    keeping how long each step took for the startup report.
+    """
+
+    def __init__(self):
+        self.__started = monotonic()
+        self.__lock = Lock()
+        self.__threads = {}
+        self.__launched = {}
+        self.__timings = {}
+
+    def __record(self, name, since):
+        with self.__lock:
+            self.__timings[name] = monotonic() - since
+
+    def launch(self, name, func, *args, **kwargs):
+        def run():
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                LOGGER.error(f"Boot step {name} failed: {e}")
+            finally:
+                self.__record(name, since)
+
+        since = self.__launched[name] = monotonic()
+        thread = Thread(target=run, name=f"boot-{name}", daemon=True)
+        self.__threads[name] = thread
+        thread.start()
+
+    def join(self, *names):
+        for name in names:
+            if thread := self.__threads.pop(name, None):
+                thread.join()
+
+    def wait_ready(self, name, probe, timeout=PROBE_TIMEOUT):
+        """Polls probe() until it doesn't raise, timed from the step's launch"""
+        since = self.__launched.get(name, monotonic())
+        while True:
+            try:
+                result = probe()
+                self.__record(f"{name} ready", since)
+                return result
+            except Exception as e:
+                if monotonic() - since >= timeout:
+                    LOGGER.error(f"{name} not ready after {timeout}s: {e}")
+                    return None
+                sleep(PROBE_INTERVAL)
+
+    def wait_all(self, probes, timeout=PROBE_TIMEOUT):
+        """{name: probe} ==> {name: result}, probing every daemon at once"""
+        results = {}
+
+        def run(name, probe):
+            results[name] = self.wait_ready(name, probe, timeout)
+
+        threads = [
+            Thread(target=run, args=item, name=f"probe-{item[0]}")
+            for item in probes.items()
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    async def timed(self, name, coro):
+        since = monotonic()
+        try:
+            return await coro
+        finally:
+            self.__record(name, since)
+
+    def report(self):
+        with self.__lock:
+            steps = " | ".join(f"{k}: {v:.2f}s" for k, v in self.__timings.items())
+        LOGGER.info(f"Startup took {monotonic() - self.__started:.2f}s [{steps}]")
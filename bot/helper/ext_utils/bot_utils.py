@@ -6,7 +6,7 @@ from os import path as ospath
 from pkg_resources import get_distribution, DistributionNotFound
 from aiofiles import open as aiopen
 from aiofiles.os import remove as aioremove, path as aiopath, mkdir
-from re import match as re_match
+from re import match as re_match, findall as re_findall
 from time import time
 from html import escape
 from uuid import uuid4
@@ -29,10 +29,11 @@ from asyncio import (
     create_subprocess_shell,
     run_coroutine_threadsafe,
     sleep,
+    wrap_future,
 )
 from asyncio.subprocess import PIPE
+from collections import deque
 from functools import partial, wraps
-from concurrent.futures import ThreadPoolExecutor
 
 from aiohttp import ClientSession as aioClientSession
 from psutil import virtual_memory, cpu_percent, disk_usage
@@ -43,7 +44,13 @@ from pyrogram.types import BotCommand
 from pyrogram.errors import PeerIdInvalid
 
 from bot.helper.ext_utils.db_handler import DbManger
-from bot.helper.themes import BotTheme
+from bot.helper.ext_utils.media_probe import media_probe
+from bot.helper.ext_utils.upload_index import upload_index
+from bot.helper.ext_utils.sa_pool import sa_pool
+from bot.helper.ext_utils.task_scheduler import task_scheduler
+from bot.helper.ext_utils.executors import executors
+from bot.helper.ext_utils.qbit_client import qbit_metrics
+from bot.helper.themes import BotTheme, BotThemeBlock
 from bot.version import get_version
 from bot import (
     OWNER_ID,
@@ -67,13 +74,15 @@ from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.telegraph_helper import telegraph
 from bot.helper.ext_utils.shortners import short_url
 
-THREADPOOL = ThreadPoolExecutor(max_workers=1000)
 MAGNET_REGEX = r"magnet:\?xt=urn:(btih|btmh):[a-zA-Z0-9]*\s*"
 URL_REGEX = r"^(?!\/)(rtmps?:\/\/|mms:\/\/|rtsp:\/\/|https?:\/\/|ftp:\/\/)?([^\/:]+:[^\/@]+@)?(www\.)?(?=[^\/:\s]+\.[^\/:\s]+)([^\/:\s]+\.[^\/:\s]+)(:\d+)?(\/[^#\s]*[\s\S]*)?(\?[^#\s]*)?(#.*)?$"
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB", "EB"]
 STATUS_START = 0
 PAGES = 1
 PAGE_NO = 1
+STATUS_CACHE = {}
+SYS_STATS = {"time": 0}
+SPEED_WINDOW = 10
 
 
 class MirrorStatus:
@@ -82,6 +91,7 @@ class MirrorStatus:
     STATUS_CLONING = "Clone"
     STATUS_QUEUEDL = "QueueDL"
     STATUS_QUEUEUP = "QueueUp"
+    STATUS_QUEUECPU = "QueueCPU"
     STATUS_PAUSED = "Pause"
     STATUS_ARCHIVING = "Archive"
     STATUS_EXTRACTING = "Extract"
@@ -119,25 +129,15 @@ def get_readable_file_size(size_in_bytes):
 
 
 async def getDownloadByGid(gid):
-    async with download_dict_lock:
-        return next((dl for dl in download_dict.values() if dl.gid() == gid), None)
+    return download_dict.by_gid(gid)
 
 
 async def getAllDownload(req_status, user_id=None):
-    dls = []
-    async with download_dict_lock:
-        for dl in list(download_dict.values()):
-            if user_id and user_id != dl.message.from_user.id:
-                continue
-            status = dl.status()
-            if req_status in ["all", status]:
-                dls.append(dl)
-    return dls
+    return download_dict.by_status(req_status, user_id)
 
 
 async def get_user_tasks(user_id, maxtask):
-    if tasks := await getAllDownload("all", user_id):
-        return len(tasks) >= maxtask
+    return download_dict.user_count(user_id) >= maxtask
 
 
 def bt_selection_buttons(id_):
@@ -254,7 +254,175 @@ class EngineStatus:
         self.STATUS_RCLONE = f"RClone {version_cache['rclone']}"
 
 
+def get_sys_stats():
+    if time() - SYS_STATS["time"] >= config_dict["STATUS_UPDATE_INTERVAL"]:
+        disk = disk_usage(config_dict["DOWNLOAD_DIR"])
+        SYS_STATS.update(
+            time=time(),
+            cpu=cpu_percent(),
+            free=get_readable_file_size(disk.free),
+            free_p=round(100 - disk.percent, 1),
+            ram=virtual_memory().percent,
+        )
+    return SYS_STATS
+
+
+def get_task_values(download):
+    msg_link = (
+        download.message.link
+        if download.message.chat.type in [ChatType.SUPERGROUP, ChatType.CHANNEL]
+        and not config_dict["DELETE_LINKS"]
+        else ""
+    )
+    elapsed = time() - download.message.date.timestamp()
+    status = download.status()
+    values = {
+        "theme": config_dict["BOT_THEME"],
+        "name": (
+            "Task is being Processed!"
+            if config_dict["SAFE_MODE"]
+            and elapsed >= config_dict["STATUS_UPDATE_INTERVAL"]
+            else escape(f"{download.name()}")
+        ),
+        "status": status,
+        "url": msg_link,
+        "size": download.size_raw(),
+        "eng": download.eng(),
+        "user": download.message.from_user.mention(style="html"),
+        "id": download.message.from_user.id,
+        "gid": download.gid(),
+    }
+    if status not in [
+        MirrorStatus.STATUS_SPLITTING,
+        MirrorStatus.STATUS_SEEDING,
+        MirrorStatus.STATUS_METADATA,
+    ]:
+        values.update(
+            progress=download.progress(),
+            processed=download.processed_bytes_raw(),
+            eta=download.eta_seconds(),
+            speed=download.speed_bytes(),
+            mode=download.upload_details["mode"],
+        )
+        if hasattr(download, "seeders_num"):
+            try:
+                values.update(
+                    seeders=download.seeders_num(), leechers=download.leechers_num()
+                )
+            except Exception:
+                pass
+    elif status == MirrorStatus.STATUS_SEEDING:
+        values.update(
+            speed=download.upload_speed_bytes(),
+            uploaded=download.uploaded_bytes(),
+            ratio=download.ratio(),
+            seeding_time=download.seeding_time(),
+        )
+    return values
+
+
+def task_elapsed(download):
+    return get_readable_time(time() - download.message.date.timestamp())
+
+
+def render_task(values):
+    """values ==> (head, tail), ELAPSED goes in between as it changes every tick"""
+    split = None
+    parts = [("STATUS_NAME", {"Name": values["name"]})]
+    if "progress" in values:
+        parts += [
+            (
+                "BAR",
+                {
+                    "Bar": f"{get_progress_bar_string(values['progress'])} {values['progress']}"
+                },
+            ),
+            (
+                "PROCESSED",
+                {
+                    "Processed": f"{get_readable_file_size(values['processed'])} of {get_readable_file_size(values['size'])}"
+                },
+            ),
+            ("STATUS", {"Status": values["status"], "Url": values["url"]}),
+            (
+                "ETA",
+                {
+                    "Eta": (
+                        "-"
+                        if values["eta"] is None
+                        else get_readable_time(values["eta"])
+                    )
+                },
+            ),
+            ("SPEED", {"Speed": f"{get_readable_file_size(values['speed'])}/s"}),
+        ]
+        split = len(parts)
+        parts += [
+            ("ENGINE", {"Engine": values["eng"]}),
+            ("STA_MODE", {"Mode": values["mode"]}),
+        ]
+        if "seeders" in values:
+            parts += [
+                ("SEEDERS", {"Seeders": values["seeders"]}),
+                ("LEECHERS", {"Leechers": values["leechers"]}),
+            ]
+    elif values["status"] == MirrorStatus.STATUS_SEEDING:
+        parts += [
+            ("STATUS", {"Status": values["status"], "Url": values["url"]}),
+            ("SEED_SIZE", {"Size": get_readable_file_size(values["size"])}),
+            ("SEED_SPEED", {"Speed": f"{get_readable_file_size(values['speed'])}/s"}),
+            ("UPLOADED", {"Upload": values["uploaded"]}),
+            ("RATIO", {"Ratio": values["ratio"]}),
+            ("TIME", {"Time": values["seeding_time"]}),
+            ("SEED_ENGINE", {"Engine": values["eng"]}),
+        ]
+    else:
+        parts += [
+            ("STATUS", {"Status": values["status"], "Url": values["url"]}),
+            ("STATUS_SIZE", {"Size": get_readable_file_size(values["size"])}),
+            ("NON_ENGINE", {"Engine": values["eng"]}),
+        ]
+
+    parts += [("USER", {"User": values["user"]}), ("ID", {"Id": values["id"]})]
+    if values["eng"].startswith("qBit"):
+        parts.append(
+            ("BTSEL", {"Btsel": f"/{BotCommands.BtSelectCommand}_{values['gid']}"})
+        )
+    parts.append(("CANCEL", {"Cancel": f"/{BotCommands.CancelMirror}_{values['gid']}"}))
+    if split is None:
+        return BotThemeBlock(parts), ""
+    return BotThemeBlock(parts[:split]), BotThemeBlock(parts[split:])
+
+
+class SpeedMeter:
+    def __init__(self, window=SPEED_WINDOW):
+        self.__window = window
+        self.__samples = deque()
+
+    def add(self, dl_speed, up_speed):
+        now = time()
+        self.__samples.append((now, dl_speed, up_speed))
+        while self.__samples[0][0] < now - self.__window:
+            self.__samples.popleft()
+
+    @property
+    def dl_speed(self):
+        if not self.__samples:
+            return 0
+        return sum(sample[1] for sample in self.__samples) / len(self.__samples)
+
+    @property
+    def up_speed(self):
+        if not self.__samples:
+            return 0
+        return sum(sample[2] for sample in self.__samples) / len(self.__samples)
+
+
+speed_meter = SpeedMeter()
+
+
 def get_readable_message():
+    """==> (msg, buttons, signature), signature covers task values and paging"""
     msg = ""
     button = None
     STATUS_LIMIT = config_dict["STATUS_LIMIT"]
@@ -263,107 +431,56 @@ def get_readable_message():
     if PAGE_NO > PAGES and PAGES != 0:
         globals()["STATUS_START"] = STATUS_LIMIT * (PAGES - 1)
         globals()["PAGE_NO"] = PAGES
-    for download in list(download_dict.values())[
+    rendered = {}
+    for uid, download in list(download_dict.items())[
         STATUS_START : STATUS_LIMIT + STATUS_START
     ]:
-        msg_link = (
-            download.message.link
-            if download.message.chat.type in [ChatType.SUPERGROUP, ChatType.CHANNEL]
-            and not config_dict["DELETE_LINKS"]
-            else ""
-        )
-        elapsed = time() - download.message.date.timestamp()
-        msg += BotTheme(
-            "STATUS_NAME",
-            Name=(
-                "Task is being Processed!"
-                if config_dict["SAFE_MODE"]
-                and elapsed >= config_dict["STATUS_UPDATE_INTERVAL"]
-                else escape(f"{download.name()}")
-            ),
-        )
-        if download.status() not in [
-            MirrorStatus.STATUS_SPLITTING,
-            MirrorStatus.STATUS_SEEDING,
-            MirrorStatus.STATUS_METADATA,
-        ]:
-            msg += BotTheme(
-                "BAR",
-                Bar=f"{get_progress_bar_string(download.progress())} {download.progress()}",
-            )
-            msg += BotTheme(
-                "PROCESSED",
-                Processed=f"{download.processed_bytes()} of {download.size()}",
-            )
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("ETA", Eta=download.eta())
-            msg += BotTheme("SPEED", Speed=download.speed())
-            msg += BotTheme("ELAPSED", Elapsed=get_readable_time(elapsed))
-            msg += BotTheme("ENGINE", Engine=download.eng())
-            msg += BotTheme("STA_MODE", Mode=download.upload_details["mode"])
-            if hasattr(download, "seeders_num"):
-                try:
-                    msg += BotTheme("SEEDERS", Seeders=download.seeders_num())
-                    msg += BotTheme("LEECHERS", Leechers=download.leechers_num())
-                except Exception:
-                    pass
-        elif download.status() == MirrorStatus.STATUS_SEEDING:
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("SEED_SIZE", Size=download.size())
-            msg += BotTheme("SEED_SPEED", Speed=download.upload_speed())
-            msg += BotTheme("UPLOADED", Upload=download.uploaded_bytes())
-            msg += BotTheme("RATIO", Ratio=download.ratio())
-            msg += BotTheme("TIME", Time=download.seeding_time())
-            msg += BotTheme("SEED_ENGINE", Engine=download.eng())
-        else:
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("STATUS_SIZE", Size=download.size())
-            msg += BotTheme("NON_ENGINE", Engine=download.eng())
-
-        msg += BotTheme("USER", User=download.message.from_user.mention(style="html"))
-        msg += BotTheme("ID", Id=download.message.from_user.id)
-        if (download.eng()).startswith("qBit"):
-            msg += BotTheme(
-                "BTSEL", Btsel=f"/{BotCommands.BtSelectCommand}_{download.gid()}"
-            )
-        msg += BotTheme(
-            "CANCEL", Cancel=f"/{BotCommands.CancelMirror}_{download.gid()}"
-        )
+        values = get_task_values(download)
+        cached = STATUS_CACHE.get(uid)
+        if cached is None or cached[0] != values:
+            cached = (values, *render_task(values))
+        rendered[uid] = cached
+        msg += cached[1]
+        if "progress" in values:
+            msg += BotTheme("ELAPSED", Elapsed=task_elapsed(download))
+        msg += cached[2]
+    STATUS_CACHE.clear()
+    STATUS_CACHE.update(rendered)
 
     if len(msg) == 0:
-        return None, None
-
-    dl_speed = 0
-
-    def convert_speed_to_bytes_per_second(spd):
-        if "K" in spd:
-            return float(spd.split("K")[0]) * 1024
-        elif "M" in spd:
-            return float(spd.split("M")[0]) * 1048576
-        elif "G" in spd:
-            return float(spd.split("G")[0]) * 1073741824
-        elif "T" in spd:
-            return float(spd.split("T")[0]) * 1099511627776
-        else:
-            return 0
+        return None, None, None
+    signature = (
+        PAGE_NO,
+        PAGES,
+        tasks,
+        tuple((uid, cached[0]) for uid, cached in rendered.items()),
+    )
 
     dl_speed = 0
     up_speed = 0
-    for download in download_dict.values():
-        tstatus = download.status()
-        spd = (
-            download.speed()
-            if tstatus != MirrorStatus.STATUS_SEEDING
-            else download.upload_speed()
-        )
-        speed_in_bytes_per_second = convert_speed_to_bytes_per_second(spd)
+    for uid, download in download_dict.items():
+        if (cached := rendered.get(uid)) is not None:
+            tstatus = cached[0]["status"]
+            speed = cached[0].get("speed", 0)
+        else:
+            tstatus = download.status()
+            if tstatus == MirrorStatus.STATUS_SEEDING:
+                speed = download.upload_speed_bytes()
+            elif tstatus in [
+                MirrorStatus.STATUS_DOWNLOADING,
+                MirrorStatus.STATUS_UPLOADING,
+            ]:
+                speed = download.speed_bytes()
+            else:
+                continue
         if tstatus == MirrorStatus.STATUS_DOWNLOADING:
-            dl_speed += speed_in_bytes_per_second
+            dl_speed += speed
         elif tstatus in [
             MirrorStatus.STATUS_UPLOADING,
             MirrorStatus.STATUS_SEEDING,
         ]:
-            up_speed += speed_in_bytes_per_second
+            up_speed += speed
+    speed_meter.add(dl_speed, up_speed)
 
     msg += BotTheme("FOOTER")
     buttons = ButtonMaker()
@@ -383,17 +500,14 @@ def get_readable_message():
         buttons.ibutton(BotTheme("REFRESH", Page=f"{PAGE_NO}/{PAGES}"), "status ref")
         buttons.ibutton(BotTheme("NEXT"), "status nex")
     button = buttons.build_menu(3)
-    msg += BotTheme("Cpu", cpu=cpu_percent())
-    msg += BotTheme(
-        "FREE",
-        free=get_readable_file_size(disk_usage(config_dict["DOWNLOAD_DIR"]).free),
-        free_p=round(100 - disk_usage(config_dict["DOWNLOAD_DIR"]).percent, 1),
-    )
-    msg += BotTheme("Ram", ram=virtual_memory().percent)
+    sys_stats = get_sys_stats()
+    msg += BotTheme("Cpu", cpu=sys_stats["cpu"])
+    msg += BotTheme("FREE", free=sys_stats["free"], free_p=sys_stats["free_p"])
+    msg += BotTheme("Ram", ram=sys_stats["ram"])
     msg += BotTheme("uptime", uptime=get_readable_time(time() - botStartTime))
-    msg += BotTheme("DL", DL=get_readable_file_size(dl_speed))
-    msg += BotTheme("UL", UL=get_readable_file_size(up_speed))
-    return msg, button
+    msg += BotTheme("DL", DL=get_readable_file_size(speed_meter.dl_speed))
+    msg += BotTheme("UL", UL=get_readable_file_size(speed_meter.up_speed))
+    return msg, button, signature
 
 
 async def turn_page(data):
@@ -426,6 +540,20 @@ def get_readable_time(seconds):
     return result
 
 
+def text_to_bytes(size_text):
+    if not (match := re_match(r"([\d.]+)\s*([kmgtpe]?)", size_text.strip().lower())):
+        return 0
+    return float(match[1]) * 1024 ** ("kmgtpe".find(match[2]) + 1 if match[2] else 0)
+
+
+def time_to_seconds(time_text):
+    periods = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+    return sum(
+        float(value) * periods[unit]
+        for value, unit in re_findall(r"([\d.]+)([wdhms])", time_text.lower())
+    )
+
+
 def is_magnet(url):
     return bool(re_match(MAGNET_REGEX, url))
 
@@ -587,9 +715,9 @@ def new_task(func):
     return wrapper
 
 
-async def sync_to_async(func, *args, wait=True, **kwargs):
+async def sync_to_async(func, *args, wait=True, pool="io-short", **kwargs):
     pfunc = partial(func, *args, **kwargs)
-    future = bot_loop.run_in_executor(THREADPOOL, pfunc)
+    future = wrap_future(executors[pool].submit(pfunc), loop=bot_loop)
     return await future if wait else future
 
 
@@ -598,6 +726,18 @@ def async_to_sync(func, *args, wait=True, **kwargs):
     return future.result() if wait else future
 
 
+def schedule_async(func, *args, **kwargs):
+    """async_to_sync without waiting, logging what func raises instead of losing it"""
+
+    def log_exception(future):
+        if not future.cancelled() and (e := future.exception()) is not None:
+            LOGGER.error(f"{func.__qualname__}: {e}", exc_info=e)
+
+    future = run_coroutine_threadsafe(func(*args, **kwargs), bot_loop)
+    future.add_done_callback(log_exception)
+    return future
+
+
 def new_thread(func):
     @wraps(func)
     def wrapper(*args, wait=False, **kwargs):
@@ -635,6 +775,11 @@ async def get_stats(event, key="home"):
         swap = swap_memory()
         memory = virtual_memory()
         disk_io = disk_io_counters()
+        probe_stats = media_probe.stats()
+        index_stats = upload_index.stats()
+        sa_stats = sa_pool.stats()
+        queue_stats = task_scheduler.stats()
+        pool_stats = {name: pool.stats() for name, pool in executors.items()}
         msg = BotTheme(
             "BOT_STATS",
             bot_uptime=get_readable_time(time() - botStartTime),
@@ -663,6 +808,36 @@ async def get_stats(event, key="home"):
             disk_t=get_readable_file_size(total),
             disk_u=get_readable_file_size(used),
             disk_f=get_readable_file_size(free),
+            probe_hits=probe_stats["hits"],
+            probe_misses=probe_stats["misses"],
+            probe_cached=probe_stats["cached"],
+            probe_ratio=probe_stats["ratio"],
+            index_hits=index_stats["hits"],
+            index_lookups=index_stats["lookups"],
+            index_ratio=index_stats["ratio"],
+            index_saved=get_readable_file_size(index_stats["saved"]),
+            sa_ready=sa_stats["ready"],
+            sa_total=sa_stats["total"],
+            sa_cooling=sa_stats["cooling"],
+            sa_used=get_readable_file_size(sa_stats["used"]),
+            sa_left=get_readable_file_size(sa_stats["left"]),
+            queue_dl=queue_stats["dl"]["queued"],
+            queue_up=queue_stats["up"]["queued"],
+            queue_cpu=queue_stats["cpu"]["queued"],
+            queue_dl_waits=queue_stats["dl"]["waits"],
+            queue_up_waits=queue_stats["up"]["waits"],
+            queue_cpu_waits=queue_stats["cpu"]["waits"],
+            pool_stats="\n".join(
+                f"┠ <b>{name} ({stats['active']}/{stats['size']}) :</b> "
+                f"Q {stats['queued']} | Wait {stats['wait_avg']}s (max {stats['wait_max']}s) | Run {stats['run_avg']}s"
+                for name, stats in pool_stats.items()
+            ),
+            qbit_rpc="\n".join(
+                f"┠ <b>{rpc['endpoint']} ({rpc['calls']}) :</b> "
+                f"Avg {rpc['avg']}ms (max {rpc['max']}ms) | Total {rpc['total']}s | Err {rpc['errors']}"
+                for rpc in qbit_metrics.stats()
+            )
+            or "┖ No calls yet",
         )
     elif key == "stsys":
         cpuUsage = cpu_percent(interval=0.5)
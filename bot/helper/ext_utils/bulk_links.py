@@ -1,7 +1,17 @@
 #!/usr/bin/env python3
+from time import time
+from asyncio import Lock, sleep
 from aiofiles import open as aiopen
 from aiofiles.os import remove
 
+from bot import LOGGER
+from bot.helper.telegram_helper.message_utils import sendMessage
+
+BULK_MSG_INTERVAL = 1
+SAME_DIR_ARGS = {"-m", "-sd", "-samedir"}
+chat_locks = {}
+last_sent = {}
+
 
 async def get_links_from_message(text, bulk_start, bulk_end):
     links_list = text.split("\n")
@@ -49,3 +59,49 @@ async def extract_bulk_links(message, bulk_start, bulk_end):
     elif text := message.reply_to_message.text:
         return await get_links_from_message(text, bulk_start, bulk_end)
     return []
+
+
+def uses_same_dir(text):
+    return bool(SAME_DIR_ARGS.intersection(text.split("\n", 1)[0].split()))
+
+
+def bulk_same_dir(bulk):
+    """Bulk links carrying -m share one folder, like the tasks of -i"""
+    if total := sum(uses_same_dir(line) for line in bulk):
+        return {"total": total, "tasks": set(), "name": ""}
+    return None
+
+
+async def pace_chat(chat_id):
+    lock = chat_locks.setdefault(chat_id, Lock())
+    async with lock:
+        if (delay := last_sent.get(chat_id, 0) + BULK_MSG_INTERVAL - time()) > 0:
+            await sleep(delay)
+        last_sent[chat_id] = time()
+
+
+async def ingest_tasks(client, message, texts, reply_ids=None):
+    """
+    Posts one command message per task and yields it ready to be dispatched.
+    Only the outgoing Telegram messages are paced, every yielded task is
+    free to validate its link and reach the task queue concurrently.
+    """
+    chat_id = message.chat.id
+    targets = [message] * len(texts)
+    if reply_ids:
+        targets = []
+        for i in range(0, len(reply_ids), 200):
+            targets.extend(
+                await client.get_messages(
+                    chat_id=chat_id, message_ids=reply_ids[i : i + 200]
+                )
+            )
+    for target, text in zip(targets, texts):
+        await pace_chat(chat_id)
+        nextmsg = await sendMessage(target, text)
+        if isinstance(nextmsg, str):
+            LOGGER.error(f"Bulk Ingestion: {nextmsg}")
+            continue
+        nextmsg = await client.get_messages(chat_id=chat_id, message_ids=nextmsg.id)
+        nextmsg.from_user = message.from_user
+        yield nextmsg
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 from aiofiles.os import path as aiopath, makedirs
 from aiofiles import open as aiopen
+from asyncio import Lock, gather, sleep
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne
 from pymongo.errors import PyMongoError
 from dotenv import dotenv_values
 
@@ -15,29 +17,88 @@ from bot import (
     aria2_options,
     qbit_options,
     bot_loop,
+    bootstrap,
 )
 
+DB_FLUSH_INTERVAL = 1
+
 
 class DbManger:
+    __conn = None
+    __db = None
+    __err = False
+    # write-behind queue ==> {collection: {_id: document}}
+    __pending = {"users": {}, "rss": {}, "uploads": {}, "sa": {}}
+    __flush_task = None
+    __flush_lock = Lock()
+
     def __init__(self):
-        self.__err = False
-        self.__db = None
-        self.__conn = None
-        self.__connect()
+        if DbManger.__conn is None and not DbManger.__err:
+            self.__connect()
 
-    def __connect(self):
+    @classmethod
+    def __connect(cls):
         try:
-            self.__conn = AsyncIOMotorClient(DATABASE_URL)
-            self.__db = (
-                self.__conn.wzmlx
+            cls.__conn = AsyncIOMotorClient(DATABASE_URL, maxPoolSize=20)
+            cls.__db = (
+                cls.__conn.wzmlx
             )  # New Section for not conflicting with mltb section !!
         except PyMongoError as e:
             LOGGER.error(f"Error in DB connection: {e}")
-            self.__err = True
+            cls.__err = True
+
+    def __queue_write(self, collection, _id, document):
+        DbManger.__pending[collection][_id] = document
+        if DbManger.__flush_task is None or DbManger.__flush_task.done():
+            DbManger.__flush_task = bot_loop.create_task(self.__delayed_flush())
+
+    async def __delayed_flush(self):
+        while True:
+            await sleep(DB_FLUSH_INTERVAL)
+            if await self.flush():
+                break
+
+    async def flush(self):
+        """Writes the queued documents, False when some were kept for a retry"""
+        if self.__err:
+            return True
+        flushed = True
+        async with DbManger.__flush_lock:
+            for collection, pending in DbManger.__pending.items():
+                if not pending:
+                    continue
+                batch = dict(pending)
+                pending.clear()
+                requests = [
+                    ReplaceOne({"_id": _id}, document, upsert=True)
+                    for _id, document in batch.items()
+                ]
+                try:
+                    await self.__db[collection][bot_id].bulk_write(
+                        requests, ordered=False
+                    )
+                except PyMongoError as e:
+                    LOGGER.error(f"Error while flushing {collection} to DB: {e}")
+                    # documents queued meanwhile are newer than the failed ones
+                    for _id, document in batch.items():
+                        pending.setdefault(_id, document)
+                    flushed = False
+        return flushed
+
+    async def close(self):
+        if DbManger.__conn is None:
+            return
+        await self.flush()
+        DbManger.__conn.close()
+        DbManger.__conn = None
+        DbManger.__db = None
 
     async def db_load(self):
         if self.__err:
             return
+        await gather(self.__save_settings(), self.__load_users(), self.__load_rss())
+
+    async def __save_settings(self):
         # Save bot settings
         await self.__db.settings.config.update_one(
             {"_id": bot_id}, {"$set": config_dict}, upsert=True
@@ -52,6 +113,8 @@ class DbManger:
             await self.__db.settings.qbittorrent.update_one(
                 {"_id": bot_id}, {"$set": qbit_options}, upsert=True
             )
+
+    async def __load_users(self):
         # User Data
         if await self.__db.users[bot_id].find_one():
             rows = self.__db.users[bot_id].find({})
@@ -75,6 +138,8 @@ class DbManger:
                     row["rclone"] = rclone_path
                 user_data[uid] = row
             LOGGER.info("Users data has been imported from Database")
+
+    async def __load_rss(self):
         # Rss Data
         if await self.__db.rss[bot_id].find_one():
             # return a dict ==> {_id, title: {link, last_feed, last_name, inf, exf, command, paused}
@@ -84,7 +149,6 @@ class DbManger:
                 del row["_id"]
                 rss_dict[user_id] = row
             LOGGER.info("Rss data has been imported from Database.")
-        self.__conn.close
 
     async def update_deploy_config(self):
         if self.__err:
@@ -93,7 +157,6 @@ class DbManger:
         await self.__db.settings.deployConfig.replace_one(
             {"_id": bot_id}, current_config, upsert=True
         )
-        self.__conn.close
 
     async def update_config(self, dict_):
         if self.__err:
@@ -101,7 +164,6 @@ class DbManger:
         await self.__db.settings.config.update_one(
             {"_id": bot_id}, {"$set": dict_}, upsert=True
         )
-        self.__conn.close
 
     async def update_aria2(self, key, value):
         if self.__err:
@@ -109,7 +171,6 @@ class DbManger:
         await self.__db.settings.aria2c.update_one(
             {"_id": bot_id}, {"$set": {key: value}}, upsert=True
         )
-        self.__conn.close
 
     async def update_qbittorrent(self, key, value):
         if self.__err:
@@ -117,7 +178,6 @@ class DbManger:
         await self.__db.settings.qbittorrent.update_one(
             {"_id": bot_id}, {"$set": {key: value}}, upsert=True
         )
-        self.__conn.close
 
     async def update_private_file(self, path):
         if self.__err:
@@ -133,8 +193,6 @@ class DbManger:
         )
         if path == "config.env":
             await self.update_deploy_config()
-        else:
-            self.__conn.close
 
     async def update_user_data(self, user_id):
         if self.__err:
@@ -144,8 +202,7 @@ class DbManger:
             del data["thumb"]
         if data.get("rclone"):
             del data["rclone"]
-        await self.__db.users[bot_id].replace_one({"_id": user_id}, data, upsert=True)
-        self.__conn.close
+        self.__queue_write("users", user_id, dict(data))
 
     async def update_user_doc(self, user_id, key, path=""):
         if self.__err:
@@ -155,10 +212,10 @@ class DbManger:
                 doc_bin = await doc.read()
         else:
             doc_bin = ""
+        await self.flush()
         await self.__db.users[bot_id].update_one(
             {"_id": user_id}, {"$set": {key: doc_bin}}, upsert=True
         )
-        self.__conn.close
 
     async def get_pm_uids(self):
         if self.__err:
@@ -171,36 +228,49 @@ class DbManger:
         if not bool(await self.__db.pm_users[bot_id].find_one({"_id": user_id})):
             await self.__db.pm_users[bot_id].insert_one({"_id": user_id})
             LOGGER.info(f"New PM User Added : {user_id}")
-        self.__conn.close
 
     async def rm_pm_user(self, user_id):
         if self.__err:
             return
         await self.__db.pm_users[bot_id].delete_one({"_id": user_id})
-        self.__conn.close
 
     async def rss_update_all(self):
         if self.__err:
             return
         for user_id in list(rss_dict.keys()):
-            await self.__db.rss[bot_id].replace_one(
-                {"_id": user_id}, rss_dict[user_id], upsert=True
-            )
-        self.__conn.close
+            self.__queue_write("rss", user_id, dict(rss_dict[user_id]))
+        await self.flush()
 
     async def rss_update(self, user_id):
         if self.__err:
             return
-        await self.__db.rss[bot_id].replace_one(
-            {"_id": user_id}, rss_dict[user_id], upsert=True
-        )
-        self.__conn.close
+        self.__queue_write("rss", user_id, dict(rss_dict[user_id]))
 
     async def rss_delete(self, user_id):
         if self.__err:
             return
+        await self.flush()
         await self.__db.rss[bot_id].delete_one({"_id": user_id})
-        self.__conn.close
+
+    async def get_upload_index(self, key):
+        if self.__err:
+            return None
+        return await self.__db.uploads[bot_id].find_one({"_id": key})
+
+    async def update_upload_index(self, key, document):
+        if self.__err:
+            return
+        self.__queue_write("uploads", key, document)
+
+    async def get_sa_states(self):
+        if self.__err:
+            return []
+        return [doc async for doc in self.__db.sa[bot_id].find({})]
+
+    async def update_sa_state(self, name, document):
+        if self.__err:
+            return
+        self.__queue_write("sa", name, document)
 
     async def add_incomplete_task(self, cid, link, tag, msg_link, msg):
         if self.__err:
@@ -208,13 +278,11 @@ class DbManger:
         await self.__db.tasks[bot_id].insert_one(
             {"_id": link, "cid": cid, "tag": tag, "source": msg_link, "org_msg": msg}
         )
-        self.__conn.close
 
     async def rm_complete_task(self, link):
         if self.__err:
             return
         await self.__db.tasks[bot_id].delete_one({"_id": link})
-        self.__conn.close
 
     async def get_incomplete_tasks(self):
         notifier_dict = {}
@@ -238,15 +306,14 @@ class DbManger:
                         row["tag"]: [{row["_id"]: row["source"]}]
                     }
         await self.__db.tasks[bot_id].drop()
-        self.__conn.close
         return notifier_dict  # return a dict ==> {cid: {tag: [{_id: source}, {_id, source}, ...]}}
 
     async def trunc_table(self, name):
         if self.__err:
             return
+        await self.flush()
         await self.__db[name][bot_id].drop()
-        self.__conn.close
 
 
 if DATABASE_URL:
-    bot_loop.run_until_complete(DbManger().db_load())
+    bot_loop.run_until_complete(bootstrap.timed("database", DbManger().db_load()))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from threading import Lock
+from time import time
+
+from bot import config_dict
+
+POOL_SIZE_KEYS = {
+    "io-long": "EXECUTOR_IO_LONG",
+    "io-short": "EXECUTOR_IO_SHORT",
+    "cpu": "EXECUTOR_CPU",
+}
+
+
+class InstrumentedPool:
+    """
+    ThreadPoolExecutor keeping queue depth, wait and run times, so a slow
+    class of jobs shows up in its own pool instead of starving the others.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.__lock = Lock()
+        self.__executor = None
+        self.size = 0
+        self.queued = 0
+        self.active = 0
+        self.done = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.resize()
+
+    def resize(self):
+        size = config_dict[POOL_SIZE_KEYS[self.name]] or cpu_count() or 1
+        if size == self.size:
+            return
+        old, self.size = self.__executor, size
+        self.__executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix=self.name
+        )
+        if old is not None:
+            # already submitted jobs keep running on the old threads
+            old.shutdown(wait=False)
+
+    def __run(self, func, submitted):
+        started = time()
+        waited = started - submitted
+        with self.__lock:
+            self.queued -= 1
+            self.active += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        try:
+            return func()
+        finally:
+            with self.__lock:
+                self.active -= 1
+                self.done += 1
+                self.run_total += time() - started
+
+    def submit(self, func):
+        with self.__lock:
+            self.queued += 1
+        return self.__executor.submit(self.__run, func, time())
+
+    def stats(self):
+        done = self.done or 1
+        return {
+            "size": self.size,
+            "queued": self.queued,
+            "active": self.active,
+            "done": self.done,
+            "wait_avg": round(self.wait_total / done, 3),
+            "wait_max": round(self.wait_max, 3),
+            "run_avg": round(self.run_total / done, 3),
+        }
+
+
+executors = {name: InstrumentedPool(name) for name in POOL_SIZE_KEYS}
+
+
+def resize_executors():
+    for pool in executors.values():
+        pool.resize()
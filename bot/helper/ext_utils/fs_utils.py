@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
-from os import walk, path as ospath
+from os import walk, remove, scandir, stat, path as ospath
 from aiofiles.os import remove as aioremove, path as aiopath, listdir, rmdir, makedirs
 from aioshutil import rmtree as aiormtree, move
 from asyncio import create_subprocess_exec
 from asyncio.subprocess import PIPE
 from shutil import rmtree, disk_usage
 from magic import Magic
-from re import split as re_split, I, search as re_search
+from re import split as re_split, I, search as re_search, findall as re_findall
 from subprocess import run as srun
 from sys import exit as sexit
+from zipfile import ZipFile, ZipInfo, ZIP_STORED
 from bot import bot_cache
 
 from .exceptions import NotSupportedExtractionArchive
@@ -59,6 +60,10 @@ FIRST_SPLIT_REGEX = r"(\.|_)part0*1\.rar$|(\.|_)7z\.0*1$|(\.|_)zip\.0*1$|^(?!.*(
 
 SPLIT_REGEX = r"\.r\d+$|\.7z\.\d+$|\.z\d+$|\.zip\.\d+$"
 
+ZIP_CHUNK = 4 * 1024 * 1024
+
+scan_cache = {}
+
 
 def is_first_archive_split(file):
     return bool(re_search(FIRST_SPLIT_REGEX, file))
@@ -72,7 +77,85 @@ def is_archive_split(file):
     return bool(re_search(SPLIT_REGEX, file))
 
 
+class PathManifest:
+    """
+    Result of a single scandir pass, tree maps every directory to its
+    (subdirs, files) names and stats maps every file to (size, mtime).
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.tree = {}
+        self.stats = {}
+        self.size = 0
+
+    def add_file(self, dirpath, name, st):
+        self.tree[dirpath][1].append(name)
+        self.stats[ospath.join(dirpath, name)] = (st.st_size, st.st_mtime)
+        self.size += st.st_size
+
+    def walk(self, topdown=True):
+        for dirpath in sorted(self.tree, reverse=not topdown):
+            yield dirpath, *self.tree[dirpath]
+
+    def getsize(self, path):
+        return self.stats[path][0]
+
+    def size_of(self, path):
+        if path in self.stats:
+            return self.getsize(path)
+        prefix = f"{path.rstrip('/')}/"
+        return sum(
+            size
+            for f_path, (size, _) in self.stats.items()
+            if f_path.startswith(prefix)
+        )
+
+
+def scan_path(path):
+    manifest = PathManifest(path)
+    if ospath.isfile(path):
+        dirpath, name = ospath.split(path)
+        manifest.tree[dirpath] = ([], [])
+        manifest.add_file(dirpath, name, stat(path))
+        return manifest
+    stack = [path]
+    while stack:
+        dirpath = stack.pop()
+        manifest.tree[dirpath] = ([], [])
+        try:
+            with scandir(dirpath) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            manifest.tree[dirpath][0].append(entry.name)
+                            if not entry.is_symlink():
+                                stack.append(entry.path)
+                        else:
+                            manifest.add_file(dirpath, entry.name, entry.stat())
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return manifest
+
+
+async def scan_tree(path):
+    """Cached manifest of path, stages mutating the tree must invalidate_scan it"""
+    if (manifest := scan_cache.get(path)) is None:
+        manifest = scan_cache[path] = await sync_to_async(scan_path, path)
+    return manifest
+
+
+def invalidate_scan(path):
+    path = path.rstrip("/")
+    for key in list(scan_cache):
+        if key == path or key.startswith(f"{path}/") or path.startswith(f"{key}/"):
+            del scan_cache[key]
+
+
 async def clean_target(path):
+    invalidate_scan(path)
     if await aiopath.exists(path):
         LOGGER.info(f"Cleaning Target: {path}")
         if await aiopath.isdir(path):
@@ -88,6 +171,7 @@ async def clean_target(path):
 
 
 async def clean_download(path):
+    invalidate_scan(path)
     if await aiopath.exists(path):
         LOGGER.info(f"Cleaning Download: {path}")
         try:
@@ -118,7 +202,7 @@ def exit_clean_up(signal, frame):
     try:
         LOGGER.info("Please wait, while we clean up and stop the running downloads")
         clean_all()
-        srun(["pkill", "-9", "-f", "gunicorn|aria2c|qbittorrent-nox|ffmpeg"])
+        srun(["pkill", "-9", "-f", "gunicorn|aria2c|qbittorrent-nox|ffmpeg|rclone rcd"])
         sexit(0)
     except KeyboardInterrupt:
         LOGGER.warning("Force Exiting before the cleanup finishes!")
@@ -127,7 +211,9 @@ def exit_clean_up(signal, frame):
 
 async def clean_unwanted(path):
     LOGGER.info(f"Cleaning unwanted files/folders: {path}")
-    for dirpath, _, files in await sync_to_async(walk, path, topdown=False):
+    invalidate_scan(path)
+    manifest = await sync_to_async(scan_path, path)
+    for dirpath, _, files in manifest.walk(topdown=False):
         for filee in files:
             if (
                 filee.endswith(".!qB")
@@ -137,26 +223,24 @@ async def clean_unwanted(path):
                 await aioremove(ospath.join(dirpath, filee))
         if dirpath.endswith((".unwanted", "splited_files_mltb", "copied_mltb")):
             await aiormtree(dirpath)
-    for dirpath, _, files in await sync_to_async(walk, path, topdown=False):
+    manifest = await sync_to_async(scan_path, path)
+    for dirpath, _, _ in manifest.walk(topdown=False):
         if not await listdir(dirpath):
             await rmdir(dirpath)
 
 
 async def get_path_size(path):
+    """Uncached, for status pollers watching a tree while it grows"""
     if await aiopath.isfile(path):
         return await aiopath.getsize(path)
-    total_size = 0
-    for root, dirs, files in await sync_to_async(walk, path):
-        for f in files:
-            abs_path = ospath.join(root, f)
-            total_size += await aiopath.getsize(abs_path)
-    return total_size
+    return (await sync_to_async(scan_path, path)).size
 
 
 async def count_files_and_folders(path):
+    manifest = await scan_tree(path)
     total_files = 0
     total_folders = 0
-    for _, dirs, files in await sync_to_async(walk, path):
+    for _, dirs, files in manifest.walk():
         total_files += len(files)
         for f in files:
             if f.endswith(tuple(GLOBAL_EXTENSION_FILTER)):
@@ -198,6 +282,103 @@ def check_storage_threshold(size, threshold, arch=False, alloc=False):
     return True
 
 
+class VolumeWriter:
+    """
+    Write only stream rolling over to name.001, name.002 ... every volume_size
+    bytes, the same layout as `7z -v`, so archives are produced already split.
+    """
+
+    def __init__(self, path, volume_size=0):
+        self.__path = path
+        self.__volume_size = volume_size
+        self.__file = None
+        self.__written = 0
+        self.__pos = 0
+        self.volumes = []
+        self.__roll()
+
+    def __roll(self):
+        if self.__file is not None:
+            self.__file.close()
+        path = (
+            f"{self.__path}.{len(self.volumes) + 1:03}"
+            if self.__volume_size
+            else self.__path
+        )
+        self.__file = open(path, "wb")
+        self.volumes.append(path)
+        self.__written = 0
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            if self.__volume_size and self.__written >= self.__volume_size:
+                self.__roll()
+            room = (
+                self.__volume_size - self.__written if self.__volume_size else len(view)
+            )
+            written = self.__file.write(view[:room])
+            self.__written += written
+            view = view[written:]
+        self.__pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.__pos
+
+    def flush(self):
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+def zip_store(listener, src, dest, volume_size=0, delete=False):
+    """
+    Single pass store-only zip of src, removing every source file once it is
+    archived when delete is set, so the stage never holds two full copies.
+    """
+    base = ospath.dirname(src)
+    listener.arch_bytes = 0
+    if ospath.isfile(src):
+        tree = [(base, [], [ospath.basename(src)])]
+    else:
+        tree = walk(src)
+    writer = VolumeWriter(dest, volume_size)
+    try:
+        with ZipFile(writer, "w", ZIP_STORED) as zf:
+            for dirpath, _, files in tree:
+                if dirpath != base:
+                    zf.write(dirpath, ospath.relpath(dirpath, base))
+                for file_ in files:
+                    if file_.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
+                        continue
+                    f_path = ospath.join(dirpath, file_)
+                    zinfo = ZipInfo.from_file(f_path, ospath.relpath(f_path, base))
+                    zinfo.compress_type = ZIP_STORED
+                    with open(f_path, "rb") as sf, zf.open(zinfo, "w") as df:
+                        while chunk := sf.read(ZIP_CHUNK):
+                            if listener.suproc == "cancelled":
+                                return False
+                            df.write(chunk)
+                            listener.arch_bytes += len(chunk)
+                    if delete:
+                        remove(f_path)
+    finally:
+        writer.close()
+    return True
+
+
+async def run_7z(listener, cmd, offset=0, span=0):
+    """Runs 7z reporting its -bsp1 percentages as processed bytes of span"""
+    listener.arch_bytes = offset
+    listener.suproc = await create_subprocess_exec(*cmd, "-bsp1", "-bso0", stdout=PIPE)
+    while chunk := await listener.suproc.stdout.read(1024):
+        if span and (percents := re_findall(r"(\d+)%", chunk.decode(errors="ignore"))):
+            listener.arch_bytes = offset + span * int(percents[-1]) // 100
+    return await listener.suproc.wait()
+
+
 async def join_files(path):
     files = await listdir(path)
     results = []
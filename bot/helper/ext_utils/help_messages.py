@@ -450,6 +450,8 @@ default_desp = {
     "MEGA_LIMIT": "To limit the size of Mega download. the default unit is GB. Int",
     "TORRENT_LIMIT": "To limit the size of torrent download. the default unit is GB. Int",
     "DIRECT_LIMIT": "To limit the size of direct link download. the default unit is GB. Int",
+    "DIRECT_PARALLEL_DOWNLOADS": "Number of files downloaded at once from a direct link folder (mediafire, gofile, terabox, index...). Default is 4. Int",
+    "DIRECT_DOWNLOAD_RETRIES": "Number of times a failed file of a direct link folder is retried before it is skipped. Default is 2. Int",
     "YTDLP_LIMIT": "To limit the size of ytdlp download. the default unit is GB. Int",
     "PLAYLIST_LIMIT": "To limit Maximum Playlist Number. Int",
     "IMAGES": "Add multiple telgraph(graph.org) image links that are seperated by spaces.",
@@ -461,6 +463,8 @@ default_desp = {
     "COVER_IMAGE": "Cover Image for Telegraph Page. Put Telegraph Photo Link",
     "TITLE_NAME": "Title name for Telegraph pages (while using /list command)",
     "GD_INFO": "Description of file uploaded to gdrive using bot",
+    "GD_CLONE_WORKERS": "Number of files copied at once while cloning a Google Drive folder. Each worker uses its own service account when USE_SERVICE_ACCOUNTS is enabled. Default is 8. Int",
+    "GD_UPLOAD_WORKERS": "Number of files uploaded at once while mirroring a folder to Google Drive. Each worker uses its own service account when USE_SERVICE_ACCOUNTS is enabled. Default is 4. Int",
     "DELETE_LINKS": "Delete TgLink/Magnet/File on Start of Task to Auto Clean Group. Default is False",
     "EXCEP_CHATS": "Exception Chats which will not use Logging, chat_id separated by space. Str",
     "SAFE_MODE": "Hide Task Name, Source Link and Indexing of Leech Link for Safety Precautions. Default is False",
@@ -493,6 +497,7 @@ default_desp = {
     "IS_TEAM_DRIVE": "Set True if uploading to TeamDrive using google-api-python-client. Default is False",
     "SHOW_MEDIAINFO": "Add Button to Show MediaInfo in Leeched file. Bool",
     "SCREENSHOTS_MODE": "Enable or Diable generating Screenshots via -ss arg. Default is False. Bool",
+    "SCREENSHOTS_SHEET": "Add a contact sheet (mosaic of all screenshots) on top of the -ss Screenshots page. Default is False. Bool",
     "CAP_FONT": "Add Custom Caption Font to Leeched Files, Available Values : b, i, u, s, code, spoiler. Reset Var to use Regular ( No Format )",
     "LEECH_FILENAME_PREFIX": "Add custom word prefix to leeched file name. Str",
     "LEECH_FILENAME_SUFFIX": "Add custom word suffix to leeched file name. Str",
@@ -504,15 +509,24 @@ default_desp = {
     "REAL_DEBRID_API": "Set real-debrid.com API for Torrent Cache & Few Supported Hosters (VPN Maybe). Str",
     "LEECH_SPLIT_SIZE": "Size of split in bytes. Default is 2GB. Default is 4GB if your account is premium.",
     "MEDIA_GROUP": "View Uploaded splitted file parts in media group. Default is False.",
+    "LEECH_PARALLEL_UPLOADS": "Number of files uploaded to Telegram at once while leeching. Files are balanced between bot and premium user session and re-posted in the original order. Default is 1 (one by one). Int",
+    "UPLOAD_DEDUPE": "Reuse files already uploaded with the same content instead of uploading them again. Telegram leeches are copied from the earlier message and GDrive uploads are server-side copied. Index is kept in DB when DATABASE_URL is set. Default is False. Bool",
+    "UPLOAD_DEDUPE_VERIFY": "Confirm every UPLOAD_DEDUPE match with a full MD5 hash of the file before reusing it. Slower on big files but rules out fingerprint collisions. Default is False. Bool",
     "MEGA_EMAIL": "E-Mail used to sign-in on mega.nz for using premium account. Str",
     "MEGA_PASSWORD": "Password for mega.nz account. Str",
     "OWNER_ID": "The Telegram User ID (not username) of the Owner of the bot.",
     "QUEUE_ALL": "Number of parallel tasks of downloads and uploads. For example if 20 task added and QUEUE_ALL is 8, then the summation of uploading and downloading tasks are 8 and the rest in queue. Int. NOTE: if you want to fill QUEUE_DOWNLOAD or QUEUE_UPLOAD, then QUEUE_ALL value must be greater than or equal to the greatest one and less than or equal to summation of QUEUE_UPLOAD and QUEUE_DOWNLOAD",
     "QUEUE_DOWNLOAD": "Number of all parallel downloading tasks. Int",
     "QUEUE_UPLOAD": "Number of all parallel uploading tasks. Int",
+    "QUEUE_CPU": "Number of tasks allowed to extract, zip, split or edit metadata at once. Not counted in QUEUE_ALL. Int",
+    "EXECUTOR_IO_LONG": "Threads for long blocking jobs like Google Drive transfers and yt-dlp extraction. Default is 64. Int",
+    "EXECUTOR_IO_SHORT": "Threads for quick blocking calls like qBittorrent, Aria2 and file system lookups. Default is 32. Int",
+    "EXECUTOR_CPU": "Threads for hashing, image and other CPU bound work. 0 means number of CPU cores. Default is 0. Int",
     "RCLONE_FLAGS": "key:value|key|key|key:value . Check here all RcloneFlags.",
     "RCLONE_PATH": "Default rclone path to which you want to upload all the mirrors using rclone.",
     "RCLONE_SERVE_URL": "Valid URL where the bot is deployed to use rclone serve. Format of URL should be http://myip, where myip is the IP/Domain(public) of your bot or if you have chosen port other than 80 so write it in this format http://myip:port (http and not https)",
+    "RCLONE_RCD": "Run rclone transfers as jobs of a local rclone rcd daemon instead of one rclone process per task. Progress comes from the daemon stats. Tasks with flags the daemon can't apply still use a separate process. Default is False. Bool",
+    "RCLONE_RCD_BWLIMIT": "Bandwidth limit applied to every file of each RCLONE_RCD job, like 10M. Empty means unlimited. Str",
     "RCLONE_SERVE_USER": "Username for rclone serve authentication.",
     "RCLONE_SERVE_PASS": "Password for rclone serve authentication.",
     "RCLONE_SERVE_PORT": "Which is the RCLONE_SERVE_URL Port. Default is 8080.",
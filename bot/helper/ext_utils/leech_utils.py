@@ -1,16 +1,17 @@
-from hashlib import md5
+from math import ceil, sqrt
 from time import strftime, gmtime, time
 from re import sub as re_sub, search as re_search
 from shlex import split as ssplit
 from natsort import natsorted
-from os import path as ospath
-from aiofiles.os import remove as aioremove, path as aiopath, mkdir, makedirs, listdir
+from os import path as ospath, cpu_count
+from aiofiles.os import remove as aioremove, path as aiopath, mkdir, makedirs
 from aioshutil import rmtree as aiormtree
 from contextlib import suppress
 from asyncio import create_subprocess_exec, create_task, gather, Semaphore
 from asyncio.subprocess import PIPE
 from telegraph import upload_file
 from langcodes import Language
+from PIL import Image
 
 from bot import LOGGER, MAX_SPLIT_SIZE, config_dict, user_data
 from bot.modules.mediainfo import parseinfo
@@ -21,95 +22,40 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
 )
 from bot.helper.ext_utils.fs_utils import ARCH_EXT, get_mime_type
+from bot.helper.ext_utils.media_probe import media_probe
+from bot.helper.ext_utils.upload_index import upload_index
 from bot.helper.ext_utils.telegraph_helper import telegraph
 
 
 async def is_multi_streams(path):
-    try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_streams",
-                path,
-            ]
-        )
-        if res := result[1]:
-            LOGGER.warning(f"Get Video Streams: {res}")
-    except Exception as e:
-        LOGGER.error(f"Get Video Streams: {e}. Mostly File not found!")
+    if (probe := await media_probe.probe(path)) is None:
         return False
-    fields = eval(result[0]).get("streams")
-    if fields is None:
-        LOGGER.error(f"get_video_streams: {result}")
-        return False
-    videos = 0
-    audios = 0
-    for stream in fields:
-        if stream.get("codec_type") == "video":
-            videos += 1
-        elif stream.get("codec_type") == "audio":
-            audios += 1
-    return videos > 1 or audios > 1
+    return probe.is_multi_streams
 
 
 async def get_media_info(path, metadata=False):
-    try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_format",
-                "-show_streams",
-                path,
-            ]
-        )
-        if res := result[1]:
-            LOGGER.warning(f"Media Info FF: {res}")
-    except Exception as e:
-        LOGGER.error(f"Media Info: {e}. Mostly File not found!")
-        return (0, "", "", "") if metadata else (0, None, None)
-    ffresult = eval(result[0])
-    fields = ffresult.get("format")
-    if fields is None:
-        LOGGER.error(f"Media Info Sections: {result}")
+    if (probe := await media_probe.probe(path)) is None or probe.format is None:
+        LOGGER.error(f"Media Info Sections: Unable to probe {path}")
         return (0, "", "", "") if metadata else (0, None, None)
-    duration = round(float(fields.get("duration", 0)))
+    duration = probe.duration
     if metadata:
         lang, qual, stitles = "", "", ""
-        if (streams := ffresult.get("streams")) and streams[0].get(
-            "codec_type"
-        ) == "video":
-            qual = int(streams[0].get("height"))
+        if (streams := probe.streams) and streams[0].codec_type == "video":
+            qual = int(streams[0].height)
             qual = f"{480 if qual <= 480 else 540 if qual <= 540 else 720 if qual <= 720 else 1080 if qual <= 1080 else 2160 if qual <= 2160 else 4320 if qual <= 4320 else 8640}p"
             for stream in streams:
-                if stream.get("codec_type") == "audio" and (
-                    lc := stream.get("tags", {}).get("language")
-                ):
+                if stream.codec_type == "audio" and (lc := stream.language):
                     with suppress(Exception):
                         lc = Language.get(lc).display_name()
                     if lc not in lang:
                         lang += f"{lc}, "
-                if stream.get("codec_type") == "subtitle" and (
-                    st := stream.get("tags", {}).get("language")
-                ):
+                if stream.codec_type == "subtitle" and (st := stream.language):
                     with suppress(Exception):
                         st = Language.get(st).display_name()
                     if st not in stitles:
                         stitles += f"{st}, "
         return duration, qual, lang[:-2], stitles[:-2]
-    tags = fields.get("tags", {})
-    artist = tags.get("artist") or tags.get("ARTIST") or tags.get("Artist")
-    title = tags.get("title") or tags.get("TITLE") or tags.get("Title")
-    return duration, artist, title
+    return duration, probe.format.tag("artist"), probe.format.tag("title")
 
 
 async def get_document_type(path):
@@ -125,34 +71,9 @@ async def get_document_type(path):
         return False, False, True
     if not mime_type.startswith("video") and not mime_type.endswith("octet-stream"):
         return is_video, is_audio, is_image
-    try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_streams",
-                path,
-            ]
-        )
-        if res := result[1]:
-            LOGGER.warning(f"Get Document Type: {res}")
-    except Exception as e:
-        LOGGER.error(f"Get Document Type: {e}. Mostly File not found!")
-        return is_video, is_audio, is_image
-    fields = eval(result[0]).get("streams")
-    if fields is None:
-        LOGGER.error(f"get_document_type: {result}")
+    if (probe := await media_probe.probe(path)) is None:
         return is_video, is_audio, is_image
-    for stream in fields:
-        if stream.get("codec_type") == "video":
-            is_video = True
-        elif stream.get("codec_type") == "audio":
-            is_audio = True
-    return is_video, is_audio, is_image
+    return probe.has_video, probe.has_audio, is_image
 
 
 async def get_audio_thumb(audio_file):
@@ -182,6 +103,74 @@ async def get_audio_thumb(audio_file):
     return des_dir
 
 
+SS_BATCH = 25
+
+
+async def extract_frames(video_file, des_dir, stamps):
+    """
+    Grab the nearest keyframe of every timestamp. One ffmpeg run handles a whole
+    batch: each input is seeked on the demuxer and only keyframes get decoded.
+    """
+    items = list(stamps.items())
+    ss_sem = Semaphore(3)
+
+    async def extract_batch(batch):
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+        for _, seconds in batch:
+            cmd.extend(
+                [
+                    "-skip_frame",
+                    "nokey",
+                    "-noaccurate_seek",
+                    "-ss",
+                    str(seconds),
+                    "-i",
+                    video_file,
+                ]
+            )
+        for index, (name, _) in enumerate(batch):
+            cmd.extend(
+                ["-map", f"{index}:v:0", "-frames:v", "1", ospath.join(des_dir, name)]
+            )
+        async with ss_sem:
+            proc = await create_subprocess_exec(*cmd, stderr=PIPE)
+            _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            LOGGER.error(
+                f"Error while extracting screenshots from video. Name: {video_file} stderr: {stderr.decode().strip()}"
+            )
+
+    await gather(
+        *[
+            extract_batch(items[i : i + SS_BATCH])
+            for i in range(0, len(items), SS_BATCH)
+        ]
+    )
+    return [
+        name for name, _ in items if await aiopath.exists(ospath.join(des_dir, name))
+    ]
+
+
+def make_contact_sheet(des_dir, names, sheet_width=1920):
+    columns = min(ceil(sqrt(len(names))), 10)
+    cell_width = sheet_width // columns
+    images = []
+    for name in names:
+        with Image.open(ospath.join(des_dir, name)) as img:
+            img.thumbnail((cell_width, cell_width))
+            images.append(img.convert("RGB"))
+    cell_height = max(img.height for img in images)
+    sheet = Image.new(
+        "RGB", (sheet_width, cell_height * ceil(len(images) / columns)), "black"
+    )
+    for index, img in enumerate(images):
+        row, column = divmod(index, columns)
+        sheet.paste(img, (column * cell_width, row * cell_height))
+    sheet_path = ospath.join(des_dir, "wz_contact_sheet.jpg")
+    sheet.save(sheet_path, "JPEG", quality=85)
+    return sheet_path
+
+
 async def take_ss(video_file, duration=None, total=1, gen_ss=False):
     des_dir = ospath.join("Thumbnails", f"{time()}")
     await makedirs(des_dir, exist_ok=True)
@@ -190,6 +179,17 @@ async def take_ss(video_file, duration=None, total=1, gen_ss=False):
     if duration == 0:
         duration = 3
     duration = duration - (duration * 2 / 100)
+    if gen_ss:
+        stamps = {
+            f"wz_thumb_{eq_thumb}.jpg": (duration // total) * eq_thumb
+            for eq_thumb in range(1, total + 1)
+        }
+        if not (names := await extract_frames(video_file, des_dir, stamps)):
+            await aiormtree(des_dir)
+            return None
+        return des_dir, {
+            name: strftime("%H:%M:%S", gmtime(float(stamps[name]))) for name in names
+        }
     cmd = [
         "ffmpeg",
         "-hide_banner",
@@ -234,6 +234,156 @@ async def take_ss(video_file, duration=None, total=1, gen_ss=False):
     return (des_dir, tstamps) if gen_ss else ospath.join(des_dir, "wz_thumb_1.jpg")
 
 
+class SubprocessGroup:
+    def __init__(self):
+        self.__procs = set()
+        self.returncode = None
+
+    def add(self, proc):
+        self.__procs.add(proc)
+
+    def discard(self, proc):
+        self.__procs.discard(proc)
+
+    def kill(self):
+        self.returncode = -9
+        for proc in list(self.__procs):
+            with suppress(ProcessLookupError):
+                proc.kill()
+
+
+async def get_keyframes(path):
+    stdout, stderr, code = await cmd_exec(
+        [
+            "ffprobe",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "packet=pts_time,pos,flags",
+            "-of",
+            "csv=p=0",
+            path,
+        ]
+    )
+    if code != 0:
+        LOGGER.warning(f"Get Keyframes: {stderr}. Path: {path}")
+        return []
+    keyframes = []
+    for line in stdout.splitlines():
+        pts_time, pos, flags = (line.split(",") + ["", "", ""])[:3]
+        if "K" not in flags:
+            continue
+        with suppress(ValueError):
+            keyframes.append((float(pts_time), int(pos)))
+    return sorted(keyframes)
+
+
+def plan_segments(keyframes, file_size, split_size):
+    segments = []
+    seg_start, seg_pos = 0.0, 0
+    prev = None
+    for pts_time, pos in keyframes:
+        if pts_time <= seg_start:
+            continue
+        if pos - seg_pos > split_size and prev is not None:
+            segments.append((seg_start, prev[0]))
+            seg_start, seg_pos = prev
+        prev = (pts_time, pos)
+    if file_size - seg_pos > split_size and prev is not None and prev[0] > seg_start:
+        segments.append((seg_start, prev[0]))
+        seg_start = prev[0]
+    segments.append((seg_start, None))
+    return segments
+
+
+async def split_video_parallel(
+    path, file_, dirpath, split_size, listener, multi_streams
+):
+    size = await aiopath.getsize(path)
+    if not (keyframes := await get_keyframes(path)):
+        return None
+    probe = await media_probe.probe(path)
+    offset = (
+        float(probe.format.raw.get("start_time", 0)) if probe and probe.format else 0
+    )
+    keyframes = [(max(pts_time - offset, 0), pos) for pts_time, pos in keyframes]
+    segments = plan_segments(keyframes, size, split_size)
+    if len(segments) < 2:
+        return None
+    base_name, extension = ospath.splitext(file_)
+    group = SubprocessGroup()
+    if listener.suproc == "cancelled":
+        return False
+    listener.suproc = group
+    split_sem = Semaphore(max(1, min(len(segments), cpu_count() or 1)))
+    LOGGER.info(f"Splitting {path} into {len(segments)} parts by keyframes")
+
+    async def split_segment(i, start_time, end_time):
+        out_path = ospath.join(dirpath, f"{base_name}.part{i:03}{extension}")
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-ss",
+            str(start_time),
+            "-i",
+            path,
+            "-map",
+            "0",
+            "-map_chapters",
+            "-1",
+            "-async",
+            "1",
+            "-strict",
+            "-2",
+            "-c",
+            "copy",
+            out_path,
+        ]
+        if end_time is not None:
+            cmd[8:8] = ["-t", str(end_time - start_time)]
+        if not multi_streams:
+            del cmd[-11:-9]
+        async with split_sem:
+            if group.returncode == -9:
+                return out_path, -9, ""
+            proc = await create_subprocess_exec(*cmd, stderr=PIPE)
+            group.add(proc)
+            _, stderr = await proc.communicate()
+            group.discard(proc)
+            return out_path, proc.returncode, stderr.decode().strip()
+
+    results = await gather(
+        *[
+            split_segment(i, start_time, end_time)
+            for i, (start_time, end_time) in enumerate(segments, start=1)
+        ]
+    )
+    if group.returncode == -9 or any(code == -9 for _, code, _ in results):
+        group.returncode = -9
+        return False
+    failed = [err for _, code, err in results if code != 0]
+    oversized = [
+        out_path
+        for out_path, code, _ in results
+        if code == 0 and await aiopath.getsize(out_path) > MAX_SPLIT_SIZE
+    ]
+    if failed or oversized:
+        LOGGER.warning(
+            f"Keyframe split failed, falling back to sequential split. Path: {path} {failed[:1]}"
+        )
+        for out_path, _, _ in results:
+            with suppress(Exception):
+                await aioremove(out_path)
+        return None
+    group.returncode = 0
+    return True
+
+
 async def split_file(
     path,
     size,
@@ -272,6 +422,12 @@ async def split_file(
         duration = (await get_media_info(path))[0]
         base_name, extension = ospath.splitext(file_)
         split_size -= 5000000
+        if not inLoop:
+            res = await split_video_parallel(
+                path, file_, dirpath, split_size, listener, multi_streams
+            )
+            if res is not None:
+                return res
         while i <= parts or start_time < duration - 4:
             parted_name = f"{base_name}.part{i:03}{extension}"
             out_path = ospath.join(dirpath, parted_name)
@@ -488,7 +644,11 @@ async def format_filename(file_, user_id, dirpath=None, isMirror=False):
             quality=qual,
             languages=lang,
             subtitles=subs,
-            md5_hash=get_md5_hash(up_path),
+            md5_hash=(
+                await sync_to_async(get_md5_hash, up_path, pool="cpu")
+                if "{md5_hash}" in slit[0]
+                else ""
+            ),
         )
         if len(slit) > 1:
             for rep in range(1, len(slit)):
@@ -504,17 +664,27 @@ async def format_filename(file_, user_id, dirpath=None, isMirror=False):
 
 
 async def get_ss(up_path, ss_no):
-    thumbs_path, tstamps = await take_ss(up_path, total=min(ss_no, 250), gen_ss=True)
+    if (ss := await take_ss(up_path, total=min(ss_no, 250), gen_ss=True)) is None:
+        raise Exception("Unable to extract screenshots!")
+    thumbs_path, tstamps = ss
     th_html = f"📌 <h4>{ospath.basename(up_path)}</h4><br>📇 <b>Total Screenshots:</b> {ss_no}<br><br>"
     up_sem = Semaphore(25)
 
     async def telefile(thumb):
         async with up_sem:
-            tele_id = await sync_to_async(upload_file, ospath.join(thumbs_path, thumb))
-            return tele_id[0], tstamps[thumb]
-
-    tasks = [telefile(thumb) for thumb in natsorted(await listdir(thumbs_path))]
-    results = await gather(*tasks)
+            tele_id = await sync_to_async(
+                upload_file, ospath.join(thumbs_path, thumb), pool="io-long"
+            )
+            return tele_id[0], tstamps.get(thumb)
+
+    thumbs = natsorted(tstamps.keys())
+    if config_dict["SCREENSHOTS_SHEET"]:
+        sheet = await sync_to_async(make_contact_sheet, thumbs_path, thumbs, pool="cpu")
+        tele_id, _ = await telefile(ospath.basename(sheet))
+        th_html += (
+            f'<img src="https://graph.org{tele_id}"><br><pre>Contact Sheet</pre><br>'
+        )
+    results = await gather(*[telefile(thumb) for thumb in thumbs])
     th_html += "".join(
         f'<img src="https://graph.org{tele_id}"><br><pre>Screenshot at {stamp}</pre>'
         for tele_id, stamp in results
@@ -536,8 +706,14 @@ async def get_mediainfo_link(up_path):
 
 
 def get_md5_hash(up_path):
-    md5_hash = md5()
-    with open(up_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            md5_hash.update(byte_block)
-        return md5_hash.hexdigest()
+    return upload_index.md5(up_path)
+
+
+async def get_upload_key(up_path):
+    key = await sync_to_async(upload_index.fingerprint, up_path, pool="cpu")
+    md5_hash = (
+        await sync_to_async(get_md5_hash, up_path, pool="cpu")
+        if config_dict["UPLOAD_DEDUPE_VERIFY"]
+        else None
+    )
+    return key, md5_hash
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+from asyncio import create_subprocess_exec, shield
+from asyncio.subprocess import PIPE
+from collections import OrderedDict
+from json import loads as jsonloads
+from os import stat
+
+from bot import LOGGER, bot_loop
+
+PROBE_CACHE_SIZE = 512
+
+
+class ProbeStream:
+    def __init__(self, stream):
+        self.index = stream.get("index", 0)
+        self.codec_type = stream.get("codec_type")
+        self.codec_name = stream.get("codec_name")
+        self.width = stream.get("width")
+        self.height = stream.get("height")
+        self.tags = stream.get("tags", {})
+        self.raw = stream
+
+    @property
+    def language(self):
+        return self.tags.get("language")
+
+
+class ProbeFormat:
+    def __init__(self, fmt):
+        self.format_name = fmt.get("format_name", "")
+        self.duration = float(fmt.get("duration", 0) or 0)
+        self.size = int(fmt.get("size", 0) or 0)
+        self.bit_rate = int(fmt.get("bit_rate", 0) or 0)
+        self.tags = fmt.get("tags", {})
+        self.raw = fmt
+
+    def tag(self, name):
+        return (
+            self.tags.get(name)
+            or self.tags.get(name.upper())
+            or self.tags.get(name.title())
+        )
+
+
+class ProbeResult:
+    def __init__(self, data):
+        self.format = ProbeFormat(data["format"]) if data.get("format") else None
+        self.streams = [ProbeStream(stream) for stream in data.get("streams", [])]
+
+    def streams_of(self, codec_type):
+        return [stream for stream in self.streams if stream.codec_type == codec_type]
+
+    @property
+    def duration(self):
+        return round(self.format.duration) if self.format else 0
+
+    @property
+    def has_video(self):
+        return any(stream.codec_type == "video" for stream in self.streams)
+
+    @property
+    def has_audio(self):
+        return any(stream.codec_type == "audio" for stream in self.streams)
+
+    @property
+    def is_multi_streams(self):
+        return len(self.streams_of("video")) > 1 or len(self.streams_of("audio")) > 1
+
+
+class MediaProbe:
+    def __init__(self, max_size=PROBE_CACHE_SIZE):
+        self.__max_size = max_size
+        self.__cache = OrderedDict()
+        self.__pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    async def __run_ffprobe(path):
+        proc = await create_subprocess_exec(
+            "ffprobe",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            path,
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        if err := stderr.decode().strip():
+            LOGGER.warning(f"FFprobe: {err}")
+        try:
+            return ProbeResult(jsonloads(stdout or b"{}"))
+        except ValueError as e:
+            LOGGER.error(f"FFprobe: {e}. Path: {path}")
+            return None
+
+    async def probe(self, path):
+        try:
+            st = stat(path)
+        except OSError as e:
+            LOGGER.error(f"FFprobe: {e}. Mostly File not found!")
+            return None
+        key = (path, st.st_size, st.st_mtime_ns)
+        if (result := self.__cache.get(key)) is not None:
+            self.__cache.move_to_end(key)
+            self.hits += 1
+            return result
+        if (future := self.__pending.get(key)) is not None:
+            self.hits += 1
+            return await shield(future)
+        self.misses += 1
+        future = bot_loop.create_future()
+        self.__pending[key] = future
+        result = None
+        try:
+            result = await self.__run_ffprobe(path)
+        except Exception as e:
+            LOGGER.error(f"FFprobe: {e}. Path: {path}")
+        finally:
+            del self.__pending[key]
+            future.set_result(result)
+        if result is not None:
+            self.__cache[key] = result
+            while len(self.__cache) > self.__max_size:
+                self.__cache.popitem(last=False)
+        return result
+
+    def invalidate(self, path):
+        for key in [key for key in self.__cache if key[0] == path]:
+            del self.__cache[key]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached": len(self.__cache),
+            "ratio": round(self.hits / total * 100, 1) if total else 0,
+        }
+
+
+media_probe = MediaProbe()
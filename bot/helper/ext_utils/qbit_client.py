@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+from asyncio import Lock as AsyncLock
+from threading import Lock
+from time import time
+from types import SimpleNamespace
+
+from aiohttp import ClientSession, ClientTimeout, CookieJar, TCPConnector
+from qbittorrentapi import Client as qbClient, SyncMainDataDictionary, TorrentInfoList
+
+QB_HOST = "localhost"
+QB_PORT = 8090
+QB_POOL_SIZE = 16
+QB_TIMEOUT = (30, 60)
+
+
+class RpcMetrics:
+    def __init__(self):
+        self.__lock = Lock()
+        self.__endpoints = {}
+
+    def record(self, endpoint, elapsed, failed=False):
+        with self.__lock:
+            entry = self.__endpoints.setdefault(
+                endpoint, {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0}
+            )
+            entry["calls"] += 1
+            entry["errors"] += failed
+            entry["total"] += elapsed
+            entry["max"] = max(entry["max"], elapsed)
+
+    def stats(self, top=5):
+        with self.__lock:
+            endpoints = sorted(
+                self.__endpoints.items(), key=lambda e: e[1]["total"], reverse=True
+            )[:top]
+        return [
+            {
+                "endpoint": endpoint,
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "total": round(entry["total"], 2),
+                "avg": round(entry["total"] / entry["calls"] * 1000),
+                "max": round(entry["max"] * 1000),
+            }
+            for endpoint, entry in endpoints
+        ]
+
+
+class QbitClient(qbClient):
+    """
+    Shared qBittorrent client, its requests session keeps the SID cookie and a
+    keep-alive pool for every thread; expired logins are renewed by the
+    library's 403 retry, so callers must never auth_log_out().
+    """
+
+    def __init__(self, metrics, **kwargs):
+        super().__init__(**kwargs)
+        self._rpc_metrics = metrics
+
+    def _request(self, http_method, api_namespace, api_method, *args, **kwargs):
+        started = time()
+        failed = True
+        try:
+            response = super()._request(
+                http_method, api_namespace, api_method, *args, **kwargs
+            )
+            failed = False
+            return response
+        finally:
+            namespace = getattr(api_namespace, "value", api_namespace)
+            self._rpc_metrics.record(
+                f"{namespace}/{api_method}", time() - started, failed
+            )
+
+
+class AsyncQbitClient:
+    """
+    aiohttp facade for the hot polling endpoints, so the listener and status
+    loops don't need an executor hop per call. Results are wrapped in the
+    same qbittorrentapi types, bound to the sync client for follow-up calls.
+    """
+
+    def __init__(
+        self, client, metrics, username="", password="", host=QB_HOST, port=QB_PORT
+    ):
+        self.__client = client
+        self.__metrics = metrics
+        self.__username = username
+        self.__password = password
+        self.__base = f"http://{host}:{port}/api/v2"
+        self.__session = None
+        self.__login_lock = AsyncLock()
+
+    def __get_session(self):
+        if self.__session is None or self.__session.closed:
+            self.__session = ClientSession(
+                connector=TCPConnector(limit=QB_POOL_SIZE, keepalive_timeout=60),
+                cookie_jar=CookieJar(unsafe=True),
+                timeout=ClientTimeout(connect=QB_TIMEOUT[0], sock_read=QB_TIMEOUT[1]),
+            )
+        return self.__session
+
+    async def __login(self):
+        async with self.__login_lock:
+            async with self.__get_session().post(
+                f"{self.__base}/auth/login",
+                data={"username": self.__username, "password": self.__password},
+            ) as resp:
+                resp.raise_for_status()
+
+    @staticmethod
+    def __format(params):
+        formatted = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            elif isinstance(value, (list, tuple, set)):
+                value = "|".join(map(str, value))
+            formatted[key] = str(value)
+        return formatted
+
+    async def request(self, http_method, api_namespace, api_method, **params):
+        url = f"{self.__base}/{api_namespace}/{api_method}"
+        payload = self.__format(params)
+        kwargs = {"params": payload} if http_method == "get" else {"data": payload}
+        started = time()
+        failed = True
+        try:
+            for attempt in range(2):
+                async with self.__get_session().request(
+                    http_method, url, **kwargs
+                ) as resp:
+                    if resp.status == 403 and attempt == 0:
+                        await self.__login()
+                        continue
+                    resp.raise_for_status()
+                    if resp.content_type == "application/json":
+                        result = await resp.json()
+                    else:
+                        result = await resp.text()
+                failed = False
+                return result
+        finally:
+            self.__metrics.record(
+                f"{api_namespace}/{api_method}", time() - started, failed
+            )
+
+    async def torrents_info(self, status_filter=None, torrent_hashes=None, **params):
+        data = await self.request(
+            "get",
+            "torrents",
+            "info",
+            filter=status_filter,
+            hashes=torrent_hashes,
+            **params,
+        )
+        return TorrentInfoList(data, client=self.__client)
+
+    async def sync_maindata(self, rid=0):
+        return SyncMainDataDictionary(
+            await self.request("get", "sync", "maindata", rid=rid)
+        )
+
+    async def torrents_reannounce(self, torrent_hashes):
+        await self.request("post", "torrents", "reannounce", hashes=torrent_hashes)
+
+    async def torrents_recheck(self, torrent_hashes):
+        await self.request("post", "torrents", "recheck", hashes=torrent_hashes)
+
+    async def close(self):
+        if self.__session is not None and not self.__session.closed:
+            await self.__session.close()
+
+
+def apply_maindata(torrents, maindata):
+    """Merges a sync/maindata delta into torrents, returns the changed hashes"""
+    if maindata.get("full_update"):
+        torrents.clear()
+    for hash_ in maindata.get("torrents_removed") or []:
+        torrents.pop(hash_, None)
+    changed = set()
+    for hash_, data in (maindata.get("torrents") or {}).items():
+        torrents.setdefault(hash_, {"hash": hash_}).update(data)
+        changed.add(hash_)
+    return changed
+
+
+async def dispatch_states(
+    torrents, changed, tracked, handlers, default, tick_states, client, reannounce
+):
+    """
+    Calls the state handler of every tracked torrent that changed, wasn't
+    seen yet or sits in one of tick_states (timeouts need every tick).
+    """
+    for hash_, data in list(torrents.items()):
+        tor_info = SimpleNamespace(**data)
+        if (entry := tracked.get(getattr(tor_info, "tags", None))) is None:
+            continue
+        if hash_ not in changed and tor_info.state not in tick_states and entry["seen"]:
+            continue
+        entry["seen"] = True
+        await handlers.get(tor_info.state, default)(client, tor_info, reannounce)
+
+
+qbit_metrics = RpcMetrics()
+qbit_client = QbitClient(
+    qbit_metrics,
+    host=QB_HOST,
+    port=QB_PORT,
+    VERIFY_WEBUI_CERTIFICATE=False,
+    REQUESTS_ARGS={"timeout": QB_TIMEOUT},
+    HTTPADAPTER_ARGS={"pool_connections": QB_POOL_SIZE, "pool_maxsize": QB_POOL_SIZE},
+)
+qbit_async = AsyncQbitClient(qbit_client, qbit_metrics)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+from asyncio import sleep
+from os import listdir, path as ospath
+from threading import Lock
+from time import time
+
+from bot import DATABASE_URL, LOGGER, bot_loop
+from bot.helper.ext_utils.db_handler import DbManger
+
+SA_DIR = "accounts"
+# Drive caps every account at 750 GB of uploads/copies per rolling 24h
+SA_DAILY_QUOTA = 750 * 1024**3
+SA_WINDOW = 24 * 60 * 60
+SA_BUCKET = 60 * 60
+SA_COOLDOWN = 15 * 60
+SA_ERROR_HALF_LIFE = 30 * 60
+SA_ASSIGN_HALF_LIFE = 5 * 60
+SA_SAVE_INTERVAL = 10
+
+
+def decayed(value, since, now, half_life):
+    return value * 0.5 ** ((now - since) / half_life) if value else 0.0
+
+
+class ServiceAccountPool:
+    """
+    Shared picker for the accounts/ service accounts used by Drive and rclone.
+
+    Every account keeps hourly buckets of the bytes it wrote in the last 24h,
+    a decaying error score and a cooldown that doubles on consecutive rate
+    limits, so transfers start on the account with the most quota left
+    instead of finding the exhausted ones chunk by chunk.
+    """
+
+    def __init__(self, quota=SA_DAILY_QUOTA):
+        self.__quota = quota
+        self.__lock = Lock()
+        self.__states = {}
+        self.__dirty = set()
+        self.__save_pending = False
+        self.__files = []
+        self.__files_mtime = None
+
+    def accounts(self):
+        try:
+            mtime = ospath.getmtime(SA_DIR)
+        except OSError:
+            return []
+        if mtime != self.__files_mtime:
+            self.__files = sorted(listdir(SA_DIR))
+            self.__files_mtime = mtime
+        return self.__files
+
+    def count(self):
+        return len(self.accounts())
+
+    def __state(self, name):
+        if (state := self.__states.get(name)) is None:
+            state = self.__states[name] = {
+                "usage": [],
+                "errors": 0.0,
+                "error_time": 0,
+                "strikes": 0,
+                "cooldown": 0,
+                "assigned": 0.0,
+                "assign_time": 0,
+            }
+        return state
+
+    def __used(self, state, now):
+        start = (now - SA_WINDOW) // SA_BUCKET
+        if state["usage"] and state["usage"][0][0] <= start:
+            state["usage"] = [b for b in state["usage"] if b[0] > start]
+        return sum(size for _, size in state["usage"])
+
+    def __score(self, state, now):
+        left = max(self.__quota - self.__used(state, now), 0)
+        errors = decayed(state["errors"], state["error_time"], now, SA_ERROR_HALF_LIFE)
+        assigned = decayed(
+            state["assigned"], state["assign_time"], now, SA_ASSIGN_HALF_LIFE
+        )
+        return left * 0.5**errors / (1 + assigned)
+
+    def acquire(self, exclude=()):
+        """Returns the healthiest account file name, or None without accounts"""
+        if not (accounts := self.accounts()):
+            return None
+        now = time()
+        with self.__lock:
+            candidates = [name for name in accounts if name not in exclude] or accounts
+            states = {name: self.__state(name) for name in candidates}
+            if ready := [n for n in candidates if states[n]["cooldown"] <= now]:
+                name = max(ready, key=lambda n: self.__score(states[n], now))
+            else:
+                name = min(candidates, key=lambda n: states[n]["cooldown"])
+            state = states[name]
+            state["assigned"] = (
+                decayed(
+                    state["assigned"], state["assign_time"], now, SA_ASSIGN_HALF_LIFE
+                )
+                + 1
+            )
+            state["assign_time"] = now
+        return name
+
+    def index(self, name):
+        return self.accounts().index(name)
+
+    def record(self, name, size):
+        if name is None or size <= 0:
+            return
+        bucket = int(time()) // SA_BUCKET
+        with self.__lock:
+            usage = self.__state(name)["usage"]
+            if usage and usage[-1][0] == bucket:
+                usage[-1][1] += size
+            else:
+                usage.append([bucket, size])
+            self.__mark(name)
+
+    def report_error(self, name, rate_limited=False):
+        if name is None:
+            return
+        now = time()
+        with self.__lock:
+            state = self.__state(name)
+            state["errors"] = (
+                decayed(state["errors"], state["error_time"], now, SA_ERROR_HALF_LIFE)
+                + 1
+            )
+            state["error_time"] = now
+            if rate_limited:
+                state["strikes"] += 1
+                state["cooldown"] = now + min(
+                    SA_COOLDOWN * 2 ** (state["strikes"] - 1), SA_WINDOW
+                )
+                LOGGER.info(
+                    f"Service account {name} cooling down for {int(state['cooldown'] - now)}s"
+                )
+            self.__mark(name)
+
+    def report_success(self, name):
+        if name is None:
+            return
+        with self.__lock:
+            if (state := self.__states.get(name)) and state["strikes"]:
+                state["strikes"] = 0
+                self.__mark(name)
+
+    def __mark(self, name):
+        self.__dirty.add(name)
+        if DATABASE_URL and not self.__save_pending:
+            self.__save_pending = True
+            bot_loop.call_soon_threadsafe(bot_loop.create_task, self.__save())
+
+    async def __save(self):
+        await sleep(SA_SAVE_INTERVAL)
+        with self.__lock:
+            self.__save_pending = False
+            docs = {}
+            for name in self.__dirty:
+                doc = dict(self.__states[name])
+                doc["usage"] = [list(bucket) for bucket in doc["usage"]]
+                del doc["assigned"], doc["assign_time"]
+                docs[name] = doc
+            self.__dirty.clear()
+        db = DbManger()
+        for name, doc in docs.items():
+            await db.update_sa_state(name, doc)
+
+    async def load(self):
+        if not DATABASE_URL:
+            return
+        try:
+            rows = await DbManger().get_sa_states()
+        except Exception as e:
+            LOGGER.error(f"Service Accounts: {e}")
+            return
+        with self.__lock:
+            for row in rows:
+                name = row.pop("_id")
+                state = self.__state(name)
+                state.update(row)
+                state["usage"] = [list(bucket) for bucket in state["usage"]]
+
+    def stats(self):
+        now = time()
+        accounts = self.accounts()
+        with self.__lock:
+            states = [self.__state(name) for name in accounts]
+            used = [self.__used(state, now) for state in states]
+            cooling = sum(state["cooldown"] > now for state in states)
+        return {
+            "total": len(accounts),
+            "ready": len(accounts) - cooling,
+            "cooling": cooling,
+            "used": sum(used),
+            "left": sum(max(self.__quota - u, 0) for u in used),
+        }
+
+
+sa_pool = ServiceAccountPool()
@@ -1,20 +1,17 @@
 #!/usr/bin/env python3
 from time import time
-from asyncio import Event
 
 from bot import (
     bot_cache,
     config_dict,
-    queued_dl,
-    queued_up,
-    non_queued_up,
-    non_queued_dl,
     queue_dict_lock,
     LOGGER,
     user_data,
     download_dict,
+    download_dict_lock,
 )
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
+from bot.helper.ext_utils.task_scheduler import task_scheduler
 from bot.helper.ext_utils.fs_utils import get_base_name, check_storage_threshold
 from bot.helper.ext_utils.bot_utils import (
     get_user_tasks,
@@ -25,6 +22,7 @@ from bot.helper.ext_utils.bot_utils import (
     checking_access,
     get_readable_time,
 )
+from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
 from bot.helper.telegram_helper.message_utils import forcesub, check_botpm
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.themes import BotTheme
@@ -48,7 +46,7 @@ async def stop_duplicate_check(name, listener):
             name = None
     if name is not None:
         telegraph_content, contents_no = await sync_to_async(
-            GoogleDriveHelper().drive_list, name, stopDup=True
+            GoogleDriveHelper().drive_list, name, stopDup=True, pool="io-long"
         )
         if telegraph_content:
             msg = BotTheme("STOP_DUPLICATE", content=contents_no)
@@ -67,87 +65,44 @@ async def timeval_check(user_id):
     return None
 
 
-async def is_queued(uid):
-    all_limit = config_dict["QUEUE_ALL"]
-    dl_limit = config_dict["QUEUE_DOWNLOAD"]
-    event = None
-    added_to_queue = False
-    if all_limit or dl_limit:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            if (
-                all_limit and dl + up >= all_limit and (not dl_limit or dl >= dl_limit)
-            ) or (dl_limit and dl >= dl_limit):
-                added_to_queue = True
-                event = Event()
-                queued_dl[uid] = event
-    return added_to_queue, event
-
-
-def start_dl_from_queued(uid):
-    queued_dl[uid].set()
-    del queued_dl[uid]
-
-
-def start_up_from_queued(uid):
-    queued_up[uid].set()
-    del queued_up[uid]
+async def is_queued(listener, kind="dl"):
+    async with queue_dict_lock:
+        event = task_scheduler.enqueue(kind, listener)
+    return event is not None, event
 
 
 async def start_from_queued():
-    if all_limit := config_dict["QUEUE_ALL"]:
-        dl_limit = config_dict["QUEUE_DOWNLOAD"]
-        up_limit = config_dict["QUEUE_UPLOAD"]
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            all_ = dl + up
-            if all_ < all_limit:
-                f_tasks = all_limit - all_
-                if queued_up and (not up_limit or up < up_limit):
-                    for index, uid in enumerate(list(queued_up.keys()), start=1):
-                        f_tasks = all_limit - all_
-                        start_up_from_queued(uid)
-                        f_tasks -= 1
-                        if f_tasks == 0 or (up_limit and index >= up_limit - up):
-                            break
-                if queued_dl and (not dl_limit or dl < dl_limit) and f_tasks != 0:
-                    for index, uid in enumerate(list(queued_dl.keys()), start=1):
-                        start_dl_from_queued(uid)
-                        if (dl_limit and index >= dl_limit - dl) or index == f_tasks:
-                            break
-        return
-
-    if up_limit := config_dict["QUEUE_UPLOAD"]:
-        async with queue_dict_lock:
-            up = len(non_queued_up)
-            if queued_up and up < up_limit:
-                f_tasks = up_limit - up
-                for index, uid in enumerate(list(queued_up.keys()), start=1):
-                    start_up_from_queued(uid)
-                    if index == f_tasks:
-                        break
+    async with queue_dict_lock:
+        task_scheduler.dispatch()
+
+
+async def remove_from_queue(uid):
+    async with queue_dict_lock:
+        task_scheduler.cancel(uid)
+    await start_from_queued()
+
+
+async def start_cpu_task(listener, name, size, gid):
+    added_to_queue, event = await is_queued(listener, "cpu")
+    if added_to_queue:
+        LOGGER.info(f"Added to Queue/CPU: {name}")
+        async with download_dict_lock:
+            download_dict[listener.uid] = QueueStatus(name, size, gid, listener, "cpu")
+        await event.wait()
+        async with download_dict_lock:
+            if listener.uid not in download_dict:
+                return False
+        LOGGER.info(f"Start from Queued/CPU: {name}")
     else:
         async with queue_dict_lock:
-            if queued_up:
-                for uid in list(queued_up.keys()):
-                    start_up_from_queued(uid)
+            task_scheduler.running("cpu").add(listener.uid)
+    return True
 
-    if dl_limit := config_dict["QUEUE_DOWNLOAD"]:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            if queued_dl and dl < dl_limit:
-                f_tasks = dl_limit - dl
-                for index, uid in enumerate(list(queued_dl.keys()), start=1):
-                    start_dl_from_queued(uid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_dl:
-                for uid in list(queued_dl.keys()):
-                    start_dl_from_queued(uid)
+
+async def finish_cpu_task(uid):
+    async with queue_dict_lock:
+        task_scheduler.finish("cpu", uid)
+    await start_from_queued()
 
 
 async def limit_checker(
@@ -208,7 +163,13 @@ async def limit_checker(
         if (
             STORAGE_THRESHOLD := config_dict["STORAGE_THRESHOLD"]
         ) and not listener.isClone:
-            arch = any([listener.compress, listener.extract])
+            # store-only zips stream into their volumes, only extraction,
+            # seeding or encrypted 7z archives keep a second full copy
+            arch = bool(
+                listener.extract
+                or listener.compress
+                and (listener.seed or isinstance(listener.compress, str))
+            )
             limit = STORAGE_THRESHOLD * 1024**3
             acpt = await sync_to_async(check_storage_threshold, size, limit, arch)
             if not acpt:
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+from logging import getLogger
+
+LOGGER = getLogger(__name__)
+
+
+class TaskRegistry(dict):
+    """
+    download_dict keyed by listener uid, with gid, user and status indexes
+    kept in step on every assignment/removal, so lookups never walk every task.
+
+    Only the engines whose state changes by itself (status classes with
+    live_status = True, e.g. aria2/qbit) are asked for their status or gid
+    again, every other status object is replaced on a stage change anyway.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__gids = {}
+        self.__users = {}
+        self.__statuses = {}
+        self.__live = set()
+        self.__meta = {}
+
+    @staticmethod
+    def __user_of(dl):
+        user = getattr(dl.message, "from_user", None)
+        return user.id if user else None
+
+    @staticmethod
+    def __safe(func):
+        try:
+            return func()
+        except Exception as e:
+            LOGGER.error(f"TaskRegistry: {e}")
+            return None
+
+    def __index(self, uid, dl):
+        gid = self.__safe(dl.gid)
+        user_id = self.__user_of(dl)
+        if getattr(dl, "live_status", False):
+            status = None
+            self.__live.add(uid)
+        else:
+            status = self.__safe(dl.status)
+            self.__statuses.setdefault(status, set()).add(uid)
+        if gid is not None:
+            self.__gids[gid] = uid
+        self.__users.setdefault(user_id, set()).add(uid)
+        self.__meta[uid] = (gid, user_id, status)
+
+    def __unindex(self, uid):
+        if (meta := self.__meta.pop(uid, None)) is None:
+            return
+        gid, user_id, status = meta
+        if gid is not None and self.__gids.get(gid) == uid:
+            del self.__gids[gid]
+        self.__discard(self.__users, user_id, uid)
+        self.__discard(self.__statuses, status, uid)
+        self.__live.discard(uid)
+
+    @staticmethod
+    def __discard(index, key, uid):
+        if (uids := index.get(key)) is not None:
+            uids.discard(uid)
+            if not uids:
+                del index[key]
+
+    def __setitem__(self, uid, dl):
+        self.__unindex(uid)
+        super().__setitem__(uid, dl)
+        self.__index(uid, dl)
+
+    def __delitem__(self, uid):
+        super().__delitem__(uid)
+        self.__unindex(uid)
+
+    def pop(self, uid, *default):
+        self.__unindex(uid)
+        return super().pop(uid, *default)
+
+    def clear(self):
+        super().clear()
+        for index in (self.__gids, self.__users, self.__statuses, self.__meta):
+            index.clear()
+        self.__live.clear()
+
+    def __regid(self, uid, dl):
+        gid = self.__safe(dl.gid)
+        old_gid, user_id, status = self.__meta[uid]
+        if old_gid != gid:
+            if old_gid is not None and self.__gids.get(old_gid) == uid:
+                del self.__gids[old_gid]
+            if gid is not None:
+                self.__gids[gid] = uid
+            self.__meta[uid] = (gid, user_id, status)
+        return gid
+
+    def by_gid(self, gid):
+        if (uid := self.__gids.get(gid)) is not None and (dl := self.get(uid)):
+            # aria2 moves a task to a new gid after metadata/torrent files
+            if uid not in self.__live or self.__regid(uid, dl) == gid:
+                return dl
+        for uid in list(self.__live):
+            if (dl := self.get(uid)) is not None and self.__regid(uid, dl) == gid:
+                return dl
+        return None
+
+    def by_user(self, user_id):
+        return [self[uid] for uid in self.__users.get(user_id, ()) if uid in self]
+
+    def user_count(self, user_id):
+        return len(self.__users.get(user_id, ()))
+
+    def by_status(self, status, user_id=None):
+        if status == "all":
+            uids = set(self.__meta)
+        else:
+            uids = set(self.__statuses.get(status, ()))
+            uids.update(
+                uid
+                for uid in self.__live
+                if uid in self and self.__safe(self[uid].status) == status
+            )
+        if user_id:
+            uids.intersection_update(self.__users.get(user_id, ()))
+        return [self[uid] for uid in uids if uid in self]
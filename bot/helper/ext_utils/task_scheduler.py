@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+from asyncio import Event
+from heapq import heapify, heappop, heappush
+from itertools import count
+from time import time
+
+from bot import OWNER_ID, config_dict, non_queued_dl, non_queued_up, user_data
+
+PRIORITY_WEIGHTS = {"owner": 4, "sudo": 2, "user": 1}
+WAIT_BUCKETS = (1, 10, 60, 300, 900, 3600)
+QUEUE_KINDS = ("up", "dl", "cpu")
+LIMIT_KEYS = {"dl": "QUEUE_DOWNLOAD", "up": "QUEUE_UPLOAD", "cpu": "QUEUE_CPU"}
+
+
+class FairQueue:
+    """
+    Start-time fair queue: every user owns a virtual clock advancing by
+    1/weight per queued task, so a 300 link bulk only delays its own tail
+    and newcomers are always tagged right after the task being served.
+    Tags never change once given and the clock only moves forward, so the
+    tasks another user can slip ahead of a waiting one are bounded by their
+    weight and that task's own backlog, which ages it without re-keying.
+    """
+
+    def __init__(self):
+        self.__heap = []
+        self.__entries = {}
+        self.__tags = {}
+        self.__seq = count()
+        self.__vtime = 0.0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, uid):
+        return uid in self.__entries
+
+    def push(self, uid, user_id, weight):
+        tag = max(self.__vtime, self.__tags.get(user_id, 0.0)) + 1 / weight
+        self.__tags[user_id] = tag
+        entry = [tag, next(self.__seq), uid, user_id, Event(), time()]
+        self.__entries[uid] = entry
+        heappush(self.__heap, entry)
+        return entry[4]
+
+    def pop(self):
+        while self.__heap:
+            entry = heappop(self.__heap)
+            tag, _, uid, user_id, event, enqueued = entry
+            if uid is None:
+                continue
+            del self.__entries[uid]
+            self.__vtime = tag
+            if self.__tags.get(user_id) == tag:
+                del self.__tags[user_id]
+            return uid, event, time() - enqueued
+        return None
+
+    def remove(self, uid):
+        if (entry := self.__entries.pop(uid, None)) is None:
+            return None
+        entry[2] = None
+        if len(self.__heap) > 2 * len(self.__entries) + 64:
+            self.__heap = [e for e in self.__heap if e[2] is not None]
+            heapify(self.__heap)
+        return entry[4]
+
+
+class TaskScheduler:
+    def __init__(self):
+        self.__queues = {kind: FairQueue() for kind in QUEUE_KINDS}
+        self.__running = {"dl": non_queued_dl, "up": non_queued_up, "cpu": set()}
+        self.__waits = {kind: [0] * (len(WAIT_BUCKETS) + 1) for kind in QUEUE_KINDS}
+
+    @staticmethod
+    def weight(listener):
+        user_id = listener.message.from_user.id
+        if user_id == OWNER_ID:
+            return PRIORITY_WEIGHTS["owner"]
+        if user_data.get(user_id, {}).get("is_sudo"):
+            return PRIORITY_WEIGHTS["sudo"]
+        return PRIORITY_WEIGHTS["user"]
+
+    def running(self, kind):
+        return self.__running[kind]
+
+    def queued(self, kind):
+        return len(self.__queues[kind])
+
+    def __free(self, kind):
+        running = len(self.__running[kind])
+        if (limit := config_dict[LIMIT_KEYS[kind]]) and running >= limit:
+            return False
+        if kind != "cpu" and (all_limit := config_dict["QUEUE_ALL"]):
+            return len(self.__running["dl"]) + len(self.__running["up"]) < all_limit
+        return True
+
+    def __record_wait(self, kind, waited):
+        for index, bucket in enumerate(WAIT_BUCKETS):
+            if waited <= bucket:
+                break
+        else:
+            index = len(WAIT_BUCKETS)
+        self.__waits[kind][index] += 1
+
+    def enqueue(self, kind, listener):
+        """Must be called under queue_dict_lock, returns None if admitted now"""
+        if not self.__queues[kind] and self.__free(kind):
+            self.__record_wait(kind, 0)
+            return None
+        event = self.__queues[kind].push(
+            listener.uid, listener.message.from_user.id, self.weight(listener)
+        )
+        self.dispatch()
+        return None if event.is_set() else event
+
+    def dispatch(self):
+        for kind in QUEUE_KINDS:
+            queue = self.__queues[kind]
+            while queue and self.__free(kind):
+                uid, event, waited = queue.pop()
+                self.__running[kind].add(uid)
+                self.__record_wait(kind, waited)
+                event.set()
+
+    def cancel(self, uid):
+        for kind in QUEUE_KINDS:
+            if (event := self.__queues[kind].remove(uid)) is not None:
+                event.set()
+            self.__running[kind].discard(uid)
+
+    def finish(self, kind, uid):
+        self.__running[kind].discard(uid)
+
+    def wait_histogram(self, kind):
+        labels = [f"≤{b}s" if b < 60 else f"≤{b // 60}m" for b in WAIT_BUCKETS]
+        labels.append(f">{WAIT_BUCKETS[-1] // 60}m")
+        return " | ".join(
+            f"{label}: {hits}" for label, hits in zip(labels, self.__waits[kind])
+        )
+
+    def stats(self):
+        return {
+            kind: {
+                "running": len(self.__running[kind]),
+                "queued": len(self.__queues[kind]),
+                "waits": self.wait_histogram(kind),
+            }
+            for kind in QUEUE_KINDS
+        }
+
+
+task_scheduler = TaskScheduler()
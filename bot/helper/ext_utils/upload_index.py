@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+from collections import OrderedDict
+from hashlib import blake2b, md5
+from os import stat
+from threading import Lock
+
+from bot import DATABASE_URL, LOGGER
+from bot.helper.ext_utils.db_handler import DbManger
+
+SAMPLE_SIZE = 1024 * 1024
+SAMPLE_COUNT = 8
+HASH_CHUNK = 4 * 1024 * 1024
+INDEX_CACHE_SIZE = 1024
+
+
+class UploadIndex:
+    """
+    Content-addressed index of finished uploads and resumable upload sessions.
+
+    Files are keyed by their size plus a blake2b digest of evenly spaced
+    samples, and every key maps to the objects already produced for it
+    ==> {"md5": str, "tg:doc": {"chat_id", "msg_id"}, "gd": {"id"}, "gds": {"uri"}}
+    """
+
+    def __init__(self, max_size=INDEX_CACHE_SIZE):
+        self.__max_size = max_size
+        self.__docs = OrderedDict()
+        self.__hashes = OrderedDict()
+        self.__hashes_lock = Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.saved_bytes = 0
+
+    def __cached_hash(self, path, kind, func):
+        st = stat(path)
+        # inode based so renames before upload keep their hashes
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, kind)
+        if (digest := self.__hashes.get(key)) is None:
+            digest = func(path, st.st_size)
+            with self.__hashes_lock:
+                self.__hashes[key] = digest
+                while len(self.__hashes) > self.__max_size:
+                    self.__hashes.popitem(last=False)
+        return digest
+
+    @staticmethod
+    def __sampled_hash(path, size):
+        digest = blake2b(str(size).encode(), digest_size=16)
+        with open(path, "rb") as f:
+            if size <= SAMPLE_SIZE * SAMPLE_COUNT:
+                digest.update(f.read())
+            else:
+                step = (size - SAMPLE_SIZE) // (SAMPLE_COUNT - 1)
+                for i in range(SAMPLE_COUNT):
+                    f.seek(i * step)
+                    digest.update(f.read(SAMPLE_SIZE))
+        return f"{size}-{digest.hexdigest()}"
+
+    @staticmethod
+    def __full_hash(path, size):
+        md5_hash = md5()
+        with open(path, "rb") as f:
+            for byte_block in iter(lambda: f.read(HASH_CHUNK), b""):
+                md5_hash.update(byte_block)
+        return md5_hash.hexdigest()
+
+    def fingerprint(self, path):
+        return self.__cached_hash(path, "fp", self.__sampled_hash)
+
+    def md5(self, path):
+        return self.__cached_hash(path, "md5", self.__full_hash)
+
+    async def __load(self, key):
+        if (doc := self.__docs.get(key)) is not None:
+            self.__docs.move_to_end(key)
+            return doc
+        doc = {}
+        if DATABASE_URL:
+            try:
+                if row := await DbManger().get_upload_index(key):
+                    del row["_id"]
+                    doc = row
+            except Exception as e:
+                LOGGER.error(f"Upload Index: {e}")
+        self.__docs[key] = doc
+        while len(self.__docs) > self.__max_size:
+            self.__docs.popitem(last=False)
+        return doc
+
+    async def __save(self, key, doc):
+        if DATABASE_URL:
+            await DbManger().update_upload_index(key, dict(doc))
+
+    async def lookup(self, key, target, md5_hash=None):
+        self.lookups += 1
+        doc = await self.__load(key)
+        if (entry := doc.get(target)) is None:
+            return None
+        if md5_hash is not None and doc.get("md5") != md5_hash:
+            return None
+        return entry
+
+    async def session(self, key, target):
+        return (await self.__load(key)).get(target)
+
+    async def record(self, key, target, entry, md5_hash=None):
+        doc = await self.__load(key)
+        if md5_hash is not None and doc.get("md5") not in [None, md5_hash]:
+            # sampled fingerprint collision, keep only the verified content
+            doc.clear()
+        if md5_hash is not None:
+            doc["md5"] = md5_hash
+        doc[target] = entry
+        await self.__save(key, doc)
+
+    async def discard(self, key, target):
+        doc = await self.__load(key)
+        if doc.pop(target, None) is not None:
+            await self.__save(key, doc)
+
+    def reused(self, size):
+        self.hits += 1
+        self.saved_bytes += size
+
+    def stats(self):
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "saved": self.saved_bytes,
+            "ratio": round(self.hits / self.lookups * 100, 1) if self.lookups else 0,
+        }
+
+
+upload_index = UploadIndex()
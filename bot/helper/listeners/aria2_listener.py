@@ -103,7 +103,7 @@ async def __onDownloadStarted(api, gid):
                         name = None
                 if name is not None:
                     telegraph_content, contents_no = await sync_to_async(
-                        GoogleDriveHelper().drive_list, name, True
+                        GoogleDriveHelper().drive_list, name, True, pool="io-long"
                     )
                     if telegraph_content:
                         msg = BotTheme("STOP_DUPLICATE", content=contents_no)
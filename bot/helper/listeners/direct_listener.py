@@ -1,7 +1,16 @@
-from time import sleep
+from asyncio import sleep
 
-from bot import LOGGER, aria2
-from bot.helper.ext_utils.bot_utils import async_to_sync, sync_to_async
+from bot import LOGGER, aria2, config_dict
+from bot.helper.ext_utils.bot_utils import sync_to_async
+
+STATUS_KEYS = [
+    "gid",
+    "status",
+    "totalLength",
+    "completedLength",
+    "downloadSpeed",
+    "errorMessage",
+]
 
 
 class DirectListener:
@@ -12,69 +21,130 @@ class DirectListener:
         self.__a2c_opt = a2c_opt
         self.__proc_bytes = 0
         self.__failed = 0
-        self.task = None
+        self.__active = {}
+        self.__stats = {}
+        self.__retries = {}
         self.name = foldername
         self.total_size = total_size
 
     @property
     def processed_bytes(self):
-        if self.task:
-            return self.__proc_bytes + self.task.completed_length
-        return self.__proc_bytes
+        return self.__proc_bytes + sum(
+            int(stat["completedLength"]) for stat in self.__stats.values()
+        )
 
     @property
     def speed(self):
-        return self.task.download_speed if self.task else 0
+        return sum(int(stat["downloadSpeed"]) for stat in self.__stats.values())
+
+    @property
+    def is_waiting(self):
+        return bool(self.__stats) and all(
+            stat["status"] == "waiting" for stat in self.__stats.values()
+        )
 
-    def download(self, contents):
+    async def __add_download(self, content):
+        a2c_opt = {**self.__a2c_opt}
+        if content["path"]:
+            a2c_opt["dir"] = f"{self.__path}/{content['path']}"
+        else:
+            a2c_opt["dir"] = self.__path
+        a2c_opt["out"] = content["filename"]
+        try:
+            gid = await sync_to_async(
+                aria2.client.add_uri, [content["url"]], a2c_opt, position=0
+            )
+        except Exception as e:
+            self.__failed += 1
+            LOGGER.error(f"Unable to download {content['filename']} due to: {e}")
+            return
+        self.__active[gid] = content
+
+    async def __remove_downloads(self, gids, files=True):
+        try:
+            downloads = await sync_to_async(aria2.get_downloads, gids)
+            await sync_to_async(aria2.remove, downloads, force=True, files=files)
+        except Exception as e:
+            LOGGER.error(f"Unable to remove direct downloads: {e}")
+
+    async def __on_failed(self, gid, content, error_message, pending):
+        LOGGER.error(
+            f"Unable to download {content['filename']} due to: {error_message}"
+        )
+        await self.__remove_downloads([gid])
+        tries = self.__retries.get(content["url"], 0)
+        if tries < config_dict["DIRECT_DOWNLOAD_RETRIES"]:
+            self.__retries[content["url"]] = tries + 1
+            LOGGER.info(f"Retrying ({tries + 1}): {content['filename']}")
+            pending.append(content)
+        else:
+            self.__failed += 1
+
+    async def __poll(self, pending):
+        gids = list(self.__active)
+        results = await sync_to_async(
+            aria2.client.multicall2,
+            [(aria2.client.TELL_STATUS, gid, STATUS_KEYS) for gid in gids],
+        )
+        completed = []
+        for gid, result in zip(gids, results):
+            if (content := self.__active.get(gid)) is None:
+                continue
+            if isinstance(result, dict):
+                del self.__active[gid]
+                self.__stats.pop(gid, None)
+                await self.__on_failed(
+                    gid, content, result.get("faultString", result), pending
+                )
+                continue
+            stat = result[0]
+            if stat["status"] == "complete":
+                del self.__active[gid]
+                self.__stats.pop(gid, None)
+                self.__proc_bytes += int(stat["totalLength"])
+                completed.append(gid)
+            elif stat["status"] in ["error", "removed"] or stat.get("errorMessage"):
+                del self.__active[gid]
+                self.__stats.pop(gid, None)
+                await self.__on_failed(
+                    gid, content, stat.get("errorMessage", stat["status"]), pending
+                )
+            else:
+                self.__stats[gid] = stat
+        if completed:
+            await sync_to_async(
+                aria2.client.multicall2,
+                [(aria2.client.REMOVE_DOWNLOAD_RESULT, gid) for gid in completed],
+            )
+
+    async def download(self, contents):
         self.is_downloading = True
-        for content in contents:
+        window = max(config_dict["DIRECT_PARALLEL_DOWNLOADS"], 1)
+        pending = list(contents)
+        while (pending or self.__active) and not self.__is_cancelled:
+            while pending and len(self.__active) < window:
+                await self.__add_download(pending.pop(0))
+            if not self.__active:
+                continue
+            await sleep(1)
             if self.__is_cancelled:
                 break
-            if content["path"]:
-                self.__a2c_opt["dir"] = f"{self.__path}/{content['path']}"
-            else:
-                self.__a2c_opt["dir"] = self.__path
-            filename = content["filename"]
-            self.__a2c_opt["out"] = filename
             try:
-                self.task = aria2.add_uris([content["url"]], self.__a2c_opt, position=0)
+                await self.__poll(pending)
             except Exception as e:
-                self.__failed += 1
-                LOGGER.error(f"Unable to download {filename} due to: {e}")
-                continue
-            self.task = self.task.live
-            while True:
-                if self.__is_cancelled:
-                    if self.task:
-                        self.task.remove(True, True)
-                    break
-                self.task = self.task.live
-                if error_message := self.task.error_message:
-                    self.__failed += 1
-                    LOGGER.error(
-                        f"Unable to download {self.task.name} due to: {error_message}"
-                    )
-                    self.task.remove(True, True)
-                    break
-                elif self.task.is_complete:
-                    self.__proc_bytes += self.task.total_length
-                    self.task.remove(True)
-                    break
-                sleep(1)
-            self.task = None
+                LOGGER.error(f"Error while polling direct downloads: {e}")
         if self.__is_cancelled:
             return
         if self.__failed == len(contents):
-            async_to_sync(
-                self.__listener.onDownloadError, "All files are failed to download!"
-            )
+            await self.__listener.onDownloadError("All files are failed to download!")
             return
-        async_to_sync(self.__listener.onDownloadComplete)
+        await self.__listener.onDownloadComplete()
 
     async def cancel_download(self):
         self.__is_cancelled = True
         LOGGER.info(f"Cancelling Download: {self.name}")
         await self.__listener.onDownloadError("Download Cancelled by User!")
-        if self.task:
-            await sync_to_async(self.task.remove, force=True, files=True)
+        if gids := list(self.__active):
+            self.__active.clear()
+            self.__stats.clear()
+            await self.__remove_downloads(gids)
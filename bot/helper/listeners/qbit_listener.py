@@ -22,6 +22,11 @@ from bot.helper.ext_utils.bot_utils import (
     sync_to_async,
 )
 from bot.helper.ext_utils.fs_utils import clean_unwanted
+from bot.helper.ext_utils.qbit_client import (
+    apply_maindata,
+    dispatch_states,
+    qbit_async,
+)
 from bot.helper.ext_utils.task_manager import limit_checker, stop_duplicate_check
 
 
@@ -99,7 +104,7 @@ async def __onDownloadComplete(tor):
     if listener.select:
         await clean_unwanted(listener.dir)
     await listener.onDownloadComplete()
-    client = await sync_to_async(get_client)
+    client = get_client()
     if listener.seed:
         async with download_dict_lock:
             if listener.uid in download_dict:
@@ -117,108 +122,122 @@ async def __onDownloadComplete(tor):
                 return
         await update_all_messages()
         LOGGER.info(f"Seeding started: {tor.name} - Hash: {ext_hash}")
-        await sync_to_async(client.auth_log_out)
     else:
         await __remove_torrent(client, ext_hash, tag)
 
 
+async def __onMetaDL(client, tor_info, reannounce):
+    TORRENT_TIMEOUT = config_dict["TORRENT_TIMEOUT"]
+    QbTorrents[tor_info.tags]["stalled_time"] = time()
+    if TORRENT_TIMEOUT and time() - tor_info.added_on >= TORRENT_TIMEOUT:
+        __onDownloadError("Dead Torrent!", tor_info)
+    else:
+        reannounce.append(tor_info.hash)
+
+
+async def __onDownloading(client, tor_info, reannounce):
+    tag = tor_info.tags
+    QbTorrents[tag]["stalled_time"] = time()
+    if config_dict["STOP_DUPLICATE"] and not QbTorrents[tag]["stop_dup_check"]:
+        QbTorrents[tag]["stop_dup_check"] = True
+        __stop_duplicate(tor_info)
+    if (
+        any(
+            [
+                config_dict["STORAGE_THRESHOLD"],
+                config_dict["TORRENT_LIMIT"],
+                config_dict["LEECH_LIMIT"],
+                config_dict["DAILY_LEECH_LIMIT"],
+                config_dict["DAILY_MIRROR_LIMIT"],
+                config_dict["DAILY_TASK_LIMIT"],
+            ]
+        )
+        and not QbTorrents[tag]["size_checked"]
+    ):
+        QbTorrents[tag]["size_checked"] = True
+        __size_checked(tor_info)
+
+
+async def __onStalledDL(client, tor_info, reannounce):
+    tag = tor_info.tags
+    TORRENT_TIMEOUT = config_dict["TORRENT_TIMEOUT"]
+    if not QbTorrents[tag]["rechecked"] and 0.99989999999999999 < tor_info.progress < 1:
+        msg = f"Force recheck - Name: {tor_info.name} Hash: "
+        msg += f"{tor_info.hash} Downloaded Bytes: {tor_info.downloaded} "
+        msg += f"Size: {tor_info.size} Total Size: {tor_info.total_size}"
+        LOGGER.warning(msg)
+        await qbit_async.torrents_recheck(torrent_hashes=tor_info.hash)
+        QbTorrents[tag]["rechecked"] = True
+    elif (
+        TORRENT_TIMEOUT and time() - QbTorrents[tag]["stalled_time"] >= TORRENT_TIMEOUT
+    ):
+        __onDownloadError("Dead Torrent!", tor_info)
+    else:
+        reannounce.append(tor_info.hash)
+
+
+async def __onMissingFiles(client, tor_info, reannounce):
+    await qbit_async.torrents_recheck(torrent_hashes=tor_info.hash)
+
+
+async def __onError(client, tor_info, reannounce):
+    __onDownloadError("No enough space for this torrent on device", tor_info)
+
+
+async def __onOtherState(client, tor_info, reannounce):
+    tag = tor_info.tags
+    if (
+        tor_info.completion_on != 0
+        and not QbTorrents[tag]["uploaded"]
+        and tor_info.state not in ["checkingUP", "checkingDL", "checkingResumeData"]
+    ):
+        QbTorrents[tag]["uploaded"] = True
+        __onDownloadComplete(tor_info)
+    elif tor_info.state in ["pausedUP", "pausedDL"] and QbTorrents[tag]["seeding"]:
+        QbTorrents[tag]["seeding"] = False
+        __onSeedFinish(tor_info)
+
+
+STATE_HANDLERS = {
+    "metaDL": __onMetaDL,
+    "downloading": __onDownloading,
+    "stalledDL": __onStalledDL,
+    "missingFiles": __onMissingFiles,
+    "error": __onError,
+}
+# states that also need timeout/reannounce handling while nothing changes
+TICK_STATES = ["metaDL", "stalledDL"]
+
+
 async def __qb_listener():
-    client = await sync_to_async(get_client)
+    client = get_client()
+    rid = 0
+    torrents = {}
     while True:
         async with qb_listener_lock:
             try:
-                if len(await sync_to_async(client.torrents_info)) == 0:
+                maindata = await qbit_async.sync_maindata(rid=rid)
+                rid = maindata["rid"]
+                changed = apply_maindata(torrents, maindata)
+                if len(torrents) == 0:
                     QbInterval.clear()
-                    await sync_to_async(client.auth_log_out)
                     break
-                for tor_info in await sync_to_async(client.torrents_info):
-                    tag = tor_info.tags
-                    if tag not in QbTorrents:
-                        continue
-                    state = tor_info.state
-                    if state == "metaDL":
-                        TORRENT_TIMEOUT = config_dict["TORRENT_TIMEOUT"]
-                        QbTorrents[tag]["stalled_time"] = time()
-                        if (
-                            TORRENT_TIMEOUT
-                            and time() - tor_info.added_on >= TORRENT_TIMEOUT
-                        ):
-                            __onDownloadError("Dead Torrent!", tor_info)
-                        else:
-                            await sync_to_async(
-                                client.torrents_reannounce, torrent_hashes=tor_info.hash
-                            )
-                    elif state == "downloading":
-                        QbTorrents[tag]["stalled_time"] = time()
-                        if (
-                            config_dict["STOP_DUPLICATE"]
-                            and not QbTorrents[tag]["stop_dup_check"]
-                        ):
-                            QbTorrents[tag]["stop_dup_check"] = True
-                            __stop_duplicate(tor_info)
-                        if (
-                            any(
-                                [
-                                    config_dict["STORAGE_THRESHOLD"],
-                                    config_dict["TORRENT_LIMIT"],
-                                    config_dict["LEECH_LIMIT"],
-                                    config_dict["DAILY_LEECH_LIMIT"],
-                                    config_dict["DAILY_MIRROR_LIMIT"],
-                                    config_dict["DAILY_TASK_LIMIT"],
-                                ]
-                            )
-                            and not QbTorrents[tag]["size_checked"]
-                        ):
-                            QbTorrents[tag]["size_checked"] = True
-                            __size_checked(tor_info)
-                    elif state == "stalledDL":
-                        TORRENT_TIMEOUT = config_dict["TORRENT_TIMEOUT"]
-                        if (
-                            not QbTorrents[tag]["rechecked"]
-                            and 0.99989999999999999 < tor_info.progress < 1
-                        ):
-                            msg = f"Force recheck - Name: {tor_info.name} Hash: "
-                            msg += f"{tor_info.hash} Downloaded Bytes: {tor_info.downloaded} "
-                            msg += f"Size: {tor_info.size} Total Size: {tor_info.total_size}"
-                            LOGGER.warning(msg)
-                            await sync_to_async(
-                                client.torrents_recheck, torrent_hashes=tor_info.hash
-                            )
-                            QbTorrents[tag]["rechecked"] = True
-                        elif (
-                            TORRENT_TIMEOUT
-                            and time() - QbTorrents[tag]["stalled_time"]
-                            >= TORRENT_TIMEOUT
-                        ):
-                            __onDownloadError("Dead Torrent!", tor_info)
-                        else:
-                            await sync_to_async(
-                                client.torrents_reannounce, torrent_hashes=tor_info.hash
-                            )
-                    elif state == "missingFiles":
-                        await sync_to_async(
-                            client.torrents_recheck, torrent_hashes=tor_info.hash
-                        )
-                    elif state == "error":
-                        __onDownloadError(
-                            "No enough space for this torrent on device", tor_info
-                        )
-                    elif (
-                        tor_info.completion_on != 0
-                        and not QbTorrents[tag]["uploaded"]
-                        and state
-                        not in ["checkingUP", "checkingDL", "checkingResumeData"]
-                    ):
-                        QbTorrents[tag]["uploaded"] = True
-                        __onDownloadComplete(tor_info)
-                    elif (
-                        state in ["pausedUP", "pausedDL"] and QbTorrents[tag]["seeding"]
-                    ):
-                        QbTorrents[tag]["seeding"] = False
-                        __onSeedFinish(tor_info)
+                reannounce = []
+                await dispatch_states(
+                    torrents,
+                    changed,
+                    QbTorrents,
+                    STATE_HANDLERS,
+                    __onOtherState,
+                    TICK_STATES,
+                    client,
+                    reannounce,
+                )
+                if reannounce:
+                    await qbit_async.torrents_reannounce(torrent_hashes=reannounce)
             except Exception as e:
                 LOGGER.error(str(e))
-                client = await sync_to_async(get_client)
+                rid = 0
         await sleep(3)
 
 
@@ -231,6 +250,7 @@ async def onDownloadStart(tag):
             "uploaded": False,
             "seeding": False,
             "size_checked": False,
+            "seen": False,
         }
         if not QbInterval:
             periodic = bot_loop.create_task(__qb_listener())
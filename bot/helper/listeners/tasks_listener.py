@@ -4,13 +4,14 @@ from time import time
 from copy import deepcopy
 from pytz import timezone
 from datetime import datetime
+from re import sub as re_sub
 from urllib.parse import unquote, quote
 from requests import utils as rutils
 from aiofiles.os import path as aiopath, remove as aioremove, listdir, makedirs
-from os import walk, path as ospath
+from os import path as ospath
 from html import escape
 from aioshutil import move
-from asyncio import create_subprocess_exec, sleep, Event
+from asyncio import sleep
 from pyrogram.enums import ChatType
 
 from bot import (
@@ -29,8 +30,6 @@ from bot import (
     user_data,
     non_queued_up,
     non_queued_dl,
-    queued_up,
-    queued_dl,
     queue_dict_lock,
     bot,
     GLOBAL_EXTENSION_FILTER,
@@ -45,7 +44,6 @@ from bot.helper.ext_utils.bot_utils import (
 )
 from bot.helper.ext_utils.fs_utils import (
     get_base_name,
-    get_path_size,
     clean_download,
     clean_target,
     is_first_archive_split,
@@ -53,6 +51,10 @@ from bot.helper.ext_utils.fs_utils import (
     is_archive_split,
     join_files,
     edit_metadata,
+    zip_store,
+    run_7z,
+    scan_tree,
+    invalidate_scan,
 )
 from bot.helper.ext_utils.leech_utils import (
     split_file,
@@ -60,7 +62,13 @@ from bot.helper.ext_utils.leech_utils import (
     get_document_type,
 )
 from bot.helper.ext_utils.exceptions import NotSupportedExtractionArchive
-from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.ext_utils.task_manager import (
+    start_from_queued,
+    is_queued,
+    remove_from_queue,
+    start_cpu_task,
+    finish_cpu_task,
+)
 from bot.helper.mirror_utils.status_utils.extract_status import ExtractStatus
 from bot.helper.mirror_utils.status_utils.zip_status import ZipStatus
 from bot.helper.mirror_utils.status_utils.split_status import SplitStatus
@@ -138,6 +146,7 @@ class MirrorLeechListener:
         self.user_dict = user_data.get(self.user_id, {})
         self.isPM = config_dict["BOT_PM"] or self.user_dict.get("bot_pm")
         self.suproc = None
+        self.arch_bytes = None
         self.sameDir = sameDir
         self.rcFlags = rcFlags
         self.upPath = upPath
@@ -212,6 +221,11 @@ class MirrorLeechListener:
         else:
             self.source_msg = f"<code>{self.source_url}</code>"
 
+    def __invalidate_scans(self):
+        invalidate_scan(self.dir)
+        if self.newDir:
+            invalidate_scan(self.newDir)
+
     async def onDownloadStart(self):
         if config_dict["LINKS_LOG_ID"] and not self.excep_chat:
             dispTime = datetime.now(timezone(config_dict["TIMEZONE"])).strftime(
@@ -295,15 +309,21 @@ class MirrorLeechListener:
 
         dl_path = f"{self.dir}/{name}"
         up_path = ""
-        size = await get_path_size(dl_path)
+        size = (await scan_tree(dl_path)).size
         async with queue_dict_lock:
             if self.uid in non_queued_dl:
                 non_queued_dl.remove(self.uid)
         await start_from_queued()
         user_dict = user_data.get(self.message.from_user.id, {})
+        metadata = self.user_dict.get("lmeta") or config_dict["METADATA"]
+
+        cpu_slot = bool(self.join or self.extract or self.compress or metadata)
+        if cpu_slot and not await start_cpu_task(self, name, size, gid):
+            return
 
         if self.join and await aiopath.isdir(dl_path):
             await join_files(dl_path)
+            self.__invalidate_scans()
 
         if self.extract:
             pswd = self.extract if isinstance(self.extract, str) else ""
@@ -319,9 +339,9 @@ class MirrorLeechListener:
                         up_path = f"{self.newDir}/{name}"
                     else:
                         up_path = dl_path
-                    for dirpath, _, files in await sync_to_async(
-                        walk, dl_path, topdown=False
-                    ):
+                    offset = 0
+                    manifest = await scan_tree(dl_path)
+                    for dirpath, _, files in manifest.walk(topdown=False):
                         for file_ in files:
                             if (
                                 is_first_archive_split(file_)
@@ -351,8 +371,17 @@ class MirrorLeechListener:
                                     and self.suproc.returncode == -9
                                 ):
                                     return
-                                self.suproc = await create_subprocess_exec(*cmd)
-                                code = await self.suproc.wait()
+                                stem = re_sub(r"\.0*1$|(\.|_)part0*1\.rar$", "", file_)
+                                span = 0
+                                for part in files:
+                                    if part.startswith(stem) and (
+                                        is_archive(part) or is_archive_split(part)
+                                    ):
+                                        span += manifest.getsize(
+                                            ospath.join(dirpath, part)
+                                        )
+                                code = await run_7z(self, cmd, offset, span)
+                                offset += span
                                 if code == -9:
                                     return
                                 elif code != 0:
@@ -386,8 +415,7 @@ class MirrorLeechListener:
                         del cmd[2]
                     if self.suproc == "cancelled":
                         return
-                    self.suproc = await create_subprocess_exec(*cmd)
-                    code = await self.suproc.wait()
+                    code = await run_7z(self, cmd, 0, size)
                     if code == -9:
                         return
                     elif code == 0:
@@ -405,8 +433,9 @@ class MirrorLeechListener:
                 LOGGER.info("Not any valid archive, uploading file as it is.")
                 self.newDir = ""
                 up_path = dl_path
+            self.__invalidate_scans()
 
-        if metadata := self.user_dict.get("lmeta") or config_dict["METADATA"]:
+        if metadata:
             meta_path = up_path or dl_path
             self.newDir = f"{self.dir}10000"
             await makedirs(self.newDir, exist_ok=True)
@@ -422,7 +451,7 @@ class MirrorLeechListener:
                 if self.suproc == "cancelled":
                     return
             elif await aiopath.isdir(meta_path):
-                for dirpath, _, files in await sync_to_async(walk, meta_path):
+                for dirpath, _, files in (await scan_tree(meta_path)).walk():
                     for file in files:
                         if self.suproc == "cancelled":
                             return
@@ -448,41 +477,54 @@ class MirrorLeechListener:
             LEECH_SPLIT_SIZE = (
                 user_dict.get("split_size", False) or config_dict["LEECH_SPLIT_SIZE"]
             )
-            cmd = [
-                "7z",
-                f"-v{LEECH_SPLIT_SIZE}b",
-                "a",
-                "-mx=0",
-                f"-p{pswd}",
-                up_path,
-                dl_path,
-            ]
-            for ext in GLOBAL_EXTENSION_FILTER:
-                ex_ext = f"-xr!*.{ext}"
-                cmd.append(ex_ext)
-            if self.isLeech and int(size) > LEECH_SPLIT_SIZE:
-                if not pswd:
-                    del cmd[4]
+            volume_size = (
+                LEECH_SPLIT_SIZE if self.isLeech and int(size) > LEECH_SPLIT_SIZE else 0
+            )
+            if volume_size:
                 LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}.0*")
             else:
-                del cmd[1]
-                if not pswd:
-                    del cmd[3]
                 LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}")
             if self.suproc == "cancelled":
                 return
-            self.suproc = await create_subprocess_exec(*cmd)
-            code = await self.suproc.wait()
-            if code == -9:
-                return
-            elif not self.seed:
+            if pswd:
+                # encrypted zips still need 7z
+                cmd = ["7z", "a", "-mx=0", f"-p{pswd}", up_path, dl_path]
+                if volume_size:
+                    cmd.insert(1, f"-v{volume_size}b")
+                for ext in GLOBAL_EXTENSION_FILTER:
+                    cmd.append(f"-xr!*.{ext}")
+                code = await run_7z(self, cmd, 0, size)
+                if code == -9:
+                    return
+            else:
+                self.suproc = None
+                try:
+                    if not await sync_to_async(
+                        zip_store,
+                        self,
+                        dl_path,
+                        up_path,
+                        volume_size,
+                        not self.seed,
+                        pool="io-long",
+                    ):
+                        return
+                except Exception as e:
+                    LOGGER.error(f"Zip: {e}")
+                    await self.onUploadError(f"Unable to zip: {e}")
+                    return
+            if not self.seed:
                 await clean_target(dl_path)
 
+        if cpu_slot:
+            self.__invalidate_scans()
+
         if not self.compress and not self.extract:
             up_path = dl_path
 
         up_dir, up_name = up_path.rsplit("/", 1)
-        size = await get_path_size(up_dir)
+        manifest = await scan_tree(up_dir)
+        size = manifest.size
         if self.isLeech:
             m_size = []
             o_files = []
@@ -492,15 +534,19 @@ class MirrorLeechListener:
                     user_dict.get("split_size", False)
                     or config_dict["LEECH_SPLIT_SIZE"]
                 )
-                for dirpath, _, files in await sync_to_async(
-                    walk, up_dir, topdown=False
-                ):
+                for dirpath, _, files in manifest.walk(topdown=False):
                     for file_ in files:
                         f_path = ospath.join(dirpath, file_)
-                        f_size = await aiopath.getsize(f_path)
+                        f_size = manifest.getsize(f_path)
                         if f_size > LEECH_SPLIT_SIZE:
                             if not checked:
                                 checked = True
+                                if not cpu_slot:
+                                    cpu_slot = True
+                                    if not await start_cpu_task(
+                                        self, up_name, size, gid
+                                    ):
+                                        return
                                 async with download_dict_lock:
                                     download_dict[self.uid] = SplitStatus(
                                         up_name, size, gid, self
@@ -526,21 +572,14 @@ class MirrorLeechListener:
                             else:
                                 m_size.append(f_size)
                                 o_files.append(file_)
+                if checked:
+                    invalidate_scan(up_dir)
 
-        up_limit = config_dict["QUEUE_UPLOAD"]
-        all_limit = config_dict["QUEUE_ALL"]
-        added_to_queue = False
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            if (
-                all_limit and dl + up >= all_limit and (not up_limit or up >= up_limit)
-            ) or (up_limit and up >= up_limit):
-                added_to_queue = True
-                LOGGER.info(f"Added to Queue/Upload: {name}")
-                event = Event()
-                queued_up[self.uid] = event
+        if cpu_slot:
+            await finish_cpu_task(self.uid)
+        added_to_queue, event = await is_queued(self, "up")
         if added_to_queue:
+            LOGGER.info(f"Added to Queue/Upload: {name}")
             async with download_dict_lock:
                 download_dict[self.uid] = QueueStatus(name, size, gid, self, "Up")
             await event.wait()
@@ -551,7 +590,7 @@ class MirrorLeechListener:
         async with queue_dict_lock:
             non_queued_up.add(self.uid)
         if self.isLeech:
-            size = await get_path_size(up_dir)
+            size = (await scan_tree(up_dir)).size
             for s in m_size:
                 size = size - s
             LOGGER.info(f"Leech Name: {up_name}")
@@ -564,7 +603,7 @@ class MirrorLeechListener:
             await update_all_messages()
             await tg.upload(o_files, m_size, size)
         elif self.upPath == "gd":
-            size = await get_path_size(up_path)
+            size = (await scan_tree(up_dir)).size_of(up_path)
             LOGGER.info(f"Upload Name: {up_name}")
             drive = GoogleDriveHelper(up_name, up_dir, self)
             upload_status = GdriveStatus(
@@ -574,9 +613,11 @@ class MirrorLeechListener:
                 download_dict[self.uid] = upload_status
             await update_all_messages()
 
-            await sync_to_async(drive.upload, up_name, size, self.drive_id)
+            await sync_to_async(
+                drive.upload, up_name, size, self.drive_id, pool="io-long"
+            )
         elif self.upPath == "ddl":
-            size = await get_path_size(up_path)
+            size = (await scan_tree(up_dir)).size_of(up_path)
             LOGGER.info(f"Upload Name: {up_name} via DDL")
             ddl = DDLUploader(self, up_name, up_dir)
             ddl_upload_status = DDLStatus(
@@ -587,7 +628,7 @@ class MirrorLeechListener:
             await update_all_messages()
             await ddl.upload(up_name, size)
         else:
-            size = await get_path_size(up_path)
+            size = (await scan_tree(up_dir)).size_of(up_path)
             LOGGER.info(f"Upload Name: {up_name} via RClone")
             RCTransfer = RcloneTransferHelper(self, up_name)
             async with download_dict_lock:
@@ -600,6 +641,7 @@ class MirrorLeechListener:
     async def onUploadComplete(
         self, link, size, files, folders, mime_type, name, rclonePath="", private=False
     ):
+        self.__invalidate_scans()
         if (
             self.isSuperGroup
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
@@ -930,19 +972,7 @@ class MirrorLeechListener:
         ):
             await DbManger().rm_complete_task(self.message.link)
 
-        async with queue_dict_lock:
-            if self.uid in queued_dl:
-                queued_dl[self.uid].set()
-                del queued_dl[self.uid]
-            if self.uid in queued_up:
-                queued_up[self.uid].set()
-                del queued_up[self.uid]
-            if self.uid in non_queued_dl:
-                non_queued_dl.remove(self.uid)
-            if self.uid in non_queued_up:
-                non_queued_up.remove(self.uid)
-
-        await start_from_queued()
+        await remove_from_queue(self.uid)
         await sleep(3)
         await clean_download(self.dir)
         if self.newDir:
@@ -972,19 +1002,7 @@ class MirrorLeechListener:
         ):
             await DbManger().rm_complete_task(self.message.link)
 
-        async with queue_dict_lock:
-            if self.uid in queued_dl:
-                queued_dl[self.uid].set()
-                del queued_dl[self.uid]
-            if self.uid in queued_up:
-                queued_up[self.uid].set()
-                del queued_up[self.uid]
-            if self.uid in non_queued_dl:
-                non_queued_dl.remove(self.uid)
-            if self.uid in non_queued_up:
-                non_queued_up.remove(self.uid)
-
-        await start_from_queued()
+        await remove_from_queue(self.uid)
         await sleep(3)
         await clean_download(self.dir)
         if self.newDir:
@@ -10,7 +10,6 @@ from bot import (
     non_queued_dl,
     queue_dict_lock,
 )
-from bot.helper.ext_utils.bot_utils import sync_to_async
 from bot.helper.ext_utils.task_manager import is_queued, stop_duplicate_check
 from bot.helper.listeners.direct_listener import DirectListener
 from bot.helper.mirror_utils.status_utils.direct_status import DirectStatus
@@ -33,7 +32,7 @@ async def add_direct_download(details, path, listener, foldername):
         return
 
     gid = token_hex(5)
-    added_to_queue, event = await is_queued(listener.uid)
+    added_to_queue, event = await is_queued(listener)
     if added_to_queue:
         LOGGER.info(f"Added to Queue/Download: {foldername}")
         async with download_dict_lock:
@@ -72,4 +71,4 @@ async def add_direct_download(details, path, listener, foldername):
         await listener.onDownloadStart()
         await sendStatusMessage(listener.message)
 
-    await sync_to_async(directListener.download, contents)
+    await directListener.download(contents)
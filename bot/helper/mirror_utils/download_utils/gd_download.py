@@ -28,7 +28,7 @@ from bot.helper.ext_utils.task_manager import (
 
 async def add_gd_download(link, path, listener, newname, org_link):
     drive = GoogleDriveHelper()
-    name, mime_type, size, _, _ = await sync_to_async(drive.count, link)
+    name, mime_type, size, _, _ = await sync_to_async(drive.count, link, pool="io-long")
     if is_share_link(org_link):
         cget().request(
             "POST",
@@ -51,7 +51,7 @@ async def add_gd_download(link, path, listener, newname, org_link):
     if limit_exceeded := await limit_checker(size, listener, isDriveLink=True):
         await sendMessage(listener.message, limit_exceeded)
         return
-    added_to_queue, event = await is_queued(listener.uid)
+    added_to_queue, event = await is_queued(listener)
     if added_to_queue:
         LOGGER.info(f"Added to Queue/Download: {name}")
         async with download_dict_lock:
@@ -82,4 +82,4 @@ async def add_gd_download(link, path, listener, newname, org_link):
         await listener.onDownloadStart()
         await sendStatusMessage(listener.message)
 
-    await sync_to_async(drive.download, link)
+    await sync_to_async(drive.download, link, pool="io-long")
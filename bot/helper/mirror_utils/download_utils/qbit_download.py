@@ -20,7 +20,7 @@ from bot.helper.telegram_helper.message_utils import (
 from bot.helper.ext_utils.bot_utils import bt_selection_buttons, sync_to_async
 from bot.helper.listeners.qbit_listener import onDownloadStart
 from bot.helper.ext_utils.task_manager import is_queued
-
+from bot.helper.ext_utils.qbit_client import qbit_async
 
 """
 Only v1 torrents
@@ -43,7 +43,7 @@ def __get_hash_file(path):
 
 
 async def add_qb_torrent(link, path, listener, ratio, seed_time):
-    client = await sync_to_async(get_client)
+    client = get_client()
     ADD_TIME = time()
     try:
         url = link
@@ -51,7 +51,7 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
         if await aiopath.exists(link):
             url = None
             tpath = link
-        added_to_queue, event = await is_queued(listener.uid)
+        added_to_queue, event = await is_queued(listener)
         op = await sync_to_async(
             client.torrents_add,
             url,
@@ -64,12 +64,10 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
             headers={"user-agent": "Wget/1.12"},
         )
         if op.lower() == "ok.":
-            tor_info = await sync_to_async(client.torrents_info, tag=f"{listener.uid}")
+            tor_info = await qbit_async.torrents_info(tag=f"{listener.uid}")
             if len(tor_info) == 0:
                 while True:
-                    tor_info = await sync_to_async(
-                        client.torrents_info, tag=f"{listener.uid}"
-                    )
+                    tor_info = await qbit_async.torrents_info(tag=f"{listener.uid}")
                     if len(tor_info) > 0:
                         break
                     elif time() - ADD_TIME >= 120:
@@ -105,9 +103,7 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
                 metamsg = "Downloading Metadata, wait then you can select files. Use torrent file to avoid this wait."
                 meta = await sendMessage(listener.message, metamsg)
                 while True:
-                    tor_info = await sync_to_async(
-                        client.torrents_info, tag=f"{listener.uid}"
-                    )
+                    tor_info = await qbit_async.torrents_info(tag=f"{listener.uid}")
                     if len(tor_info) == 0:
                         await deleteMessage(meta)
                         return
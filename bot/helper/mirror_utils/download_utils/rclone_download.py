@@ -68,7 +68,7 @@ async def add_rclone_download(rc_path, config_path, path, name, listener):
         await sendMessage(listener.message, msg, button)
         return
 
-    added_to_queue, event = await is_queued(listener.uid)
+    added_to_queue, event = await is_queued(listener)
     if added_to_queue:
         LOGGER.info(f"Added to Queue/Download: {name}")
         async with download_dict_lock:
@@ -9,7 +9,7 @@ from bot import download_dict_lock, download_dict, non_queued_dl, queue_dict_loc
 from bot.helper.telegram_helper.message_utils import sendStatusMessage
 from ..status_utils.yt_dlp_download_status import YtDlpDownloadStatus
 from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
-from bot.helper.ext_utils.bot_utils import sync_to_async, async_to_sync
+from bot.helper.ext_utils.bot_utils import sync_to_async, schedule_async
 from bot.helper.ext_utils.task_manager import (
     is_queued,
     stop_duplicate_check,
@@ -140,7 +140,7 @@ class YoutubeDLHelper:
 
     def __onDownloadError(self, error):
         self.__is_cancelled = True
-        async_to_sync(self.__listener.onDownloadError, error)
+        schedule_async(self.__listener.onDownloadError, error)
 
     def extractMetaData(self, link, name):
         if link.startswith(("rtmp", "mms", "rstp", "rtmps")):
@@ -200,7 +200,7 @@ class YoutubeDLHelper:
                 return
             if self.__is_cancelled:
                 raise ValueError
-            async_to_sync(self.__listener.onDownloadComplete)
+            schedule_async(self.__listener.onDownloadComplete)
         except ValueError:
             self.__onDownloadError("Download Stopped by User!")
 
@@ -245,7 +245,7 @@ class YoutubeDLHelper:
         if options:
             self.__set_options(options)
 
-        await sync_to_async(self.extractMetaData, link, name)
+        await sync_to_async(self.extractMetaData, link, name, pool="io-long")
         if self.__is_cancelled:
             return
 
@@ -326,7 +326,7 @@ class YoutubeDLHelper:
         ):
             await self.__listener.onDownloadError(limit_exceeded)
             return
-        added_to_queue, event = await is_queued(self.__listener.uid)
+        added_to_queue, event = await is_queued(self.__listener)
         if added_to_queue:
             LOGGER.info(f"Added to Queue/Download: {self.name}")
             async with download_dict_lock:
@@ -345,7 +345,7 @@ class YoutubeDLHelper:
         async with queue_dict_lock:
             non_queued_dl.add(self.__listener.uid)
 
-        await sync_to_async(self.__download, link, path)
+        await sync_to_async(self.__download, link, path, pool="io-long")
 
     async def cancel_download(self):
         self.__is_cancelled = True
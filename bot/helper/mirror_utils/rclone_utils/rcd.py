@@ -0,0 +1,254 @@
+from asyncio import Lock, create_subprocess_exec, create_task, sleep
+from asyncio.subprocess import DEVNULL
+from configparser import ConfigParser
+from os import path as ospath
+from secrets import token_hex
+from socket import socket
+from time import monotonic
+
+from aiofiles import open as aiopen
+from aiohttp import BasicAuth, ClientError, ClientSession, ClientTimeout
+
+from bot import config_dict, LOGGER
+
+RCD_START_TIMEOUT = 15
+RCD_JOB_EXPIRE = "10m"
+RCD_IDLE_TIMEOUT = 900
+RCD_REAP_INTERVAL = 60
+# running jobs poll every second, so a retired daemon idle this long has none left
+RCD_RETIRE_GRACE = 10
+
+# cli flags of __getUpdatedCommand and the per remote type extras, as rc options
+RC_CONFIG_BOOLS = {"--fast-list": "UseListR", "-M": "Metadata"}
+RC_CONFIG_VALUES = {
+    "--low-level-retries": ("LowLevelRetries", int),
+    "--transfers": ("Transfers", int),
+    "--retries-sleep": ("RetriesInterval", str),
+}
+RC_FILTER_BOOLS = {"--ignore-case": "IgnoreCase"}
+RC_FILTER_LISTS = {"--exclude": "ExcludeRule"}
+RC_DRIVE_BOOLS = {"--drive-acknowledge-abuse": "acknowledge_abuse"}
+RC_DRIVE_VALUES = {
+    "--drive-chunk-size": "chunk_size",
+    "--drive-upload-cutoff": "upload_cutoff",
+}
+# daemon keeps its own log, only the cli runs need these
+RC_IGNORED = {"-P": 0, "--log-file": 1, "--log-level": 1}
+
+
+class RcloneRcError(Exception):
+    pass
+
+
+def is_local(fs):
+    return fs.startswith("/") or ":" not in fs
+
+
+def split_fs(path):
+    """remote:dir/file ==> (remote:dir, file)"""
+    if is_local(path):
+        return ospath.dirname(path.rstrip("/")), ospath.basename(path.rstrip("/"))
+    remote, rpath = path.split(":", 1)
+    parent, _, name = rpath.strip("/").rpartition("/")
+    return f"{remote}:{parent}", name
+
+
+async def drive_remotes(config_path):
+    config = ConfigParser()
+    async with aiopen(config_path, "r") as f:
+        config.read_string(await f.read())
+    return {
+        section
+        for section in config.sections()
+        if config.get(section, "type", fallback="") == "drive"
+    }
+
+
+async def rc_job_from_cmd(cmd):
+    """
+    Translates an rclone copy/move command to rc sync parameters, None when
+    it carries flags (usually user RCLONE_FLAGS) the rc api can't apply per job.
+    """
+    if len(cmd) < 2 or cmd[1] not in ["copy", "move"]:
+        return None
+    job = {
+        "method": cmd[1],
+        "config": "rclone.conf",
+        "fs": [],
+        "_config": {},
+        "_filter": {},
+        "drive": {},
+    }
+    args = iter(cmd[2:])
+    for arg in args:
+        if arg == "--config":
+            job["config"] = next(args)
+        elif arg in RC_IGNORED:
+            for _ in range(RC_IGNORED[arg]):
+                next(args)
+        elif arg in RC_CONFIG_BOOLS:
+            job["_config"][RC_CONFIG_BOOLS[arg]] = True
+        elif arg in RC_CONFIG_VALUES:
+            key, cast = RC_CONFIG_VALUES[arg]
+            job["_config"][key] = cast(next(args))
+        elif arg in RC_FILTER_BOOLS:
+            job["_filter"][RC_FILTER_BOOLS[arg]] = True
+        elif arg in RC_FILTER_LISTS:
+            job["_filter"].setdefault(RC_FILTER_LISTS[arg], []).append(next(args))
+        elif arg in RC_DRIVE_BOOLS:
+            job["drive"][RC_DRIVE_BOOLS[arg]] = "true"
+        elif arg in RC_DRIVE_VALUES:
+            job["drive"][RC_DRIVE_VALUES[arg]] = next(args)
+        elif arg.startswith("-"):
+            return None
+        else:
+            job["fs"].append(arg)
+    if len(job["fs"]) != 2:
+        return None
+    if bwlimit := config_dict["RCLONE_RCD_BWLIMIT"]:
+        job["_config"]["BwLimitFile"] = bwlimit
+    if job["drive"]:
+        # drive backend flags become overrides of the drive remotes only
+        drives = await drive_remotes(job["config"])
+        overrides = "".join(f",{k}={v}" for k, v in job["drive"].items())
+        for i, fs in enumerate(job["fs"]):
+            if not is_local(fs) and (remote := fs.split(":", 1))[0] in drives:
+                job["fs"][i] = f"{remote[0]}{overrides}:{remote[1]}"
+    return job
+
+
+class RcloneDaemon:
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.__proc = None
+        self.__session = None
+        self.__url = None
+        self.__lock = Lock()
+        self.__last_used = monotonic()
+
+    @staticmethod
+    def __free_port():
+        with socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    async def __start(self):
+        port = self.__free_port()
+        user, password = token_hex(8), token_hex(16)
+        self.__proc = await create_subprocess_exec(
+            "rclone",
+            "rcd",
+            "--config",
+            self.config_path,
+            "--rc-addr",
+            f"127.0.0.1:{port}",
+            "--rc-user",
+            user,
+            "--rc-pass",
+            password,
+            "--rc-job-expire-duration",
+            RCD_JOB_EXPIRE,
+            "--log-file",
+            "rlog.txt",
+            "--log-level",
+            "NOTICE",
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+        )
+        self.__url = f"http://127.0.0.1:{port}"
+        self.__session = ClientSession(
+            auth=BasicAuth(user, password), timeout=ClientTimeout(total=60)
+        )
+        for _ in range(RCD_START_TIMEOUT * 10):
+            if self.__proc.returncode is not None:
+                break
+            try:
+                await self.call("rc/noop")
+                LOGGER.info(f"Rclone rcd started for {self.config_path} on {port}")
+                return
+            except ClientError:
+                await sleep(0.1)
+        await self.stop()
+        raise RcloneRcError(f"rclone rcd didn't start for {self.config_path}")
+
+    def idle(self):
+        return monotonic() - self.__last_used
+
+    async def ensure(self):
+        self.__last_used = monotonic()
+        async with self.__lock:
+            if self.__proc is None or self.__proc.returncode is not None:
+                await self.stop()
+                await self.__start()
+
+    async def call(self, method, **params):
+        self.__last_used = monotonic()
+        async with self.__session.post(f"{self.__url}/{method}", json=params) as resp:
+            data = await resp.json(content_type=None)
+        if resp.status != 200:
+            raise RcloneRcError(data.get("error", resp.reason))
+        return data
+
+    async def stop(self):
+        if self.__proc is not None and self.__proc.returncode is None:
+            self.__proc.kill()
+            await self.__proc.wait()
+        self.__proc = None
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+
+class RcdPool:
+    """
+    One lazily started rclone rcd per config file, shared by every task.
+    Daemons idle for RCD_IDLE_TIMEOUT are stopped, and the daemon of a config
+    that got deleted or replaced is retired once its running jobs are done.
+    """
+
+    def __init__(self):
+        self.__daemons = {}
+        self.__retired = []
+        self.__reaper = None
+
+    async def get(self, config_path):
+        config_path = ospath.abspath(config_path)
+        if (daemon := self.__daemons.get(config_path)) is None:
+            daemon = self.__daemons[config_path] = RcloneDaemon(config_path)
+        if self.__reaper is None or self.__reaper.done():
+            self.__reaper = create_task(self.__reap())
+        await daemon.ensure()
+        return daemon
+
+    async def __reap(self):
+        while self.__daemons or self.__retired:
+            await sleep(RCD_REAP_INTERVAL)
+            for config_path, daemon in list(self.__daemons.items()):
+                if daemon.idle() >= RCD_IDLE_TIMEOUT:
+                    del self.__daemons[config_path]
+                    LOGGER.info(f"Stopping idle rclone rcd of {config_path}")
+                    await daemon.stop()
+            for daemon in list(self.__retired):
+                if daemon.idle() >= RCD_RETIRE_GRACE:
+                    self.__retired.remove(daemon)
+                    await daemon.stop()
+
+    def release(self, path):
+        """Retires the daemons of a config file, or of every config under a dir"""
+        path = ospath.abspath(path)
+        for config_path in list(self.__daemons):
+            if config_path == path or config_path.startswith(f"{path}/"):
+                self.__retired.append(self.__daemons.pop(config_path))
+
+    async def stop(self):
+        if self.__reaper is not None:
+            self.__reaper.cancel()
+            self.__reaper = None
+        daemons = [*self.__daemons.values(), *self.__retired]
+        self.__daemons.clear()
+        self.__retired.clear()
+        for daemon in daemons:
+            await daemon.stop()
+
+
+rcd_pool = RcdPool()
@@ -1,17 +1,31 @@
-from asyncio import create_subprocess_exec, gather
+from asyncio import create_subprocess_exec, gather, sleep
 from asyncio.subprocess import PIPE
 from re import findall as re_findall
 from json import loads
-from aiofiles.os import path as aiopath, mkdir, listdir
+from aiofiles.os import path as aiopath, mkdir
 from aiofiles import open as aiopen
+from aiohttp import ClientError
 from configparser import ConfigParser
-from random import randrange
 from logging import getLogger
 
 from bot import config_dict, GLOBAL_EXTENSION_FILTER
-from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async
+from bot.helper.ext_utils.bot_utils import (
+    cmd_exec,
+    get_readable_file_size,
+    get_readable_time,
+    sync_to_async,
+    text_to_bytes,
+    time_to_seconds,
+)
 from bot.helper.ext_utils.fs_utils import get_mime_type, count_files_and_folders
-
+from bot.helper.ext_utils.sa_pool import sa_pool
+from bot.helper.mirror_utils.rclone_utils.rcd import (
+    RcloneRcError,
+    is_local,
+    rc_job_from_cmd,
+    rcd_pool,
+    split_fs,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -20,6 +34,8 @@ class RcloneTransferHelper:
     def __init__(self, listener=None, name=""):
         self.__listener = listener
         self.__proc = None
+        self.__rc_job = None
+        self.__rc_stats = None
         self.__transferred_size = "0 B"
         self.__eta = "-"
         self.__percentage = "0%"
@@ -29,7 +45,7 @@ class RcloneTransferHelper:
         self.__is_download = False
         self.__is_upload = False
         self.__sa_count = 1
-        self.__sa_index = 0
+        self.__sa_name = None
         self.__sa_number = 0
         self.name = name
 
@@ -53,6 +69,30 @@ class RcloneTransferHelper:
     def size(self):
         return self.__size
 
+    @property
+    def transferred_bytes(self):
+        if self.__rc_stats is not None:
+            return self.__rc_stats["bytes"]
+        return text_to_bytes(self.__transferred_size)
+
+    @property
+    def size_bytes(self):
+        if self.__rc_stats is not None:
+            return self.__rc_stats["totalBytes"]
+        return text_to_bytes(self.__size)
+
+    @property
+    def speed_bytes(self):
+        if self.__rc_stats is not None:
+            return self.__rc_stats["speed"]
+        return text_to_bytes(self.__speed)
+
+    @property
+    def eta_seconds(self):
+        if self.__rc_stats is not None:
+            return self.__rc_stats.get("eta")
+        return time_to_seconds(self.__eta) if self.__eta != "-" else None
+
     async def __progress(self):
         while not (self.__proc is None or self.__is_cancelled):
             try:
@@ -73,13 +113,119 @@ class RcloneTransferHelper:
                     self.__eta,
                 ) = data[0]
 
+    def __update_rc_stats(self, stats):
+        stats.setdefault("totalBytes", 0)
+        self.__rc_stats = stats
+        self.__transferred_size = get_readable_file_size(stats["bytes"])
+        self.__size = get_readable_file_size(stats["totalBytes"])
+        self.__speed = f"{get_readable_file_size(stats['speed'])}/s"
+        self.__eta = get_readable_time(stats["eta"]) if stats.get("eta") else "-"
+        self.__percentage = (
+            f"{stats['bytes'] / stats['totalBytes'] * 100:.0f}%"
+            if stats["totalBytes"]
+            else "0%"
+        )
+
+    @staticmethod
+    async def __rc_is_file(daemon, fs):
+        if is_local(fs):
+            return await aiopath.isfile(fs)
+        remote, rpath = fs.split(":", 1)
+        if not (rpath := rpath.strip("/")):
+            return False
+        res = await daemon.call("operations/stat", fs=f"{remote}:", remote=rpath)
+        return res["item"] is not None and not res["item"]["IsDir"]
+
+    async def __rc_execute(self, job):
+        try:
+            daemon = await rcd_pool.get(job["config"])
+            src, dst = job["fs"]
+            params = {"_async": True, "_config": job["_config"]}
+            if await self.__rc_is_file(daemon, src):
+                src_fs, name = split_fs(src)
+                method = f"operations/{job['method']}file"
+                params.update(srcFs=src_fs, srcRemote=name, dstFs=dst, dstRemote=name)
+            else:
+                method = f"sync/{job['method']}"
+                params.update(srcFs=src, dstFs=dst, _filter=job["_filter"])
+            jobid = (await daemon.call(method, **params))["jobid"]
+            self.__rc_job = (daemon, jobid)
+            while True:
+                status, stats = await gather(
+                    daemon.call("job/status", jobid=jobid),
+                    daemon.call("core/stats", group=f"job/{jobid}"),
+                )
+                self.__update_rc_stats(stats)
+                if status["finished"]:
+                    break
+                await sleep(1)
+            await daemon.call("core/stats-delete", group=f"job/{jobid}")
+        except (RcloneRcError, ClientError) as e:
+            return 1, str(e)
+        finally:
+            self.__rc_job = None
+        if self.__is_cancelled:
+            return -9, ""
+        return (0, "") if status["success"] else (1, status["error"])
+
+    async def __execute(self, cmd):
+        """Runs an rclone copy/move ==> (return_code, stderr)"""
+        if config_dict["RCLONE_RCD"] and (job := await rc_job_from_cmd(cmd)):
+            return await self.__rc_execute(job)
+        self.__proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+        _, return_code = await gather(self.__progress(), self.__proc.wait())
+        if return_code in [0, -9] or self.__is_cancelled:
+            return return_code, ""
+        return return_code, (await self.__proc.stderr.read()).decode().strip()
+
+    async def __list_ids(self, config_path, epath):
+        if config_dict["RCLONE_RCD"]:
+            try:
+                daemon = await rcd_pool.get(config_path)
+                res = await daemon.call(
+                    "operations/list",
+                    fs=epath,
+                    remote="",
+                    opt={"noModTime": True, "noMimeType": True},
+                    _config={"UseListR": True},
+                )
+                return res["list"], "", 0
+            except (RcloneRcError, ClientError) as e:
+                return None, str(e), 1
+        cmd = [
+            "rclone",
+            "lsjson",
+            "--fast-list",
+            "--no-mimetype",
+            "--no-modtime",
+            "--config",
+            config_path,
+            epath,
+        ]
+        res, err, code = await cmd_exec(cmd)
+        return (loads(res) if code == 0 else None), err, code
+
+    async def __public_link(self, config_path, destination):
+        if config_dict["RCLONE_RCD"]:
+            fs, name = split_fs(destination)
+            try:
+                daemon = await rcd_pool.get(config_path)
+                res = await daemon.call("operations/publiclink", fs=fs, remote=name)
+                return res["url"], "", 0
+            except (RcloneRcError, ClientError) as e:
+                return "", str(e), 1
+        cmd = ["rclone", "link", "--config", config_path, destination]
+        return await cmd_exec(cmd)
+
+    def __acquire_sa(self, exclude=()):
+        self.__sa_number = sa_pool.count()
+        self.__sa_name = sa_pool.acquire(exclude)
+        return f"sa{sa_pool.index(self.__sa_name):03}"
+
     def __switchServiceAccount(self):
-        if self.__sa_index == self.__sa_number - 1:
-            self.__sa_index = 0
-        else:
-            self.__sa_index += 1
+        sa_pool.report_error(self.__sa_name, True)
         self.__sa_count += 1
-        remote = f"sa{self.__sa_index:03}"
+        remote = self.__acquire_sa({self.__sa_name})
         LOGGER.info(f"Switching to {remote} remote")
         return remote
 
@@ -88,8 +234,6 @@ class RcloneTransferHelper:
         sa_conf_file = f"{sa_conf_dir}/{remote}.conf"
         if not await aiopath.isdir(sa_conf_dir):
             await mkdir(sa_conf_dir)
-        elif await aiopath.isfile(sa_conf_file):
-            return sa_conf_file
 
         if gd_id := remote_opts.get("team_drive"):
             option = "team_drive"
@@ -98,27 +242,34 @@ class RcloneTransferHelper:
         else:
             return "rclone.conf"
 
-        files = await listdir("accounts")
+        # same order as the pool so saNNN maps back to its account
+        files = sa_pool.accounts()
         text = "".join(
             f"[sa{i:03}]\ntype = drive\nscope = drive\nservice_account_file = accounts/{sa}\n{option} = {gd_id}\n\n"
             for i, sa in enumerate(files)
         )
 
+        # confs written by older builds or for another accounts.zip map saNNN
+        # to different accounts, so anything but the expected text is rebuilt
+        if await aiopath.isfile(sa_conf_file):
+            async with aiopen(sa_conf_file, "r") as f:
+                if await f.read() == text:
+                    return sa_conf_file
         async with aiopen(sa_conf_file, "w") as f:
             await f.write(text)
+        rcd_pool.release(sa_conf_file)
         return sa_conf_file
 
     async def __start_download(self, cmd, remote_type):
-        self.__proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-        _, return_code = await gather(self.__progress(), self.__proc.wait())
+        return_code, error = await self.__execute(cmd)
 
         if self.__is_cancelled:
             return
 
         if return_code == 0:
+            sa_pool.report_success(self.__sa_name)
             await self.__listener.onDownloadComplete()
         elif return_code != -9:
-            error = (await self.__proc.stderr.read()).decode().strip()
             if (
                 not error
                 and remote_type == "drive"
@@ -164,10 +315,7 @@ class RcloneTransferHelper:
         ):
             config_path = await self.__create_rc_sa(remote, remote_opts)
             if config_path != "rclone.conf":
-                sa_files = await listdir("accounts")
-                self.__sa_number = len(sa_files)
-                self.__sa_index = randrange(self.__sa_number)
-                remote = f"sa{self.__sa_index:03}"
+                remote = self.__acquire_sa()
                 LOGGER.info(f"Download with service account {remote}")
 
         rcflags = self.__listener.rcFlags or config_dict["RCLONE_FLAGS"]
@@ -198,20 +346,9 @@ class RcloneTransferHelper:
             epath = f"{remote}:{rc_path}{self.name}"
             destination = epath
 
-        cmd = [
-            "rclone",
-            "lsjson",
-            "--fast-list",
-            "--no-mimetype",
-            "--no-modtime",
-            "--config",
-            config_path,
-            epath,
-        ]
-        res, err, code = await cmd_exec(cmd)
+        result, err, code = await self.__list_ids(config_path, epath)
 
         if code == 0:
-            result = loads(res)
             fid = next((r["ID"] for r in result if r["Path"] == self.name), "err")
             link = (
                 f"https://drive.google.com/drive/folders/{fid}"
@@ -226,8 +363,7 @@ class RcloneTransferHelper:
         return link, destination
 
     async def __start_upload(self, cmd, remote_type):
-        self.__proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-        _, return_code = await gather(self.__progress(), self.__proc.wait())
+        return_code, error = await self.__execute(cmd)
 
         if self.__is_cancelled:
             return False
@@ -235,7 +371,6 @@ class RcloneTransferHelper:
         if return_code == -9:
             return False
         elif return_code != 0:
-            error = (await self.__proc.stderr.read()).decode().strip()
             if (
                 not error
                 and remote_type == "drive"
@@ -309,10 +444,7 @@ class RcloneTransferHelper:
         ):
             fconfig_path = await self.__create_rc_sa(oremote, remote_opts)
             if fconfig_path != "rclone.conf":
-                sa_files = await listdir("accounts")
-                self.__sa_number = len(sa_files)
-                self.__sa_index = randrange(self.__sa_number)
-                fremote = f"sa{self.__sa_index:03}"
+                fremote = self.__acquire_sa()
                 LOGGER.info(f"Upload with service account {fremote}")
 
         rcflags = self.__listener.rcFlags or config_dict["RCLONE_FLAGS"]
@@ -334,6 +466,8 @@ class RcloneTransferHelper:
         result = await self.__start_upload(cmd, remote_type)
         if not result:
             return
+        sa_pool.record(self.__sa_name, size)
+        sa_pool.report_success(self.__sa_name)
 
         if remote_type == "drive":
             link, destination = await self.__get_gdrive_link(
@@ -347,8 +481,7 @@ class RcloneTransferHelper:
             else:
                 destination = f"{oremote}:{self.name}"
 
-            cmd = ["rclone", "link", "--config", oconfig_path, destination]
-            res, err, code = await cmd_exec(cmd)
+            res, err, code = await self.__public_link(oconfig_path, destination)
 
             if code == 0:
                 link = res
@@ -394,8 +527,7 @@ class RcloneTransferHelper:
             elif src_remote_type == "drive":
                 cmd.extend(("--tpslimit", "3", "--transfers", "3"))
 
-        self.__proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-        _, return_code = await gather(self.__progress(), self.__proc.wait())
+        return_code, error = await self.__execute(cmd)
 
         if self.__is_cancelled:
             return None, None
@@ -403,7 +535,6 @@ class RcloneTransferHelper:
         if return_code == -9:
             return None, None
         elif return_code != 0:
-            error = (await self.__proc.stderr.read()).decode().strip()
             LOGGER.error(error)
             await self.__listener.onUploadError(error[:4000])
             return None, None
@@ -417,8 +548,7 @@ class RcloneTransferHelper:
                 if mime_type != "Folder":
                     destination += f"/{self.name}" if dst_path else self.name
 
-                cmd = ["rclone", "link", "--config", config_path, destination]
-                res, err, code = await cmd_exec(cmd)
+                res, err, code = await self.__public_link(config_path, destination)
 
                 if self.__is_cancelled:
                     return None, None
@@ -481,6 +611,12 @@ class RcloneTransferHelper:
                 self.__proc.kill()
             except Exception:
                 pass
+        if self.__rc_job is not None:
+            daemon, jobid = self.__rc_job
+            try:
+                await daemon.call("job/stop", jobid=jobid)
+            except (RcloneRcError, ClientError):
+                pass
         if self.__is_download:
             LOGGER.info(f"Cancelling Download: {self.name}")
             await self.__listener.onDownloadError("Download stopped by user!")
@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
+from datetime import timedelta
 from time import time
 
 from bot import aria2, LOGGER
 from bot.helper.ext_utils.bot_utils import (
     EngineStatus,
     MirrorStatus,
+    get_readable_file_size,
     get_readable_time,
     sync_to_async,
 )
+from bot.helper.mirror_utils.status_utils.status_snapshot import status_snapshot
 
 
 def get_download(gid):
@@ -19,6 +22,7 @@ def get_download(gid):
 
 
 class Aria2Status:
+    live_status = True
 
     def __init__(self, gid, listener, seeding=False, queued=False):
         self.__gid = gid
@@ -30,32 +34,50 @@ class Aria2Status:
         self.seeding = seeding
         self.message = self.__listener.message
 
-    def __update(self):
-        if self.__download is None:
+    def __update(self, force=False):
+        if download := status_snapshot.aria2_download(self.__gid, force):
+            self.__download = download
+        elif self.__download is None:
             self.__download = get_download(self.__gid)
         else:
             self.__download = self.__download.live
         if self.__download.followed_by_ids:
             self.__gid = self.__download.followed_by_ids[0]
-            self.__download = get_download(self.__gid)
+            self.__download = status_snapshot.aria2_download(
+                self.__gid
+            ) or get_download(self.__gid)
 
     def progress(self):
         return self.__download.progress_string()
 
+    def processed_bytes_raw(self):
+        return self.__download.completed_length
+
     def processed_bytes(self):
-        return self.__download.completed_length_string()
+        return get_readable_file_size(self.processed_bytes_raw())
+
+    def speed_bytes(self):
+        return self.__download.download_speed
 
     def speed(self):
-        return self.__download.download_speed_string()
+        return f"{get_readable_file_size(self.speed_bytes())}/s"
 
     def name(self):
         return self.__download.name
 
+    def size_raw(self):
+        return self.__download.total_length
+
     def size(self):
-        return self.__download.total_length_string()
+        return get_readable_file_size(self.size_raw())
+
+    def eta_seconds(self):
+        eta = self.__download.eta
+        return None if eta == timedelta.max else eta.total_seconds()
 
     def eta(self):
-        return self.__download.eta_string()
+        seconds = self.eta_seconds()
+        return "-" if seconds is None else get_readable_time(seconds)
 
     def listener(self):
         return self.__listener
@@ -83,9 +105,12 @@ class Aria2Status:
     def uploaded_bytes(self):
         return self.__download.upload_length_string()
 
-    def upload_speed(self):
+    def upload_speed_bytes(self):
         self.__update()
-        return self.__download.upload_speed_string()
+        return self.__download.upload_speed
+
+    def upload_speed(self):
+        return f"{get_readable_file_size(self.upload_speed_bytes())}/s"
 
     def ratio(self):
         return f"{round(self.__download.upload_length / self.__download.completed_length, 3)}"
@@ -102,7 +127,7 @@ class Aria2Status:
 
     async def cancel_download(self):
         self.__update()
-        await sync_to_async(self.__update)
+        await sync_to_async(self.__update, True)
         if self.__download.seeder and self.seeding:
             LOGGER.info(f"Cancelling Seed: {self.name()}")
             await self.__listener.onUploadError(
@@ -14,8 +14,14 @@ class DDLStatus:
         self.upload_details = upload_details
         self.message = message
 
+    def processed_bytes_raw(self):
+        return self.__obj.processed_bytes
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.processed_bytes)
+        return get_readable_file_size(self.processed_bytes_raw())
+
+    def size_raw(self):
+        return self.__size
 
     def size(self):
         return get_readable_file_size(self.__size)
@@ -33,15 +39,21 @@ class DDLStatus:
             progress_raw = 0
         return f"{round(progress_raw, 2)}%"
 
+    def speed_bytes(self):
+        return self.__obj.speed
+
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_bytes())}/s"
 
-    def eta(self):
+    def eta_seconds(self):
         try:
-            seconds = (self.__size - self.__obj.processed_bytes) / self.__obj.speed
-            return get_readable_time(seconds)
+            return (self.__size - self.__obj.processed_bytes) / self.__obj.speed
         except Exception:
-            return "-"
+            return None
+
+    def eta(self):
+        seconds = self.eta_seconds()
+        return "-" if seconds is None else get_readable_time(seconds)
 
     def gid(self) -> str:
         return self.__gid
@@ -16,8 +16,14 @@ class GdriveStatus:
         self.upload_details = upload_details
         self.message = message
 
+    def processed_bytes_raw(self):
+        return self.__obj.processed_bytes
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.processed_bytes)
+        return get_readable_file_size(self.processed_bytes_raw())
+
+    def size_raw(self):
+        return self.__size
 
     def size(self):
         return get_readable_file_size(self.__size)
@@ -45,15 +51,21 @@ class GdriveStatus:
     def progress(self):
         return f"{round(self.progress_raw(), 2)}%"
 
+    def speed_bytes(self):
+        return self.__obj.speed
+
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_bytes())}/s"
 
-    def eta(self):
+    def eta_seconds(self):
         try:
-            seconds = (self.__size - self.__obj.processed_bytes) / self.__obj.speed
-            return get_readable_time(seconds)
+            return (self.__size - self.__obj.processed_bytes) / self.__obj.speed
         except Exception:
-            return "-"
+            return None
+
+    def eta(self):
+        seconds = self.eta_seconds()
+        return "-" if seconds is None else get_readable_time(seconds)
 
     def download(self):
         return self.__obj
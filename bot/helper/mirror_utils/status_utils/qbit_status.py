@@ -9,6 +9,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
     sync_to_async,
 )
+from bot.helper.mirror_utils.status_utils.status_snapshot import status_snapshot
 
 
 def get_download(client, tag):
@@ -20,6 +21,7 @@ def get_download(client, tag):
 
 
 class QbittorrentStatus:
+    live_status = True
 
     def __init__(self, listener, seeding=False, queued=False):
         self.__client = get_client()
@@ -30,19 +32,27 @@ class QbittorrentStatus:
         self.seeding = seeding
         self.message = listener.message
 
-    def __update(self):
-        new_info = get_download(self.__client, f"{self.__listener.uid}")
+    def __update(self, force=False):
+        new_info = status_snapshot.torrent(f"{self.__listener.uid}", force)
+        if new_info is None:
+            new_info = get_download(self.__client, f"{self.__listener.uid}")
         if new_info is not None:
             self.__info = new_info
 
     def progress(self):
         return f"{round(self.__info.progress*100, 2)}%"
 
+    def processed_bytes_raw(self):
+        return self.__info.downloaded
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__info.downloaded)
+        return get_readable_file_size(self.processed_bytes_raw())
+
+    def speed_bytes(self):
+        return self.__info.dlspeed
 
     def speed(self):
-        return f"{get_readable_file_size(self.__info.dlspeed)}/s"
+        return f"{get_readable_file_size(self.speed_bytes())}/s"
 
     def name(self):
         if self.__info.state in ["metaDL", "checkingResumeData"]:
@@ -50,11 +60,17 @@ class QbittorrentStatus:
         else:
             return self.__info.name
 
+    def size_raw(self):
+        return self.__info.size
+
     def size(self):
-        return get_readable_file_size(self.__info.size)
+        return get_readable_file_size(self.size_raw())
+
+    def eta_seconds(self):
+        return self.__info.eta
 
     def eta(self):
-        return get_readable_time(self.__info.eta)
+        return get_readable_time(self.eta_seconds())
 
     def status(self):
         self.__update()
@@ -81,8 +97,11 @@ class QbittorrentStatus:
     def uploaded_bytes(self):
         return get_readable_file_size(self.__info.uploaded)
 
+    def upload_speed_bytes(self):
+        return self.__info.upspeed
+
     def upload_speed(self):
-        return f"{get_readable_file_size(self.__info.upspeed)}/s"
+        return f"{get_readable_file_size(self.upload_speed_bytes())}/s"
 
     def ratio(self):
         return f"{round(self.__info.ratio, 3)}"
@@ -107,7 +126,7 @@ class QbittorrentStatus:
         return self.__listener
 
     async def cancel_download(self):
-        self.__update()
+        self.__update(True)
         await sync_to_async(
             self.__client.torrents_pause, torrent_hashes=self.__info.hash
         )
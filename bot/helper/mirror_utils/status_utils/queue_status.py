@@ -23,23 +23,37 @@ class QueueStatus:
     def name(self):
         return self.__name
 
+    def size_raw(self):
+        return self.__size
+
     def size(self):
         return get_readable_file_size(self.__size)
 
     def status(self):
         if self.__status == "dl":
             return MirrorStatus.STATUS_QUEUEDL
+        elif self.__status == "cpu":
+            return MirrorStatus.STATUS_QUEUECPU
         return MirrorStatus.STATUS_QUEUEUP
 
+    def processed_bytes_raw(self):
+        return 0
+
     def processed_bytes(self):
         return 0
 
     def progress(self):
         return "0%"
 
+    def speed_bytes(self):
+        return 0
+
     def speed(self):
         return "0B/s"
 
+    def eta_seconds(self):
+        return None
+
     def eta(self):
         return "-"
 
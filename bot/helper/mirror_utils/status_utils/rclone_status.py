@@ -1,4 +1,9 @@
-from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus
+from bot.helper.ext_utils.bot_utils import (
+    EngineStatus,
+    MirrorStatus,
+    get_readable_file_size,
+    get_readable_time,
+)
 
 
 class RcloneStatus:
@@ -15,17 +20,27 @@ class RcloneStatus:
     def progress(self):
         return self.__obj.percentage
 
+    def speed_bytes(self):
+        return self.__obj.speed_bytes
+
     def speed(self):
-        return self.__obj.speed
+        return f"{get_readable_file_size(self.speed_bytes())}/s"
 
     def name(self):
         return self.__obj.name
 
+    def size_raw(self):
+        return self.__obj.size_bytes
+
     def size(self):
-        return self.__obj.size
+        return get_readable_file_size(self.size_raw())
+
+    def eta_seconds(self):
+        return self.__obj.eta_seconds
 
     def eta(self):
-        return self.__obj.eta
+        seconds = self.eta_seconds()
+        return "-" if seconds is None else get_readable_time(seconds)
 
     def status(self):
         if self.__status == "dl":
@@ -35,8 +50,11 @@ class RcloneStatus:
         else:
             return MirrorStatus.STATUS_CLONING
 
+    def processed_bytes_raw(self):
+        return self.__obj.transferred_bytes
+
     def processed_bytes(self):
-        return self.__obj.transferred_size
+        return get_readable_file_size(self.processed_bytes_raw())
 
     def download(self):
         return self.__obj
@@ -22,21 +22,33 @@ class SplitStatus:
     def progress(self):
         return "0"
 
+    def speed_bytes(self):
+        return 0
+
     def speed(self):
         return "0"
 
     def name(self):
         return self.__name
 
+    def size_raw(self):
+        return self.__size
+
     def size(self):
         return get_readable_file_size(self.__size)
 
+    def eta_seconds(self):
+        return None
+
     def eta(self):
         return "0s"
 
     def status(self):
         return MirrorStatus.STATUS_SPLITTING
 
+    def processed_bytes_raw(self):
+        return 0
+
     def processed_bytes(self):
         return 0
 
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+from threading import Lock
+from time import time
+
+from aria2p import Download
+
+from bot import LOGGER, aria2, get_client
+
+
+class StatusSnapshot:
+    """
+    One torrents_info() and one aria2 tellActive/tellWaiting per tick, indexed
+    by tag/gid, so every status object of the same engine reads from memory.
+    """
+
+    def __init__(self, ttl=1):
+        self.__ttl = ttl
+        self.__qb_lock = Lock()
+        self.__aria_lock = Lock()
+        self.__qb_time = 0
+        self.__aria_time = 0
+        self.__torrents = {}
+        self.__downloads = {}
+
+    def __refresh_qbit(self):
+        try:
+            torrents = {}
+            for tor in get_client().torrents_info():
+                for tag in tor.tags.split(","):
+                    if tag := tag.strip():
+                        torrents[tag] = tor
+            self.__torrents = torrents
+        except Exception as e:
+            LOGGER.error(f"{e}: Qbittorrent, while refreshing status snapshot")
+            self.__torrents = {}
+        self.__qb_time = time()
+
+    def __refresh_aria2(self):
+        try:
+            structs = aria2.client.tell_active()
+            structs.extend(aria2.client.tell_waiting(0, 1000))
+            self.__downloads = {
+                struct["gid"]: Download(aria2, struct) for struct in structs
+            }
+        except Exception as e:
+            LOGGER.error(f"{e}: Aria2c, while refreshing status snapshot")
+            self.__downloads = {}
+        self.__aria_time = time()
+
+    def torrent(self, tag, force=False):
+        with self.__qb_lock:
+            if force or time() - self.__qb_time >= self.__ttl:
+                self.__refresh_qbit()
+            return self.__torrents.get(tag)
+
+    def aria2_download(self, gid, force=False):
+        with self.__aria_lock:
+            if force or time() - self.__aria_time >= self.__ttl:
+                self.__refresh_aria2()
+            return self.__downloads.get(gid)
+
+    def invalidate(self):
+        self.__qb_time = 0
+        self.__aria_time = 0
+
+
+status_snapshot = StatusSnapshot()
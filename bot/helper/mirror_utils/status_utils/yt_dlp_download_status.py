@@ -21,16 +21,19 @@ class YtDlpDownloadStatus:
         return self.__gid
 
     def processed_bytes(self):
-        return get_readable_file_size(self.processed_raw())
+        return get_readable_file_size(self.processed_bytes_raw())
 
-    def processed_raw(self):
+    def processed_bytes_raw(self):
         if self.__obj.downloaded_bytes != 0:
             return self.__obj.downloaded_bytes
         else:
             return async_to_sync(get_path_size, self.__listener.dir)
 
+    def size_raw(self):
+        return self.__obj.size
+
     def size(self):
-        return get_readable_file_size(self.__obj.size)
+        return get_readable_file_size(self.size_raw())
 
     def status(self):
         return MirrorStatus.STATUS_DOWNLOADING
@@ -41,19 +44,25 @@ class YtDlpDownloadStatus:
     def progress(self):
         return f"{round(self.__obj.progress, 2)}%"
 
+    def speed_bytes(self):
+        return self.__obj.download_speed
+
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.download_speed)}/s"
+        return f"{get_readable_file_size(self.speed_bytes())}/s"
 
-    def eta(self):
+    def eta_seconds(self):
         if self.__obj.eta != "-":
-            return get_readable_time(self.__obj.eta)
+            return self.__obj.eta
         try:
-            seconds = (
-                self.__obj.size - self.processed_raw()
+            return (
+                self.__obj.size - self.processed_bytes_raw()
             ) / self.__obj.download_speed
-            return get_readable_time(seconds)
         except Exception:
-            return "-"
+            return None
+
+    def eta(self):
+        seconds = self.eta_seconds()
+        return "-" if seconds is None else get_readable_time(seconds)
 
     def download(self):
         return self.__obj
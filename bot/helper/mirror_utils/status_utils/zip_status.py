@@ -26,12 +26,12 @@ class ZipStatus:
     def gid(self):
         return self.__gid
 
-    def speed_raw(self):
-        return self.processed_raw() / (time() - self.__start_time)
+    def speed_bytes(self):
+        return self.processed_bytes_raw() / (time() - self.__start_time)
 
     def progress_raw(self):
         try:
-            return self.processed_raw() / self.__size * 100
+            return self.processed_bytes_raw() / self.__size * 100
         except Exception:
             return 0
 
@@ -39,32 +39,40 @@ class ZipStatus:
         return f"{round(self.progress_raw(), 2)}%"
 
     def speed(self):
-        return f"{get_readable_file_size(self.speed_raw())}/s"
+        return f"{get_readable_file_size(self.speed_bytes())}/s"
 
     def name(self):
         return self.__name
 
+    def size_raw(self):
+        return self.__size
+
     def size(self):
         return get_readable_file_size(self.__size)
 
-    def eta(self):
+    def eta_seconds(self):
         try:
-            seconds = (self.__size - self.processed_raw()) / self.speed_raw()
-            return get_readable_time(seconds)
+            return (self.__size - self.processed_bytes_raw()) / self.speed_bytes()
         except Exception:
-            return "-"
+            return None
+
+    def eta(self):
+        seconds = self.eta_seconds()
+        return "-" if seconds is None else get_readable_time(seconds)
 
     def status(self):
         return MirrorStatus.STATUS_ARCHIVING
 
-    def processed_raw(self):
+    def processed_bytes_raw(self):
+        if self.__listener.arch_bytes is not None:
+            return self.__listener.arch_bytes
         if self.__listener.newDir:
             return async_to_sync(get_path_size, self.__listener.newDir)
         else:
             return async_to_sync(get_path_size, self.__listener.dir) - self.__size
 
     def processed_bytes(self):
-        return get_readable_file_size(self.processed_raw())
+        return get_readable_file_size(self.processed_bytes_raw())
 
     def download(self):
         return self
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 from logging import getLogger, ERROR
 from time import time
+from json import loads as jsonloads
+from threading import Lock, local
+from concurrent.futures import ThreadPoolExecutor
 from pickle import load as pload
 from os import makedirs, path as ospath, listdir, remove as osremove
 from io import FileIO
 from re import search as re_search
 from urllib.parse import parse_qs, urlparse, quote as rquote
-from random import randrange
+from psutil import virtual_memory
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -23,15 +26,84 @@ from bot import OWNER_ID, config_dict, list_drives_dict, GLOBAL_EXTENSION_FILTER
 from bot.helper.ext_utils.bot_utils import (
     setInterval,
     async_to_sync,
+    schedule_async,
     get_readable_file_size,
     fetch_user_tds,
 )
 from bot.helper.ext_utils.fs_utils import get_mime_type
-from bot.helper.ext_utils.leech_utils import format_filename
+from bot.helper.ext_utils.leech_utils import format_filename, get_upload_key
+from bot.helper.ext_utils.sa_pool import sa_pool
+from bot.helper.ext_utils.upload_index import upload_index
 
 LOGGER = getLogger(__name__)
 getLogger("googleapiclient.discovery").setLevel(ERROR)
 
+# Drive wants every chunk but the last in multiples of 256 KiB
+CHUNK_ALIGN = 256 * 1024
+UPLOAD_CHUNK_MIN = 8 * 1024 * 1024
+UPLOAD_CHUNK_MAX = 256 * 1024 * 1024
+UPLOAD_CHUNK_TIME = 10
+# resumable session URIs are valid for a week
+UPLOAD_SESSION_TTL = 6 * 24 * 60 * 60
+
+active_sessions = set()
+sessions_lock = Lock()
+# private HttpRequest state of googleapiclient used to resume a session
+RESUMABLE_ATTRS = ("resumable_uri", "resumable_progress", "_in_error_state")
+
+
+def resume_session(request, uri):
+    """
+    Points a resumable HttpRequest at an existing session, so its first
+    next_chunk() queries the uploaded range. False when the installed
+    googleapiclient lacks the attributes, the upload then starts over.
+    """
+    if not all(hasattr(request, attr) for attr in RESUMABLE_ATTRS):
+        LOGGER.warning("googleapiclient can't resume sessions, uploading again")
+        return False
+    request.resumable_uri = uri
+    request._in_error_state = True
+    return True
+
+
+def reset_session(request):
+    if all(hasattr(request, attr) for attr in RESUMABLE_ATTRS):
+        request.resumable_uri = None
+        request.resumable_progress = 0
+        request._in_error_state = False
+
+
+def querying_session(request):
+    return getattr(request, "_in_error_state", False)
+
+
+class AdaptiveMediaUpload(MediaFileUpload):
+    """
+    Resumable media body whose chunk size follows the measured throughput,
+    capped by the memory left for every parallel upload.
+    """
+
+    def __init__(self, filename, mimetype, workers=1):
+        self.__limit = min(
+            UPLOAD_CHUNK_MAX,
+            max(virtual_memory().available // (4 * workers), UPLOAD_CHUNK_MIN),
+        )
+        self.__limit -= self.__limit % CHUNK_ALIGN
+        self.__chunk = min(4 * UPLOAD_CHUNK_MIN, self.__limit)
+        super().__init__(
+            filename, mimetype=mimetype, resumable=True, chunksize=self.__chunk
+        )
+
+    def chunksize(self):
+        return self.__chunk
+
+    def adapt(self, sent, elapsed):
+        if sent <= 0 or elapsed <= 0:
+            return
+        target = (self.__chunk + sent / elapsed * UPLOAD_CHUNK_TIME) / 2
+        target = min(max(int(target), UPLOAD_CHUNK_MIN), self.__limit)
+        self.__chunk = target - target % CHUNK_ALIGN
+
 
 class GoogleDriveHelper:
 
@@ -61,11 +133,15 @@ class GoogleDriveHelper:
         self.__is_errored = False
         self.__status = None
         self.__updater = None
+        self.__upload_error = None
         self.__update_interval = 3
-        self.__sa_index = 0
+        self.__sa_name = None
         self.__sa_count = 1
         self.__sa_number = 100
         self.__service = self.__authorize()
+        self.__workers = local()
+        self.__worker_lock = Lock()
+        self.__clone_error = None
         self.__file_processed_bytes = 0
         self.__processed_bytes = 0
         self.name = name
@@ -81,17 +157,15 @@ class GoogleDriveHelper:
     def processed_bytes(self):
         return self.__processed_bytes
 
-    def __authorize(self):
+    def __authorize(self, sa_name=None):
         credentials = None
         if config_dict["USE_SERVICE_ACCOUNTS"]:
-            json_files = listdir("accounts")
-            self.__sa_number = len(json_files)
-            self.__sa_index = randrange(self.__sa_number)
-            LOGGER.info(
-                f"Authorizing with {json_files[self.__sa_index]} service account"
-            )
+            self.__sa_number = sa_pool.count()
+            if sa_name is None:
+                sa_name = self.__sa_name = sa_pool.acquire()
+            LOGGER.info(f"Authorizing with {sa_name} service account")
             credentials = service_account.Credentials.from_service_account_file(
-                f"accounts/{json_files[self.__sa_index]}", scopes=self.__OAUTH_SCOPE
+                f"accounts/{sa_name}", scopes=self.__OAUTH_SCOPE
             )
         elif ospath.exists("token.pickle"):
             LOGGER.info("Authorize with token.pickle")
@@ -115,14 +189,12 @@ class GoogleDriveHelper:
                 LOGGER.error("token.pickle not found!")
         return None
 
-    def __switchServiceAccount(self):
-        if self.__sa_index == self.__sa_number - 1:
-            self.__sa_index = 0
-        else:
-            self.__sa_index += 1
+    def __switchServiceAccount(self, rate_limited=True):
+        sa_pool.report_error(self.__sa_name, rate_limited)
+        self.__sa_name = sa_pool.acquire(exclude={self.__sa_name})
         self.__sa_count += 1
-        LOGGER.info(f"Switching to {self.__sa_index} index")
-        self.__service = self.__authorize()
+        LOGGER.info(f"Switching to {self.__sa_name} service account")
+        self.__service = self.__authorize(self.__sa_name)
 
     @staticmethod
     def getIdFromUrl(link):
@@ -157,7 +229,7 @@ class GoogleDriveHelper:
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(Exception),
     )
-    def __set_permission(self, file_id):
+    def __set_permission(self, file_id, service=None):
         permissions = {
             "role": "reader",
             "type": "anyone",
@@ -165,7 +237,8 @@ class GoogleDriveHelper:
             "withLink": True,
         }
         return (
-            self.__service.permissions()
+            (service or self.__service)
+            .permissions()
             .create(fileId=file_id, body=permissions, supportsAllDrives=True)
             .execute()
         )
@@ -302,9 +375,9 @@ class GoogleDriveHelper:
         if not gdrive_id:
             gdrive_id = config_dict["GDRIVE_ID"]
         self.__is_uploading = True
+        self.__start_time = time()
         item_path = f"{self.__path}/{file_name}"
         LOGGER.info(f"Uploading: {item_path}")
-        self.__updater = setInterval(self.__update_interval, self.__progress)
         try:
             if ospath.isfile(item_path):
                 if item_path.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
@@ -337,10 +410,9 @@ class GoogleDriveHelper:
                 LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
                 err = err.last_attempt.exception()
             err = str(err).replace(">", "").replace("<", "")
-            async_to_sync(self.__listener.onUploadError, err)
+            schedule_async(self.__listener.onUploadError, err)
             self.__is_errored = True
         finally:
-            self.__updater.cancel()
             if self.__is_cancelled and not self.__is_errored:
                 if mime_type == "Folder":
                     LOGGER.info("Deleting uploaded data from Drive...")
@@ -349,7 +421,7 @@ class GoogleDriveHelper:
                 return
             elif self.__is_errored:
                 return
-            async_to_sync(
+            schedule_async(
                 self.__listener.onUploadComplete,
                 link,
                 size,
@@ -359,7 +431,7 @@ class GoogleDriveHelper:
                 file_name,
             )
 
-    def __upload_dir(self, input_directory, dest_id):
+    def __scan_dir(self, input_directory, dest_id, files):
         list_dirs = listdir(input_directory)
         if len(list_dirs) == 0:
             return dest_id
@@ -368,13 +440,12 @@ class GoogleDriveHelper:
             current_file_name = ospath.join(input_directory, item)
             if ospath.isdir(current_file_name):
                 current_dir_id = self.__create_directory(item, dest_id)
-                new_id = self.__upload_dir(current_file_name, current_dir_id)
+                new_id = self.__scan_dir(current_file_name, current_dir_id, files)
                 self.__total_folders += 1
             elif not item.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
                 mime_type = get_mime_type(current_file_name)
-                file_name = current_file_name.split("/")[-1]
                 # current_file_name will have the full path
-                self.__upload_file(current_file_name, file_name, mime_type, dest_id)
+                files.append((current_file_name, item, mime_type, dest_id))
                 self.__total_files += 1
                 new_id = dest_id
             else:
@@ -384,6 +455,60 @@ class GoogleDriveHelper:
                 break
         return new_id
 
+    def __upload_dir(self, input_directory, dest_id):
+        files = []
+        new_id = self.__scan_dir(input_directory, dest_id, files)
+        # biggest first so one large file doesn't run alone at the end
+        files.sort(key=lambda file: ospath.getsize(file[0]), reverse=True)
+        with ThreadPoolExecutor(
+            max_workers=max(config_dict["GD_UPLOAD_WORKERS"], 1),
+            thread_name_prefix="gdupload",
+        ) as pool:
+            for file in files:
+                pool.submit(self.__upload_worker, *file)
+        if self.__upload_error is not None:
+            raise self.__upload_error
+        return None if self.__is_cancelled else new_id
+
+    def __init_worker(self):
+        if hasattr(self.__workers, "service"):
+            return self.__workers
+        self.__workers.sa_count = 1
+        self.__workers.sa_name = None
+        if config_dict["USE_SERVICE_ACCOUNTS"]:
+            # the pool spreads workers over the accounts with most quota left
+            self.__workers.sa_name = sa_pool.acquire()
+            self.__workers.service = self.__authorize(self.__workers.sa_name)
+        else:
+            self.__workers.service = self.__authorize()
+        return self.__workers
+
+    def __switch_worker(self, worker, rate_limited=True):
+        sa_pool.report_error(worker.sa_name, rate_limited)
+        worker.sa_name = sa_pool.acquire(exclude={worker.sa_name})
+        worker.sa_count += 1
+        LOGGER.info(f"Switching worker to {worker.sa_name} service account")
+        worker.service = self.__authorize(worker.sa_name)
+
+    def __upload_worker(self, file_path, file_name, mime_type, dest_id):
+        if self.__is_cancelled or self.__upload_error is not None:
+            return
+        try:
+            self.__upload_file(
+                file_path, file_name, mime_type, dest_id, worker=self.__init_worker()
+            )
+        except Exception as err:
+            if isinstance(err, RetryError):
+                err = err.last_attempt.exception()
+            with self.__worker_lock:
+                if self.__upload_error is None:
+                    self.__upload_error = err
+
+    def __add_processed(self, size):
+        with self.__worker_lock:
+            self.__processed_bytes += size
+            self.__total_time = time() - self.__start_time
+
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
@@ -411,12 +536,33 @@ class GoogleDriveHelper:
         LOGGER.info(f'Created G-Drive Folder:\nName: {file.get("name")}\nID: {file_id}')
         return file_id
 
+    @staticmethod
+    def __claim_session(file_path):
+        key = upload_index.fingerprint(file_path)
+        with sessions_lock:
+            if key in active_sessions:
+                return None, None
+            active_sessions.add(key)
+        session = async_to_sync(upload_index.session, key, "gds")
+        if session is not None and time() - session["time"] > UPLOAD_SESSION_TTL:
+            session = None
+        return key, session
+
+    @staticmethod
+    def __release_session(key):
+        with sessions_lock:
+            active_sessions.discard(key)
+
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
         retry=(retry_if_exception_type(Exception)),
     )
-    def __upload_file(self, file_path, file_name, mime_type, dest_id, is_dir=True):
+    def __upload_file(
+        self, file_path, file_name, mime_type, dest_id, is_dir=True, worker=None
+    ):
+        service = worker.service if worker is not None else self.__service
+        sa_name = worker.sa_name if worker is not None else self.__sa_name
         file_name, _ = async_to_sync(
             format_filename, file_name, self.__user_id, isMirror=True
         )
@@ -432,79 +578,194 @@ class GoogleDriveHelper:
         if ospath.getsize(file_path) == 0:
             media_body = MediaFileUpload(file_path, mimetype=mime_type, resumable=False)
             response = (
-                self.__service.files()
+                service.files()
                 .create(
                     body=file_metadata, media_body=media_body, supportsAllDrives=True
                 )
                 .execute()
             )
             if not config_dict["IS_TEAM_DRIVE"]:
-                self.__set_permission(response["id"])
+                self.__set_permission(response["id"], service)
 
             drive_file = (
-                self.__service.files()
+                service.files()
                 .get(fileId=response["id"], supportsAllDrives=True)
                 .execute()
             )
             return self.__G_DRIVE_BASE_DOWNLOAD_URL.format(drive_file.get("id"))
-        media_body = MediaFileUpload(
-            file_path, mimetype=mime_type, resumable=True, chunksize=100 * 1024 * 1024
+        index = (
+            async_to_sync(get_upload_key, file_path)
+            if config_dict["UPLOAD_DEDUPE"]
+            else None
+        )
+        if index is not None and (
+            response := self.__copy_indexed(index, file_path, file_metadata, service)
+        ):
+            return self.__finish_upload(file_path, response, is_dir, service)
+        media_body = AdaptiveMediaUpload(
+            file_path,
+            mime_type,
+            max(config_dict["GD_UPLOAD_WORKERS"], 1) if is_dir else 1,
         )
 
         # Insert a file
-        drive_file = self.__service.files().create(
+        drive_file = service.files().create(
             body=file_metadata, media_body=media_body, supportsAllDrives=True
         )
+        key, session = self.__claim_session(file_path)
+        if session is not None:
+            LOGGER.info(f"Resuming Upload Session: {file_path}")
+            # query the uploaded range first, then continue from there
+            if not resume_session(drive_file, session["uri"]):
+                async_to_sync(upload_index.discard, key, "gds")
+                session = None
         response = None
         retries = 0
-        while response is None and not self.__is_cancelled:
-            try:
-                self.__status, response = drive_file.next_chunk()
-            except HttpError as err:
-                if err.resp.status in [500, 502, 503, 504] and retries < 10:
-                    retries += 1
-                    continue
-                if err.resp.get("content-type", "").startswith("application/json"):
-                    reason = (
-                        eval(err.content).get("error").get("errors")[0].get("reason")
-                    )
-                    if reason not in [
-                        "userRateLimitExceeded",
-                        "dailyLimitExceeded",
-                    ]:
-                        raise err
-                    if config_dict["USE_SERVICE_ACCOUNTS"]:
-                        if self.__sa_count >= self.__sa_number:
-                            LOGGER.info(
-                                f"Reached maximum number of service accounts switching, which is {self.__sa_count}"
-                            )
+        sent = 0
+        switch_sa = False
+        try:
+            while response is None and not self.__is_cancelled:
+                querying = querying_session(drive_file)
+                start_time = time()
+                try:
+                    status, response = drive_file.next_chunk()
+                except HttpError as err:
+                    if session is not None and err.resp.status in [404, 410]:
+                        LOGGER.info(f"Upload Session Expired: {file_path}")
+                        async_to_sync(upload_index.discard, key, "gds")
+                        session = None
+                        reset_session(drive_file)
+                        continue
+                    if err.resp.status in [500, 502, 503, 504] and retries < 10:
+                        retries += 1
+                        continue
+                    if err.resp.get("content-type", "").startswith("application/json"):
+                        reason = (
+                            eval(err.content)
+                            .get("error")
+                            .get("errors")[0]
+                            .get("reason")
+                        )
+                        if reason not in [
+                            "userRateLimitExceeded",
+                            "dailyLimitExceeded",
+                        ]:
                             raise err
-                        else:
-                            if self.__is_cancelled:
-                                return
-                            self.__switchServiceAccount()
-                            LOGGER.info(f"Got: {reason}, Trying Again.")
-                            return self.__upload_file(
-                                file_path, file_name, mime_type, dest_id
+                        if config_dict["USE_SERVICE_ACCOUNTS"]:
+                            sa_count = (
+                                worker.sa_count
+                                if worker is not None
+                                else self.__sa_count
                             )
-                    else:
-                        LOGGER.error(f"Got: {reason}")
-                        raise err
-        if self.__is_cancelled:
-            return
+                            if sa_count >= self.__sa_number:
+                                LOGGER.info(
+                                    f"Reached maximum number of service accounts switching, which is {sa_count}"
+                                )
+                                raise err
+                            else:
+                                if self.__is_cancelled:
+                                    return
+                                LOGGER.info(f"Got: {reason}, Trying Again.")
+                                switch_sa = True
+                                break
+                        else:
+                            LOGGER.error(f"Got: {reason}")
+                            raise err
+                    raise err
+                if (
+                    session is None
+                    and key is not None
+                    and (uri := getattr(drive_file, "resumable_uri", None))
+                ):
+                    session = {
+                        "uri": uri,
+                        "parent": dest_id,
+                        "name": file_name,
+                        "time": time(),
+                    }
+                    async_to_sync(upload_index.record, key, "gds", session)
+                progress = (
+                    status.resumable_progress
+                    if status is not None
+                    else ospath.getsize(file_path)
+                )
+                if not querying:
+                    media_body.adapt(progress - sent, time() - start_time)
+                self.__add_processed(progress - sent)
+                sa_pool.record(sa_name, progress - sent)
+                sent = progress
+        finally:
+            if key is not None:
+                self.__release_session(key)
+        if switch_sa or self.__is_cancelled:
+            if key is not None and session is not None:
+                async_to_sync(upload_index.discard, key, "gds")
+            self.__add_processed(-sent)
+            if self.__is_cancelled:
+                return
+            if worker is not None:
+                self.__switch_worker(worker)
+            else:
+                self.__switchServiceAccount()
+            return self.__upload_file(
+                file_path, file_name, mime_type, dest_id, is_dir, worker
+            )
+        sa_pool.report_success(sa_name)
+        if session is not None:
+            async_to_sync(upload_index.discard, key, "gds")
+            if session["parent"] != dest_id or session["name"] != file_name:
+                # resumed from an earlier task, move it where this one expects
+                response = (
+                    service.files()
+                    .update(
+                        fileId=response["id"],
+                        body={"name": file_name},
+                        addParents=dest_id,
+                        removeParents=session["parent"],
+                        supportsAllDrives=True,
+                    )
+                    .execute()
+                )
+        if index is not None:
+            async_to_sync(
+                upload_index.record, index[0], "gd", {"id": response["id"]}, index[1]
+            )
+        return self.__finish_upload(file_path, response, is_dir, service)
+
+    def __copy_indexed(self, index, file_path, file_metadata, service):
+        key, md5_hash = index
+        if (entry := async_to_sync(upload_index.lookup, key, "gd", md5_hash)) is None:
+            return None
+        body = {k: v for k, v in file_metadata.items() if k != "mimeType"}
+        try:
+            response = (
+                service.files()
+                .copy(fileId=entry["id"], body=body, supportsAllDrives=True)
+                .execute()
+            )
+        except HttpError as err:
+            LOGGER.error(f"Upload Index: {err}. Uploading Again: {file_path}")
+            async_to_sync(upload_index.discard, key, "gd")
+            return None
+        LOGGER.info(f"Reused Uploaded File: {file_path}")
+        size = ospath.getsize(file_path)
+        upload_index.reused(size)
+        self.__add_processed(size)
+        return response
+
+    def __finish_upload(self, file_path, response, is_dir, service):
         if not self.__listener.seed or self.__listener.newDir:
             try:
                 osremove(file_path)
             except Exception:
                 pass
-        self.__file_processed_bytes = 0
         # Insert new permissions
         if not config_dict["IS_TEAM_DRIVE"]:
-            self.__set_permission(response["id"])
+            self.__set_permission(response["id"], service)
         # Define file instance and get url for download
         if not is_dir:
             drive_file = (
-                self.__service.files()
+                service.files()
                 .get(fileId=response["id"], supportsAllDrives=True)
                 .execute()
             )
@@ -546,6 +807,7 @@ class GoogleDriveHelper:
                 if mime_type is None:
                     mime_type = "File"
                 size = int(meta.get("size", 0))
+                sa_pool.record(self.__sa_name, size)
             return durl, size, mime_type, self.__total_files, self.__total_folders
         except Exception as err:
             if isinstance(err, RetryError):
@@ -564,49 +826,155 @@ class GoogleDriveHelper:
                 msg = "File not found."
             else:
                 msg = f"Error.\n{err}"
-            async_to_sync(self.__listener.onUploadError, msg)
+            schedule_async(self.__listener.onUploadError, msg)
             return None, None, None, None, None
 
-    def __cloneFolder(self, name, local_path, folder_id, dest_id):
-        LOGGER.info(f"Syncing: {local_path}")
-        files = self.__getFilesByFolderId(folder_id)
-        if len(files) == 0:
-            return dest_id
-        for file in files:
-            if file.get("mimeType") == self.__G_DRIVE_DIR_MIME_TYPE:
-                self.__total_folders += 1
-                file_path = ospath.join(local_path, file.get("name"))
-                current_dir_id = self.__create_directory(file.get("name"), dest_id)
-                self.__cloneFolder(
-                    file.get("name"), file_path, file.get("id"), current_dir_id
+    def __execute_batch(self, requests):
+        results = {}
+
+        def callback(request_id, response, exception):
+            results[request_id] = exception or response
+
+        for i in range(0, len(requests), 100):
+            batch = self.__service.new_batch_http_request(callback=callback)
+            for request_id, request in requests[i : i + 100]:
+                batch.add(request, request_id=request_id)
+            batch.execute()
+        return results
+
+    def __create_directories(self, folders, dest_id):
+        requests = []
+        for folder in folders:
+            directory_name, _ = async_to_sync(
+                format_filename, folder["name"], self.__user_id, isMirror=True
+            )
+            file_metadata = {
+                "name": directory_name,
+                "description": config_dict["GD_INFO"],
+                "mimeType": self.__G_DRIVE_DIR_MIME_TYPE,
+                "parents": [dest_id],
+            }
+            requests.append(
+                (
+                    folder["id"],
+                    self.__service.files().create(
+                        body=file_metadata, supportsAllDrives=True, fields="id"
+                    ),
                 )
-            elif not file.get("name").lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
-                self.__total_files += 1
-                self.__copyFile(file.get("id"), dest_id, file.get("name"))
-                self.__processed_bytes += int(file.get("size", 0))
-                self.__total_time = int(time() - self.__start_time)
-            if self.__is_cancelled:
-                break
+            )
+        dir_ids = {}
+        for folder_id, result in self.__execute_batch(requests).items():
+            if isinstance(result, Exception):
+                LOGGER.error(f"Batch folder creation failed, retrying: {result}")
+                folder = next(f for f in folders if f["id"] == folder_id)
+                dir_ids[folder_id] = self.__create_directory(folder["name"], dest_id)
+            else:
+                dir_ids[folder_id] = result["id"]
+        if not config_dict["IS_TEAM_DRIVE"] and dir_ids:
+            permissions = {
+                "role": "reader",
+                "type": "anyone",
+                "value": None,
+                "withLink": True,
+            }
+            results = self.__execute_batch(
+                [
+                    (
+                        dir_id,
+                        self.__service.permissions().create(
+                            fileId=dir_id, body=permissions, supportsAllDrives=True
+                        ),
+                    )
+                    for dir_id in dir_ids.values()
+                ]
+            )
+            for dir_id, result in results.items():
+                if isinstance(result, Exception):
+                    self.__set_permission(dir_id)
+        return dir_ids
+
+    def __cloneFolder(self, name, local_path, folder_id, dest_id):
+        folders = [(local_path, folder_id, dest_id)]
+        with ThreadPoolExecutor(
+            max_workers=max(config_dict["GD_CLONE_WORKERS"], 1),
+            thread_name_prefix="gdclone",
+        ) as pool:
+            while folders and not self.__is_cancelled and self.__clone_error is None:
+                next_folders = []
+                for local_path, folder_id, dest_id in folders:
+                    LOGGER.info(f"Syncing: {local_path}")
+                    files = self.__getFilesByFolderId(folder_id)
+                    sub_folders = []
+                    for file in files:
+                        if file.get("mimeType") == self.__G_DRIVE_DIR_MIME_TYPE:
+                            sub_folders.append(file)
+                        elif (
+                            not file.get("name")
+                            .lower()
+                            .endswith(tuple(GLOBAL_EXTENSION_FILTER))
+                        ):
+                            self.__total_files += 1
+                            pool.submit(self.__clone_worker, file, dest_id)
+                    if sub_folders:
+                        self.__total_folders += len(sub_folders)
+                        dir_ids = self.__create_directories(sub_folders, dest_id)
+                        next_folders.extend(
+                            (
+                                ospath.join(local_path, folder["name"]),
+                                folder["id"],
+                                dir_ids[folder["id"]],
+                            )
+                            for folder in sub_folders
+                        )
+                    if self.__is_cancelled or self.__clone_error is not None:
+                        break
+                folders = next_folders
+            if self.__is_cancelled or self.__clone_error is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        if self.__clone_error is not None:
+            raise self.__clone_error
+
+    def __clone_worker(self, file, dest_id):
+        if self.__is_cancelled or self.__clone_error is not None:
+            return
+        try:
+            self.__copyFile(
+                file.get("id"), dest_id, file.get("name"), self.__init_worker()
+            )
+        except Exception as err:
+            if isinstance(err, RetryError):
+                err = err.last_attempt.exception()
+            with self.__worker_lock:
+                if self.__clone_error is None:
+                    self.__clone_error = err
+            return
+        sa_pool.record(self.__workers.sa_name, int(file.get("size", 0)))
+        with self.__worker_lock:
+            self.__processed_bytes += int(file.get("size", 0))
+            self.__total_time = int(time() - self.__start_time)
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(Exception),
     )
-    def __copyFile(self, file_id, dest_id, file_name):
+    def __copyFile(self, file_id, dest_id, file_name, worker=None):
         file_name, _ = async_to_sync(
             format_filename, file_name, self.__user_id, isMirror=True
         )
         body = {"name": file_name, "parents": [dest_id]}
+        service = worker.service if worker is not None else self.__service
         try:
             return (
-                self.__service.files()
+                service.files()
                 .copy(fileId=file_id, body=body, supportsAllDrives=True)
                 .execute()
             )
         except HttpError as err:
             if err.resp.get("content-type", "").startswith("application/json"):
-                reason = eval(err.content).get("error").get("errors")[0].get("reason")
+                reason = (
+                    jsonloads(err.content).get("error").get("errors")[0].get("reason")
+                )
                 if reason not in [
                     "userRateLimitExceeded",
                     "dailyLimitExceeded",
@@ -616,16 +984,22 @@ class GoogleDriveHelper:
                 if reason == "cannotCopyFile":
                     LOGGER.error(err)
                 elif config_dict["USE_SERVICE_ACCOUNTS"]:
-                    if self.__sa_count >= self.__sa_number:
+                    sa_count = (
+                        worker.sa_count if worker is not None else self.__sa_count
+                    )
+                    if sa_count >= self.__sa_number:
                         LOGGER.info(
-                            f"Reached maximum number of service accounts switching, which is {self.__sa_count}"
+                            f"Reached maximum number of service accounts switching, which is {sa_count}"
                         )
                         raise err
                     else:
                         if self.__is_cancelled:
                             return
-                        self.__switchServiceAccount()
-                        return self.__copyFile(file_id, dest_id, file_name)
+                        if worker is not None:
+                            self.__switch_worker(worker)
+                        else:
+                            self.__switchServiceAccount()
+                        return self.__copyFile(file_id, dest_id, file_name, worker)
                 else:
                     LOGGER.error(f"Got: {reason}")
                     raise err
@@ -949,13 +1323,13 @@ class GoogleDriveHelper:
                         self.__updater.cancel()
                         return self.download(link)
                 err = "File not found!"
-            async_to_sync(self.__listener.onDownloadError, err)
+            schedule_async(self.__listener.onDownloadError, err)
             self.__is_cancelled = True
         finally:
             self.__updater.cancel()
             if self.__is_cancelled:
                 return
-            async_to_sync(self.__listener.onDownloadComplete)
+            schedule_async(self.__listener.onDownloadComplete)
 
     def __download_folder(self, folder_id, path, folder_name):
         folder_name = folder_name.replace("/", "")
@@ -1033,7 +1407,7 @@ class GoogleDriveHelper:
                         else:
                             if self.__is_cancelled:
                                 return
-                            self.__switchServiceAccount()
+                            self.__switchServiceAccount(reason == "dailyLimitExceeded")
                             LOGGER.info(f"Got: {reason}, Trying Again...")
                             return self.__download_file(
                                 file_id, path, filename, mime_type
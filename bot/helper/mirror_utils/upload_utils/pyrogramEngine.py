@@ -9,12 +9,12 @@ from aiofiles.os import (
     rmdir,
     mkdir,
 )
-from os import walk, path as ospath
+from os import path as ospath
 from time import time
 from PIL import Image
 from pyrogram.types import InputMediaVideo, InputMediaDocument, InlineKeyboardMarkup
 from pyrogram.errors import FloodWait, RPCError, PeerIdInvalid, ChannelInvalid
-from asyncio import sleep
+from asyncio import Semaphore, sleep
 from tenacity import (
     retry,
     wait_exponential,
@@ -33,6 +33,7 @@ from bot import (
     bot,
     user,
     IS_PREMIUM_USER,
+    bot_loop,
 )
 from bot.helper.themes import BotTheme
 from bot.helper.telegram_helper.button_build import ButtonMaker
@@ -44,7 +45,13 @@ from bot.helper.telegram_helper.message_utils import (
     deleteMessage,
     get_tg_link_content,
 )
-from bot.helper.ext_utils.fs_utils import clean_unwanted, is_archive, get_base_name
+from bot.helper.ext_utils.fs_utils import (
+    clean_unwanted,
+    is_archive,
+    get_base_name,
+    scan_tree,
+    invalidate_scan,
+)
 from bot.helper.ext_utils.bot_utils import (
     get_readable_file_size,
     is_telegram_link,
@@ -60,7 +67,9 @@ from bot.helper.ext_utils.leech_utils import (
     get_ss,
     get_mediainfo_link,
     format_filename,
+    get_upload_key,
 )
+from bot.helper.ext_utils.upload_index import upload_index
 
 LOGGER = getLogger(__name__)
 getLogger("pyrogram").setLevel(ERROR)
@@ -70,7 +79,6 @@ class TgUploader:
 
     def __init__(self, name=None, path=None, listener=None):
         self.name = name
-        self.__last_uploaded = 0
         self.__processed_bytes = 0
         self.__listener = listener
         self.__path = path
@@ -86,8 +94,8 @@ class TgUploader:
         self.__is_corrupted = False
         self.__media_dict = {"videos": {}, "documents": {}}
         self.__last_msg_in_group = False
-        self.__prm_media = False
-        self.__client = bot
+        self.__clients_load = {"bot": 0, "user": 0}
+        self.__indexed = {}
         self.__up_path = ""
         self.__mediainfo = False
         self.__as_doc = False
@@ -121,7 +129,7 @@ class TgUploader:
                 await mkdir(path)
             des_dir = ospath.join(path, f"{time()}.jpg")
             await sync_to_async(
-                Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG"
+                Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG", pool="cpu"
             )
             await aioremove(photo_dir)
             return des_dir
@@ -245,13 +253,13 @@ class TgUploader:
             if not self.__is_cancelled:
                 LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
 
-    async def __upload_progress(self, current, total):
+    async def __upload_progress(self, current, total, item):
         if self.__is_cancelled:
             if IS_PREMIUM_USER:
                 user.stop_transmission()
             bot.stop_transmission()
-        chunk_size = current - self.__last_uploaded
-        self.__last_uploaded = current
+        chunk_size = current - item["uploaded"]
+        item["uploaded"] = current
         self.__processed_bytes += chunk_size
 
     async def __user_settings(self):
@@ -375,11 +383,19 @@ class TgUploader:
             rlist.append(input_media)
         return rlist
 
-    async def __switching_client(self):
+    def __switching_client(self, item, balance=False):
+        if IS_PREMIUM_USER and (
+            item["prm_media"]
+            or balance
+            and self.__clients_load["user"] < self.__clients_load["bot"]
+        ):
+            item["client"] = "user"
+        else:
+            item["client"] = "bot"
         LOGGER.info(
-            f'Uploading Media {">" if self.__prm_media else "<"} 2GB by {"User" if self.__prm_media else "Bot"} Client'
+            f'Uploading Media {">" if item["prm_media"] else "<"} 2GB by {item["client"].title()} Client'
         )
-        self.__client = user if (self.__prm_media and IS_PREMIUM_USER) else bot
+        return user if item["client"] == "user" else bot
 
     async def __send_media_group(self, subkey, key, msgs):
         msgs_list = await msgs[0].reply_to_message.reply_media_group(
@@ -387,6 +403,9 @@ class TgUploader:
             quote=True,
             disable_notification=True,
         )
+        for msg, new_msg in zip(msgs, msgs_list):
+            if index := self.__indexed.pop((msg.chat.id, msg.id), None):
+                await self.__record_index(index, new_msg)
         for msg in msgs:
             if msg.link in self.__msgs_dict:
                 del self.__msgs_dict[msg.link]
@@ -427,13 +446,25 @@ class TgUploader:
             if not self.__is_cancelled:
                 LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
 
-    async def upload(self, o_files, m_size, size):
-        await self.__user_settings()
-        res = await self.__msg_to_reply()
-        if not res:
-            return
-        isDeleted = False
-        for dirpath, _, files in sorted(await sync_to_async(walk, self.__path)):
+    async def __remove_file(self, up_path, dirpath):
+        if (
+            not self.__is_cancelled
+            and await aiopath.exists(up_path)
+            and (
+                not self.__listener.seed
+                or self.__listener.newDir
+                or dirpath.endswith("/splited_files_mltb")
+                or "/copied_mltb/" in up_path
+            )
+        ):
+            await aioremove(up_path)
+
+    async def __collect_files(self, o_files, m_size):
+        items = []
+        manifest = await scan_tree(self.__path)
+        # files get renamed or removed below, later stages must rescan
+        invalidate_scan(self.__path)
+        for dirpath, _, files in manifest.walk():
             if dirpath.endswith("/yt-dlp-thumb"):
                 continue
             for file_ in natsorted(files):
@@ -442,7 +473,7 @@ class TgUploader:
                     await aioremove(self.__up_path)
                     continue
                 try:
-                    f_size = await aiopath.getsize(self.__up_path)
+                    f_size = manifest.getsize(self.__up_path)
                     if self.__listener.seed and file_ in o_files and f_size in m_size:
                         continue
                     self.__total_files += 1
@@ -451,18 +482,88 @@ class TgUploader:
                             f"{self.__up_path} size is zero, telegram don't upload zero size files"
                         )
                         self.__corrupted += 1
+                        await self.__remove_file(self.__up_path, dirpath)
                         continue
                     if self.__is_cancelled:
-                        return
-                    self.__prm_media = True if f_size > 2097152000 else False
+                        return items
                     cap_mono, file_ = await self.__prepare_file(file_, dirpath)
+                    items.append(
+                        {
+                            "path": self.__up_path,
+                            "dirpath": dirpath,
+                            "file": file_,
+                            "cap_mono": cap_mono,
+                            "size": f_size,
+                            "prm_media": f_size > 2097152000,
+                            "uploaded": 0,
+                        }
+                    )
+                except Exception:
+                    LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
+                    if self.__is_cancelled:
+                        return items
+                    await self.__remove_file(self.__up_path, dirpath)
+        return items
+
+    async def __stage_file(self, item, reply_to, semaphore):
+        async with semaphore:
+            if self.__is_cancelled:
+                return None
+            client = self.__switching_client(item, balance=True)
+            self.__clients_load[item["client"]] += item["size"]
+            try:
+                return await self.__send_file(item, client, reply_to, staged=True)
+            finally:
+                self.__clients_load[item["client"]] -= item["size"]
+
+    async def __publish_staged(self, item, staged):
+        # user session uploads carry no keyboard, the bot adds it on the copy
+        sent_msg = await bot.copy_message(
+            chat_id=self.__sent_msg.chat.id,
+            from_chat_id=staged.chat.id,
+            message_id=staged.id,
+            reply_to_message_id=self.__sent_msg.id,
+            reply_markup=item.get("buttons"),
+        )
+        await deleteMessage(staged)
+        return sent_msg
+
+    async def __discard_staged(self, items):
+        for item in items:
+            if (task := item.pop("task", None)) is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.exception() is None and task.result():
+                await deleteMessage(task.result())
+
+    async def upload(self, o_files, m_size, size):
+        await self.__user_settings()
+        res = await self.__msg_to_reply()
+        if not res:
+            return
+        items = await self.__collect_files(o_files, m_size)
+        if self.__is_cancelled:
+            return
+        if (parallel := config_dict["LEECH_PARALLEL_UPLOADS"]) > 1 and len(items) > 1:
+            semaphore = Semaphore(parallel)
+            for item in items:
+                item["task"] = bot_loop.create_task(
+                    self.__stage_file(item, self.__sent_msg, semaphore)
+                )
+        isDeleted = False
+        try:
+            for item in items:
+                try:
+                    if self.__is_cancelled:
+                        return
                     if self.__last_msg_in_group:
                         group_lists = [
                             x for v in self.__media_dict.values() for x in v.keys()
                         ]
                         if (
                             match := re_match(
-                                r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", self.__up_path
+                                r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", item["path"]
                             )
                         ) and match.group(0) not in group_lists:
                             for key, value in list(self.__media_dict.items()):
@@ -470,9 +571,7 @@ class TgUploader:
                                     if len(msgs) > 1:
                                         await self.__send_media_group(subkey, key, msgs)
                     self.__last_msg_in_group = False
-                    self.__last_uploaded = 0
-                    await self.__switching_client()
-                    await self.__upload_file(cap_mono, file_)
+                    await self.__upload_file(item)
                     if (
                         self.__leechmsg
                         and not isDeleted
@@ -485,7 +584,7 @@ class TgUploader:
                     if not self.__is_corrupted and (
                         self.__listener.isSuperGroup or config_dict["LEECH_LOG_ID"]
                     ):
-                        self.__msgs_dict[self.__sent_msg.link] = file_
+                        self.__msgs_dict[self.__sent_msg.link] = item["file"]
                     await sleep(1)
                 except Exception as err:
                     if isinstance(err, RetryError):
@@ -493,22 +592,14 @@ class TgUploader:
                             f"Total Attempts: {err.last_attempt.attempt_number}"
                         )
                     else:
-                        LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
+                        LOGGER.error(f"{format_exc()}. Path: {item['path']}")
                     if self.__is_cancelled:
                         return
                     continue
                 finally:
-                    if (
-                        not self.__is_cancelled
-                        and await aiopath.exists(self.__up_path)
-                        and (
-                            not self.__listener.seed
-                            or self.__listener.newDir
-                            or dirpath.endswith("/splited_files_mltb")
-                            or "/copied_mltb/" in self.__up_path
-                        )
-                    ):
-                        await aioremove(self.__up_path)
+                    await self.__remove_file(item["path"], item["dirpath"])
+        finally:
+            await self.__discard_staged(items)
         for key, value in list(self.__media_dict.items()):
             for subkey, msgs in list(value.items()):
                 if len(msgs) > 1:
@@ -542,159 +633,254 @@ class TgUploader:
             self.name,
         )
 
-    @retry(
-        wait=wait_exponential(multiplier=2, min=4, max=8),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
-    )
-    async def __upload_file(self, cap_mono, file, force_document=False):
+    async def __record_index(self, index, sent_msg):
+        key, target, md5_hash = index
+        self.__indexed[(sent_msg.chat.id, sent_msg.id)] = index
+        await upload_index.record(
+            key, target, {"chat_id": sent_msg.chat.id, "msg_id": sent_msg.id}, md5_hash
+        )
+
+    async def __send_indexed(self, item, reply_to, is_video, force_document):
+        if self.__leech_utils["thumb"]:
+            return None
+        target = "tg:doc" if self.__as_doc or force_document else "tg:media"
+        if self.__thumb is not None:
+            target += f":{await sync_to_async(upload_index.fingerprint, self.__thumb, pool='cpu')}"
+        key, md5_hash = await get_upload_key(item["path"])
+        item["index"] = (key, target, md5_hash)
+        if (entry := await upload_index.lookup(key, target, md5_hash)) is None:
+            return None
+        try:
+            sent_msg = await bot.copy_message(
+                chat_id=reply_to.chat.id,
+                from_chat_id=entry["chat_id"],
+                message_id=entry["msg_id"],
+                caption=item["cap_mono"],
+                reply_to_message_id=reply_to.id,
+                disable_notification=True,
+                reply_markup=await self.__buttons(item["path"], is_video),
+            )
+            if not sent_msg.media:
+                await deleteMessage(sent_msg)
+                raise ValueError("Indexed message has no media")
+        except Exception as e:
+            LOGGER.error(f"Upload Index: {e}. Uploading Again: {item['path']}")
+            await upload_index.discard(key, target)
+            return None
+        LOGGER.info(f"Reused Uploaded Media: {item['path']}")
+        upload_index.reused(item["size"])
+        item["key"] = f"{sent_msg.media.value}s"
+        item["uploaded"] = item["size"]
+        self.__processed_bytes += item["size"]
+        return sent_msg
+
+    async def __send_file(
+        self, item, client, reply_to, force_document=False, staged=False
+    ):
         if self.__thumb is not None and not await aiopath.exists(self.__thumb):
             self.__thumb = None
-        thumb = self.__thumb
-        self.__is_corrupted = False
-        try:
-            is_video, is_audio, is_image = await get_document_type(self.__up_path)
+        item["thumb"] = None
+        item["key"] = None
+        item["index"] = None
+        item["uploaded"] = 0
+        is_video, is_audio, is_image = await get_document_type(item["path"])
 
-            if self.__leech_utils["thumb"]:
-                thumb = await self.get_custom_thumb(self.__leech_utils["thumb"])
+        if config_dict["UPLOAD_DEDUPE"] and (
+            sent_msg := await self.__send_indexed(
+                item, reply_to, is_video, force_document
+            )
+        ):
+            return sent_msg
+        thumb = item["thumb"] = self.__thumb
 
-            if not is_image and thumb is None:
-                file_name = ospath.splitext(file)[0]
-                thumb_path = f"{self.__path}/yt-dlp-thumb/{file_name}.jpg"
-                if await aiopath.isfile(thumb_path):
-                    thumb = thumb_path
-                elif is_audio and not is_video:
-                    thumb = await get_audio_thumb(self.__up_path)
+        if self.__leech_utils["thumb"]:
+            thumb = item["thumb"] = await self.get_custom_thumb(
+                self.__leech_utils["thumb"]
+            )
+
+        if not is_image and thumb is None:
+            file_name = ospath.splitext(item["file"])[0]
+            thumb_path = f"{self.__path}/yt-dlp-thumb/{file_name}.jpg"
+            if await aiopath.isfile(thumb_path):
+                thumb = item["thumb"] = thumb_path
+            elif is_audio and not is_video:
+                thumb = item["thumb"] = await get_audio_thumb(item["path"])
+
+        if (
+            self.__as_doc
+            or force_document
+            or (not is_video and not is_audio and not is_image)
+        ):
+            item["key"] = "documents"
+            if is_video and thumb is None:
+                thumb = item["thumb"] = await take_ss(item["path"], None)
+            if self.__is_cancelled:
+                return None
+            buttons = item["buttons"] = await self.__buttons(item["path"], is_video)
+            nrml_media = await client.send_document(
+                chat_id=reply_to.chat.id,
+                reply_to_message_id=reply_to.id,
+                document=item["path"],
+                thumb=thumb,
+                caption=item["cap_mono"],
+                force_document=True,
+                disable_notification=True,
+                progress=self.__upload_progress,
+                progress_args=(item,),
+                reply_markup=buttons,
+            )
 
             if (
-                self.__as_doc
-                or force_document
-                or (not is_video and not is_audio and not is_image)
+                item["prm_media"]
+                and not staged
+                and (self.__has_buttons or not self.__leechmsg)
             ):
-                key = "documents"
-                if is_video and thumb is None:
-                    thumb = await take_ss(self.__up_path, None)
-                if self.__is_cancelled:
-                    return
-                buttons = await self.__buttons(self.__up_path, is_video)
-                nrml_media = await self.__client.send_document(
-                    chat_id=self.__sent_msg.chat.id,
-                    reply_to_message_id=self.__sent_msg.id,
-                    document=self.__up_path,
-                    thumb=thumb,
-                    caption=cap_mono,
-                    force_document=True,
-                    disable_notification=True,
-                    progress=self.__upload_progress,
-                    reply_markup=buttons,
-                )
-
-                if self.__prm_media and (self.__has_buttons or not self.__leechmsg):
-                    try:
-                        self.__sent_msg = await bot.copy_message(
-                            nrml_media.chat.id,
-                            nrml_media.chat.id,
-                            nrml_media.id,
-                            reply_to_message_id=self.__sent_msg.id,
-                            reply_markup=buttons,
-                        )
-                        if self.__sent_msg:
-                            await deleteMessage(nrml_media)
-                    except Exception:
-                        self.__sent_msg = nrml_media
-                else:
-                    self.__sent_msg = nrml_media
-            elif is_video:
-                key = "videos"
-                duration = (await get_media_info(self.__up_path))[0]
-                if thumb is None:
-                    thumb = await take_ss(self.__up_path, duration)
-                if thumb is not None:
-                    with Image.open(thumb) as img:
-                        width, height = img.size
-                else:
-                    width = 480
-                    height = 320
-                if not self.__up_path.upper().endswith(("MKV", "MP4")):
-                    dirpath, file_ = self.__up_path.rsplit("/", 1)
-                    if (
-                        self.__listener.seed
-                        and not self.__listener.newDir
-                        and not dirpath.endswith("/splited_files_mltb")
-                    ):
-                        dirpath = f"{dirpath}/copied_mltb"
-                        await makedirs(dirpath, exist_ok=True)
-                        new_path = ospath.join(
-                            dirpath, f"{ospath.splitext(file_)[0]}.mp4"
-                        )
-                        self.__up_path = await copy(self.__up_path, new_path)
-                    else:
-                        new_path = f"{ospath.splitext(self.__up_path)[0]}.mp4"
-                        await aiorename(self.__up_path, new_path)
-                        self.__up_path = new_path
-                if self.__is_cancelled:
-                    return
-                buttons = await self.__buttons(self.__up_path, is_video)
-                nrml_media = await self.__client.send_video(
-                    chat_id=self.__sent_msg.chat.id,
-                    reply_to_message_id=self.__sent_msg.id,
-                    video=self.__up_path,
-                    caption=cap_mono,
-                    duration=duration,
-                    width=width,
-                    height=height,
-                    thumb=thumb,
-                    supports_streaming=True,
-                    disable_notification=True,
-                    progress=self.__upload_progress,
-                    reply_markup=buttons,
-                )
-                if self.__prm_media and (self.__has_buttons or not self.__leechmsg):
-                    try:
-                        self.__sent_msg = await bot.copy_message(
-                            nrml_media.chat.id,
-                            nrml_media.chat.id,
-                            nrml_media.id,
-                            reply_to_message_id=self.__sent_msg.id,
-                            reply_markup=buttons,
-                        )
-                        if self.__sent_msg:
-                            await deleteMessage(nrml_media)
-                    except Exception:
-                        self.__sent_msg = nrml_media
+                try:
+                    sent_msg = await bot.copy_message(
+                        nrml_media.chat.id,
+                        nrml_media.chat.id,
+                        nrml_media.id,
+                        reply_to_message_id=reply_to.id,
+                        reply_markup=buttons,
+                    )
+                    if sent_msg:
+                        await deleteMessage(nrml_media)
+                except Exception:
+                    sent_msg = nrml_media
+            else:
+                sent_msg = nrml_media
+        elif is_video:
+            item["key"] = "videos"
+            duration = (await get_media_info(item["path"]))[0]
+            if thumb is None:
+                thumb = item["thumb"] = await take_ss(item["path"], duration)
+            if thumb is not None:
+                with Image.open(thumb) as img:
+                    width, height = img.size
+            else:
+                width = 480
+                height = 320
+            if not item["path"].upper().endswith(("MKV", "MP4")):
+                dirpath, file_ = item["path"].rsplit("/", 1)
+                if (
+                    self.__listener.seed
+                    and not self.__listener.newDir
+                    and not dirpath.endswith("/splited_files_mltb")
+                ):
+                    dirpath = f"{dirpath}/copied_mltb"
+                    await makedirs(dirpath, exist_ok=True)
+                    new_path = ospath.join(dirpath, f"{ospath.splitext(file_)[0]}.mp4")
+                    item["path"] = await copy(item["path"], new_path)
                 else:
-                    self.__sent_msg = nrml_media
-            elif is_audio:
-                key = "audios"
-                duration, artist, title = await get_media_info(self.__up_path)
-                if self.__is_cancelled:
-                    return
-                self.__sent_msg = await self.__client.send_audio(
-                    chat_id=self.__sent_msg.chat.id,
-                    reply_to_message_id=self.__sent_msg.id,
-                    audio=self.__up_path,
-                    caption=cap_mono,
-                    duration=duration,
-                    performer=artist,
-                    title=title,
-                    thumb=thumb,
-                    disable_notification=True,
-                    progress=self.__upload_progress,
-                    reply_markup=await self.__buttons(self.__up_path),
-                )
+                    new_path = f"{ospath.splitext(item['path'])[0]}.mp4"
+                    await aiorename(item["path"], new_path)
+                    item["path"] = new_path
+            if self.__is_cancelled:
+                return None
+            buttons = item["buttons"] = await self.__buttons(item["path"], is_video)
+            nrml_media = await client.send_video(
+                chat_id=reply_to.chat.id,
+                reply_to_message_id=reply_to.id,
+                video=item["path"],
+                caption=item["cap_mono"],
+                duration=duration,
+                width=width,
+                height=height,
+                thumb=thumb,
+                supports_streaming=True,
+                disable_notification=True,
+                progress=self.__upload_progress,
+                progress_args=(item,),
+                reply_markup=buttons,
+            )
+            if (
+                item["prm_media"]
+                and not staged
+                and (self.__has_buttons or not self.__leechmsg)
+            ):
+                try:
+                    sent_msg = await bot.copy_message(
+                        nrml_media.chat.id,
+                        nrml_media.chat.id,
+                        nrml_media.id,
+                        reply_to_message_id=reply_to.id,
+                        reply_markup=buttons,
+                    )
+                    if sent_msg:
+                        await deleteMessage(nrml_media)
+                except Exception:
+                    sent_msg = nrml_media
             else:
-                key = "photos"
-                if self.__is_cancelled:
+                sent_msg = nrml_media
+        elif is_audio:
+            item["key"] = "audios"
+            duration, artist, title = await get_media_info(item["path"])
+            if self.__is_cancelled:
+                return None
+            buttons = item["buttons"] = await self.__buttons(item["path"])
+            sent_msg = await client.send_audio(
+                chat_id=reply_to.chat.id,
+                reply_to_message_id=reply_to.id,
+                audio=item["path"],
+                caption=item["cap_mono"],
+                duration=duration,
+                performer=artist,
+                title=title,
+                thumb=thumb,
+                disable_notification=True,
+                progress=self.__upload_progress,
+                progress_args=(item,),
+                reply_markup=buttons,
+            )
+        else:
+            item["key"] = "photos"
+            if self.__is_cancelled:
+                return None
+            buttons = item["buttons"] = await self.__buttons(item["path"])
+            sent_msg = await client.send_photo(
+                chat_id=reply_to.chat.id,
+                reply_to_message_id=reply_to.id,
+                photo=item["path"],
+                caption=item["cap_mono"],
+                disable_notification=True,
+                progress=self.__upload_progress,
+                progress_args=(item,),
+                reply_markup=buttons,
+            )
+        return sent_msg
+
+    async def __remove_thumb(self, thumb):
+        if self.__thumb is None and thumb is not None and await aiopath.exists(thumb):
+            await aioremove(thumb)
+            if (
+                (dir_name := ospath.dirname(thumb))
+                and dir_name != "Thumbnails"
+                and await aiopath.exists(dir_name)
+            ):
+                await rmdir(dir_name)
+
+    @retry(
+        wait=wait_exponential(multiplier=2, min=4, max=8),
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception_type(Exception),
+    )
+    async def __upload_file(self, item, force_document=False):
+        self.__is_corrupted = False
+        try:
+            if (task := item.pop("task", None)) is not None:
+                if (staged := await task) is None:
                     return
-                self.__sent_msg = await self.__client.send_photo(
-                    chat_id=self.__sent_msg.chat.id,
-                    reply_to_message_id=self.__sent_msg.id,
-                    photo=self.__up_path,
-                    caption=cap_mono,
-                    disable_notification=True,
-                    progress=self.__upload_progress,
-                    reply_markup=await self.__buttons(self.__up_path),
+                sent_msg = await self.__publish_staged(item, staged)
+            else:
+                client = self.__switching_client(item)
+                sent_msg = await self.__send_file(
+                    item, client, self.__sent_msg, force_document
                 )
+            if sent_msg is None:
+                return
+            self.__sent_msg = sent_msg
+            if item.get("index"):
+                await self.__record_index(item["index"], sent_msg)
 
             if (
                 not self.__is_cancelled
@@ -703,7 +889,7 @@ class TgUploader:
             ):
                 key = "documents" if self.__sent_msg.document else "videos"
                 if match := re_match(
-                    r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", self.__up_path
+                    r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", item["path"]
                 ):
                     pname = match.group(0)
                     if pname in self.__media_dict[key].keys():
@@ -718,40 +904,18 @@ class TgUploader:
             if self.__sent_msg:
                 await self.__copy_file()
 
-            if (
-                self.__thumb is None
-                and thumb is not None
-                and await aiopath.exists(thumb)
-            ):
-                await aioremove(thumb)
-                if (
-                    (dir_name := ospath.dirname(thumb))
-                    and dir_name != "Thumbnails"
-                    and await aiopath.exists(dir_name)
-                ):
-                    await rmdir(dir_name)
+            await self.__remove_thumb(item["thumb"])
             self.__retry_error = False
         except FloodWait as f:
             LOGGER.warning(str(f))
             await sleep(f.value)
         except Exception as err:
             self.__retry_error = True
-            if (
-                self.__thumb is None
-                and thumb is not None
-                and await aiopath.exists(thumb)
-            ):
-                await aioremove(thumb)
-                if (
-                    (dir_name := ospath.dirname(thumb))
-                    and dir_name != "Thumbnails"
-                    and await aiopath.exists(dir_name)
-                ):
-                    await rmdir(dir_name)
-            LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
-            if "Telegram says: [400" in str(err) and key != "documents":
-                LOGGER.error(f"Retrying As Document. Path: {self.__up_path}")
-                return await self.__upload_file(cap_mono, file, True)
+            await self.__remove_thumb(item.get("thumb"))
+            LOGGER.error(f"{format_exc()}. Path: {item['path']}")
+            if "Telegram says: [400" in str(err) and item.get("key") != "documents":
+                LOGGER.error(f"Retrying As Document. Path: {item['path']}")
+                return await self.__upload_file(item, True)
             raise err
 
     @property
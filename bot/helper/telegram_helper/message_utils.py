@@ -50,6 +50,10 @@ from bot.helper.ext_utils.bot_utils import (
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.exceptions import TgLinkException
 
+# intervals a status message may keep stale elapsed/footer stats for
+STATUS_MAX_STALE = 5
+status_signatures = {}
+
 
 async def sendMessage(message, text, buttons=None, photo=None, **kwargs):
     try:
@@ -411,11 +415,18 @@ async def update_all_messages(force=False):
         for chat_id in list(status_reply_dict.keys()):
             status_reply_dict[chat_id][1] = time()
     async with download_dict_lock:
-        msg, buttons = await sync_to_async(get_readable_message)
+        msg, buttons, signature = await sync_to_async(get_readable_message, pool="cpu")
     if msg is None:
         return
+    max_stale = config_dict["STATUS_UPDATE_INTERVAL"] * STATUS_MAX_STALE
     async with status_reply_dict_lock:
+        for chat_id in list(status_signatures.keys()):
+            if chat_id not in status_reply_dict:
+                del status_signatures[chat_id]
         for chat_id in list(status_reply_dict.keys()):
+            last_signature, edited = status_signatures.get(chat_id, (None, 0))
+            if signature == last_signature and time() - edited < max_stale:
+                continue
             if status_reply_dict[chat_id] and msg != status_reply_dict[chat_id][0].text:
                 rmsg = await editMessage(
                     status_reply_dict[chat_id][0], msg, buttons, "IMAGES"
@@ -425,11 +436,14 @@ async def update_all_messages(force=False):
                     continue
                 status_reply_dict[chat_id][0].text = msg
                 status_reply_dict[chat_id][1] = time()
+                status_signatures[chat_id] = (signature, time())
 
 
 async def sendStatusMessage(msg):
     async with download_dict_lock:
-        progress, buttons = await sync_to_async(get_readable_message)
+        progress, buttons, signature = await sync_to_async(
+            get_readable_message, pool="cpu"
+        )
     if progress is None:
         return
     async with status_reply_dict_lock:
@@ -441,9 +455,9 @@ async def sendStatusMessage(msg):
         if message := await sendMessage(msg, progress, buttons, photo="IMAGES"):
             if hasattr(message, "caption"):
                 message.caption = progress
-            else:
-                message.text = progress
+            message.text = progress
         status_reply_dict[chat_id] = [message, time()]
+        status_signatures[chat_id] = (signature, time())
         if not Interval:
             Interval.append(
                 setInterval(config_dict["STATUS_UPDATE_INTERVAL"], update_all_messages)
@@ -2,31 +2,92 @@
 from os import listdir
 from importlib import import_module
 from random import choice as rchoice
+from string import Formatter
 from bot import config_dict, LOGGER
 from bot.helper.themes import wzml_minimal
 
 AVL_THEMES = {}
-for theme in listdir("bot/helper/themes"):
-    if theme.startswith("wzml_") and theme.endswith(".py"):
-        AVL_THEMES[theme[5:-3]] = import_module(f"bot.helper.themes.{theme[:-3]}")
 
 
-def BotTheme(var_name, **format_vars):
-    text = None
-    theme_ = config_dict["BOT_THEME"]
+def compile_template(text):
+    """
+    Template ==> function of its format_vars, concatenating the literal parts
+    and plain {name} fields instead of str.format_map parsing it on every render.
+    Fields with a spec, conversion, index or attribute keep using format_map.
+    """
+    parts = []
+    try:
+        for literal, field, spec, conversion in Formatter().parse(text):
+            if literal:
+                parts.append(repr(literal))
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                return text.format_map
+            parts.append(f"format(v[{field!r}])")
+    except ValueError:
+        return text.format_map
+    return eval(f"lambda v: {' + '.join(parts) or repr('')}", {"format": format})
+
+
+class ThemeRegistry:
+    """
+    Theme modules are imported once and every template is resolved and
+    compiled once per theme, so rendering is a dict lookup + concatenation.
+    """
+
+    def __init__(self):
+        self.__styles = {}
+        self.__formatters = {}
+        self.__theme = None
+        self.load()
+
+    def load(self):
+        for theme in listdir("bot/helper/themes"):
+            if theme.startswith("wzml_") and theme.endswith(".py"):
+                AVL_THEMES[theme[5:-3]] = import_module(
+                    f"bot.helper.themes.{theme[:-3]}"
+                )
+        self.__styles = {name: module.WZMLStyle for name, module in AVL_THEMES.items()}
+        self.invalidate()
+
+    def invalidate(self):
+        self.__formatters.clear()
+        self.__theme = config_dict["BOT_THEME"]
 
-    if theme_ in AVL_THEMES:
-        text = getattr(AVL_THEMES[theme_].WZMLStyle(), var_name, None)
+    def __compile(self, theme_, var_name):
+        text = getattr(self.__styles[theme_], var_name, None)
         if text is None:
             LOGGER.error(
                 f"{var_name} not Found in {theme_}. Please recheck with Official Repo"
             )
-    elif theme_ == "random":
-        rantheme = rchoice(list(AVL_THEMES.values()))
-        LOGGER.info(f"Random Theme Chosen: {rantheme}")
-        text = getattr(rantheme.WZMLStyle(), var_name, None)
+            text = getattr(wzml_minimal.WZMLStyle, var_name)
+        return compile_template(text)
+
+    def formatter(self, var_name):
+        theme_ = config_dict["BOT_THEME"]
+        if theme_ != self.__theme:
+            self.invalidate()
+        if theme_ == "random":
+            theme_ = rchoice(list(self.__styles.keys()))
+            LOGGER.info(f"Random Theme Chosen: {theme_}")
+        elif theme_ not in self.__styles:
+            theme_ = "minimal"
+        key = (theme_, var_name)
+        if (fmt := self.__formatters.get(key)) is None:
+            fmt = self.__formatters[key] = self.__compile(theme_, var_name)
+        return fmt
+
+
+theme_registry = ThemeRegistry()
+
+
+def BotTheme(var_name, **format_vars):
+    return theme_registry.formatter(var_name)(format_vars)
 
-    if text is None:
-        text = getattr(wzml_minimal.WZMLStyle(), var_name)
 
-    return text.format_map(format_vars)
+def BotThemeBlock(parts):
+    return "".join(
+        theme_registry.formatter(var_name)(format_vars)
+        for var_name, format_vars in parts
+    )
@@ -60,6 +60,27 @@ class WZMLStyle:
 ┃ <b>Total Disk Read :</b> {disk_read}
 ┃ <b>Total Disk Write :</b> {disk_write}
 ┖ <b>U :</b> {disk_u} | <b>F :</b> {disk_f} | <b>T :</b> {disk_t}
+
+┎ <b><i>MEDIA PROBE CACHE :</i></b>
+┖ <b>Hits :</b> {probe_hits} | <b>Misses :</b> {probe_misses} | <b>Cached :</b> {probe_cached} ({probe_ratio}%)
+
+┎ <b><i>UPLOAD DEDUPE INDEX :</i></b>
+┖ <b>Hits :</b> {index_hits} / {index_lookups} ({index_ratio}%) | <b>Saved :</b> {index_saved}
+
+┎ <b><i>SERVICE ACCOUNTS :</i></b>
+┠ <b>Ready :</b> {sa_ready} / {sa_total} | <b>Cooling :</b> {sa_cooling}
+┖ <b>Used 24h :</b> {sa_used} | <b>Left :</b> {sa_left}
+
+┎ <b><i>QUEUE WAITS :</i></b>
+┠ <b>DL ({queue_dl}) :</b> {queue_dl_waits}
+┠ <b>UP ({queue_up}) :</b> {queue_up_waits}
+┖ <b>CPU ({queue_cpu}) :</b> {queue_cpu_waits}
+
+┎ <b><i>THREAD POOLS :</i></b>
+{pool_stats}
+
+┎ <b><i>QBIT RPC :</i></b>
+{qbit_rpc}
     
     """
     SYS_STATS = """⌬ <b><i>OS SYSTEM :</i></b>
@@ -49,11 +49,13 @@ from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async, new_thread
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.ext_utils.executors import resize_executors
 from bot.helper.ext_utils.help_messages import default_desp
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
+from bot.helper.mirror_utils.rclone_utils.rcd import rcd_pool
 from bot.modules.torrent_search import initiate_search_tools
 from bot.modules.rss import addJob
-from bot.helper.themes import AVL_THEMES
+from bot.helper.themes import AVL_THEMES, theme_registry
 
 START = 0
 STATE = "view"
@@ -74,6 +76,14 @@ default_values = {
     "AUTHOR_URL": "https://t.me/WZML_X",
     "TITLE_NAME": "WZ Mirror/Leech X",
     "GD_INFO": "Uploaded by WZML-X",
+    "DIRECT_PARALLEL_DOWNLOADS": 4,
+    "DIRECT_DOWNLOAD_RETRIES": 2,
+    "GD_CLONE_WORKERS": 8,
+    "LEECH_PARALLEL_UPLOADS": 1,
+    "GD_UPLOAD_WORKERS": 4,
+    "EXECUTOR_IO_LONG": 64,
+    "EXECUTOR_IO_SHORT": 32,
+    "EXECUTOR_CPU": 0,
 }
 bool_vars = [
     "AS_DOCUMENT",
@@ -96,6 +106,10 @@ bool_vars = [
     "INCOMPLETE_TASK_NOTIFIER",
     "UPGRADE_PACKAGES",
     "SCREENSHOTS_MODE",
+    "SCREENSHOTS_SHEET",
+    "UPLOAD_DEDUPE",
+    "UPLOAD_DEDUPE_VERIFY",
+    "RCLONE_RCD",
 ]
 
 
@@ -338,6 +352,18 @@ async def load_config():
     QUEUE_UPLOAD = environ.get("QUEUE_UPLOAD", "")
     QUEUE_UPLOAD = "" if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+    QUEUE_CPU = environ.get("QUEUE_CPU", "")
+    QUEUE_CPU = "" if len(QUEUE_CPU) == 0 else int(QUEUE_CPU)
+
+    EXECUTOR_IO_LONG = environ.get("EXECUTOR_IO_LONG", "")
+    EXECUTOR_IO_LONG = int(EXECUTOR_IO_LONG) if EXECUTOR_IO_LONG.isdigit() else 64
+
+    EXECUTOR_IO_SHORT = environ.get("EXECUTOR_IO_SHORT", "")
+    EXECUTOR_IO_SHORT = int(EXECUTOR_IO_SHORT) if EXECUTOR_IO_SHORT.isdigit() else 32
+
+    EXECUTOR_CPU = environ.get("EXECUTOR_CPU", "")
+    EXECUTOR_CPU = int(EXECUTOR_CPU) if EXECUTOR_CPU.isdigit() else 0
+
     INCOMPLETE_TASK_NOTIFIER = environ.get("INCOMPLETE_TASK_NOTIFIER", "")
     INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == "true"
     if not INCOMPLETE_TASK_NOTIFIER and DATABASE_URL:
@@ -382,6 +408,17 @@ async def load_config():
     MEDIA_GROUP = environ.get("MEDIA_GROUP", "")
     MEDIA_GROUP = MEDIA_GROUP.lower() == "true"
 
+    LEECH_PARALLEL_UPLOADS = environ.get("LEECH_PARALLEL_UPLOADS", "")
+    LEECH_PARALLEL_UPLOADS = (
+        int(LEECH_PARALLEL_UPLOADS) if LEECH_PARALLEL_UPLOADS.isdigit() else 1
+    )
+
+    UPLOAD_DEDUPE = environ.get("UPLOAD_DEDUPE", "")
+    UPLOAD_DEDUPE = UPLOAD_DEDUPE.lower() == "true"
+
+    UPLOAD_DEDUPE_VERIFY = environ.get("UPLOAD_DEDUPE_VERIFY", "")
+    UPLOAD_DEDUPE_VERIFY = UPLOAD_DEDUPE_VERIFY.lower() == "true"
+
     BASE_URL_PORT = environ.get("BASE_URL_PORT", "")
     BASE_URL_PORT = 80 if len(BASE_URL_PORT) == 0 else int(BASE_URL_PORT)
 
@@ -389,6 +426,13 @@ async def load_config():
     if len(RCLONE_SERVE_URL) == 0:
         RCLONE_SERVE_URL = ""
 
+    RCLONE_RCD = environ.get("RCLONE_RCD", "")
+    RCLONE_RCD = RCLONE_RCD.lower() == "true"
+
+    RCLONE_RCD_BWLIMIT = environ.get("RCLONE_RCD_BWLIMIT", "")
+    if len(RCLONE_RCD_BWLIMIT) == 0:
+        RCLONE_RCD_BWLIMIT = ""
+
     RCLONE_SERVE_PORT = environ.get("RCLONE_SERVE_PORT", "")
     RCLONE_SERVE_PORT = 8080 if len(RCLONE_SERVE_PORT) == 0 else int(RCLONE_SERVE_PORT)
 
@@ -429,6 +473,16 @@ async def load_config():
     DIRECT_LIMIT = environ.get("DIRECT_LIMIT", "")
     DIRECT_LIMIT = "" if len(DIRECT_LIMIT) == 0 else float(DIRECT_LIMIT)
 
+    DIRECT_PARALLEL_DOWNLOADS = environ.get("DIRECT_PARALLEL_DOWNLOADS", "")
+    DIRECT_PARALLEL_DOWNLOADS = (
+        int(DIRECT_PARALLEL_DOWNLOADS) if DIRECT_PARALLEL_DOWNLOADS.isdigit() else 4
+    )
+
+    DIRECT_DOWNLOAD_RETRIES = environ.get("DIRECT_DOWNLOAD_RETRIES", "")
+    DIRECT_DOWNLOAD_RETRIES = (
+        int(DIRECT_DOWNLOAD_RETRIES) if DIRECT_DOWNLOAD_RETRIES.isdigit() else 2
+    )
+
     YTDLP_LIMIT = environ.get("YTDLP_LIMIT", "")
     YTDLP_LIMIT = "" if len(YTDLP_LIMIT) == 0 else float(YTDLP_LIMIT)
 
@@ -534,6 +588,12 @@ async def load_config():
     if len(GD_INFO) == 0:
         GD_INFO = "Uploaded by WZML-X"
 
+    GD_CLONE_WORKERS = environ.get("GD_CLONE_WORKERS", "")
+    GD_CLONE_WORKERS = int(GD_CLONE_WORKERS) if GD_CLONE_WORKERS.isdigit() else 8
+
+    GD_UPLOAD_WORKERS = environ.get("GD_UPLOAD_WORKERS", "")
+    GD_UPLOAD_WORKERS = int(GD_UPLOAD_WORKERS) if GD_UPLOAD_WORKERS.isdigit() else 4
+
     SAVE_MSG = environ.get("SAVE_MSG", "")
     SAVE_MSG = SAVE_MSG.lower() == "true"
 
@@ -546,6 +606,9 @@ async def load_config():
     SCREENSHOTS_MODE = environ.get("SCREENSHOTS_MODE", "")
     SCREENSHOTS_MODE = SCREENSHOTS_MODE.lower() == "true"
 
+    SCREENSHOTS_SHEET = environ.get("SCREENSHOTS_SHEET", "")
+    SCREENSHOTS_SHEET = SCREENSHOTS_SHEET.lower() == "true"
+
     CLEAN_LOG_MSG = environ.get("CLEAN_LOG_MSG", "")
     CLEAN_LOG_MSG = CLEAN_LOG_MSG.lower() == "true"
 
@@ -689,6 +752,8 @@ async def load_config():
             "STORAGE_THRESHOLD": STORAGE_THRESHOLD,
             "TORRENT_LIMIT": TORRENT_LIMIT,
             "DIRECT_LIMIT": DIRECT_LIMIT,
+            "DIRECT_PARALLEL_DOWNLOADS": DIRECT_PARALLEL_DOWNLOADS,
+            "DIRECT_DOWNLOAD_RETRIES": DIRECT_DOWNLOAD_RETRIES,
             "YTDLP_LIMIT": YTDLP_LIMIT,
             "GDRIVE_LIMIT": GDRIVE_LIMIT,
             "CLONE_LIMIT": CLONE_LIMIT,
@@ -716,6 +781,8 @@ async def load_config():
             "COVER_IMAGE": COVER_IMAGE,
             "TITLE_NAME": TITLE_NAME,
             "GD_INFO": GD_INFO,
+            "GD_CLONE_WORKERS": GD_CLONE_WORKERS,
+            "GD_UPLOAD_WORKERS": GD_UPLOAD_WORKERS,
             "GDTOT_CRYPT": GDTOT_CRYPT,
             "JIODRIVE_TOKEN": JIODRIVE_TOKEN,
             "EQUAL_SPLITS": EQUAL_SPLITS,
@@ -735,6 +802,9 @@ async def load_config():
             "LOGIN_PASS": LOGIN_PASS,
             "TOKEN_TIMEOUT": TOKEN_TIMEOUT,
             "MEDIA_GROUP": MEDIA_GROUP,
+            "LEECH_PARALLEL_UPLOADS": LEECH_PARALLEL_UPLOADS,
+            "UPLOAD_DEDUPE": UPLOAD_DEDUPE,
+            "UPLOAD_DEDUPE_VERIFY": UPLOAD_DEDUPE_VERIFY,
             "MEGA_EMAIL": MEGA_EMAIL,
             "MEGA_PASSWORD": MEGA_PASSWORD,
             "METADATA": METADATA,
@@ -743,9 +813,15 @@ async def load_config():
             "QUEUE_ALL": QUEUE_ALL,
             "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
             "QUEUE_UPLOAD": QUEUE_UPLOAD,
+            "QUEUE_CPU": QUEUE_CPU,
+            "EXECUTOR_IO_LONG": EXECUTOR_IO_LONG,
+            "EXECUTOR_IO_SHORT": EXECUTOR_IO_SHORT,
+            "EXECUTOR_CPU": EXECUTOR_CPU,
             "RCLONE_FLAGS": RCLONE_FLAGS,
             "RCLONE_PATH": RCLONE_PATH,
             "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
+            "RCLONE_RCD": RCLONE_RCD,
+            "RCLONE_RCD_BWLIMIT": RCLONE_RCD_BWLIMIT,
             "RCLONE_SERVE_USER": RCLONE_SERVE_USER,
             "RCLONE_SERVE_PASS": RCLONE_SERVE_PASS,
             "RCLONE_SERVE_PORT": RCLONE_SERVE_PORT,
@@ -759,6 +835,7 @@ async def load_config():
             "SET_COMMANDS": SET_COMMANDS,
             "SHOW_MEDIAINFO": SHOW_MEDIAINFO,
             "SCREENSHOTS_MODE": SCREENSHOTS_MODE,
+            "SCREENSHOTS_SHEET": SCREENSHOTS_SHEET,
             "CLEAN_LOG_MSG": CLEAN_LOG_MSG,
             "SHOW_EXTRA_CMDS": SHOW_EXTRA_CMDS,
             "SOURCE_LINK": SOURCE_LINK,
@@ -784,6 +861,7 @@ async def load_config():
 
     if DATABASE_URL:
         await DbManger().update_config(config_dict)
+    resize_executors()
     await gather(initiate_search_tools(), start_from_queued(), rclone_serve_booter())
 
 
@@ -950,6 +1028,7 @@ async def edit_variable(_, message, pre_message, key):
     elif key == "LEECH_SPLIT_SIZE":
         value = min(int(value), MAX_SPLIT_SIZE)
     elif key == "BOT_THEME":
+        await sync_to_async(theme_registry.load)
         if not value.strip() in AVL_THEMES.keys():
             value = "minimal"
     elif key == "CAP_FONT":
@@ -998,8 +1077,10 @@ async def edit_variable(_, message, pre_message, key):
         await DbManger().update_config({key: value})
     if key in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
         await initiate_search_tools()
-    elif key in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+    elif key in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD", "QUEUE_CPU"]:
         await start_from_queued()
+    elif key.startswith("EXECUTOR_"):
+        resize_executors()
     elif key in [
         "RCLONE_SERVE_URL",
         "RCLONE_SERVE_PORT",
@@ -1187,7 +1268,10 @@ async def update_private_file(_, message, pre_message):
         else:
             await deleteMessage(message)
     if file_name == "rclone.conf":
+        rcd_pool.release("rclone.conf")
         await rclone_serve_booter()
+    elif file_name in ["accounts", "accounts.zip"]:
+        rcd_pool.release("rclone_sa")
     await update_buttons(pre_message)
     if DATABASE_URL:
         await DbManger().update_private_file(path)
@@ -1297,8 +1381,10 @@ async def edit_bot_settings(client, query):
             await DbManger().update_config({data[2]: value})
         if data[2] in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
             await initiate_search_tools()
-        elif data[2] in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+        elif data[2] in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD", "QUEUE_CPU"]:
             await start_from_queued()
+        elif data[2].startswith("EXECUTOR_"):
+            resize_executors()
         elif data[2] in [
             "RCLONE_SERVE_URL",
             "RCLONE_SERVE_PORT",
@@ -2,7 +2,7 @@
 from pyrogram.handlers import MessageHandler
 from pyrogram.filters import command
 from secrets import token_hex
-from asyncio import sleep, gather
+from asyncio import gather
 from aiofiles.os import path as aiopath
 from cloudscraper import create_scraper as cget
 from json import loads, dumps as jdumps
@@ -50,6 +50,7 @@ from bot.helper.mirror_utils.download_utils.direct_link_generator import (
 from bot.helper.mirror_utils.rclone_utils.list import RcloneList
 from bot.helper.mirror_utils.rclone_utils.transfer import RcloneTransferHelper
 from bot.helper.ext_utils.help_messages import CLONE_HELP_MESSAGE
+from bot.helper.ext_utils.bulk_links import ingest_tasks
 from bot.helper.mirror_utils.status_utils.rclone_status import RcloneStatus
 from bot.helper.listeners.tasks_listener import MirrorLeechListener
 from bot.helper.themes import BotTheme
@@ -199,7 +200,7 @@ async def gdcloneNode(message, link, listen_up):
             message, f"<i><b>Processing Link:</b></i> <code>{link}</code>"
         )
         try:
-            link = await sync_to_async(direct_link_generator, link)
+            link = await sync_to_async(direct_link_generator, link, pool="io-long")
             LOGGER.info(f"Generated link: {link}")
             await editMessage(
                 process_msg, f"<i><b>Generated Link:</b></i> <code>{link}</code>"
@@ -212,7 +213,9 @@ async def gdcloneNode(message, link, listen_up):
         await deleteMessage(process_msg)
     if is_gdrive_link(link):
         gd = GoogleDriveHelper()
-        name, mime_type, size, files, _ = await sync_to_async(gd.count, link)
+        name, mime_type, size, files, _ = await sync_to_async(
+            gd.count, link, pool="io-long"
+        )
         if org_link:
             cget().request(
                 "POST",
@@ -232,7 +235,7 @@ async def gdcloneNode(message, link, listen_up):
         if config_dict["STOP_DUPLICATE"]:
             LOGGER.info("Checking File/Folder if already in Drive...")
             telegraph_content, contents_no = await sync_to_async(
-                gd.drive_list, name, True, True
+                gd.drive_list, name, True, True, pool="io-long"
             )
             if telegraph_content:
                 msg = BotTheme("STOP_DUPLICATE", content=contents_no)
@@ -258,7 +261,7 @@ async def gdcloneNode(message, link, listen_up):
                 message, f"<i><b>Cloning:</b></i> <code>{link}</code>"
             )
             link, size, mime_type, files, folders = await sync_to_async(
-                drive.clone, link, listener.drive_id
+                drive.clone, link, listener.drive_id, pool="io-long"
             )
             await deleteMessage(msg)
         else:
@@ -269,7 +272,7 @@ async def gdcloneNode(message, link, listen_up):
                 )
             await sendStatusMessage(message)
             link, size, mime_type, files, folders = await sync_to_async(
-                drive.clone, link, listener.drive_id
+                drive.clone, link, listener.drive_id, pool="io-long"
             )
         if not link:
             return
@@ -327,20 +330,14 @@ async def clone(client, message):
     @new_task
     async def __run_multi():
         if multi > 1:
-            await sleep(5)
             msg = [s.strip() for s in input_list]
             index = msg.index("-i")
-            msg[index + 1] = f"{multi - 1}"
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=message.reply_to_message_id + 1
-            )
-            nextmsg = await sendMessage(nextmsg, " ".join(msg))
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=nextmsg.id
-            )
-            nextmsg.from_user = message.from_user
-            await sleep(5)
-            clone(client, nextmsg)
+            del msg[index : index + 2]
+            reply_ids = [message.reply_to_message_id + i for i in range(1, multi)]
+            async for nextmsg in ingest_tasks(
+                client, message, [" ".join(msg)] * len(reply_ids), reply_ids
+            ):
+                clone(client, nextmsg)
 
     __run_multi()
 
@@ -33,7 +33,9 @@ async def driveclean(_, message):
         return await sendMessage(message, "No GDrive Link Provided")
     clean_msg = await sendMessage(message, "<i>Fetching ...</i>")
     gd = GoogleDriveHelper()
-    name, mime_type, size, files, folders = await sync_to_async(gd.count, link)
+    name, mime_type, size, files, folders = await sync_to_async(
+        gd.count, link, pool="io-long"
+    )
     try:
         drive_id = GoogleDriveHelper.getIdFromUrl(link)
     except (KeyError, IndexError):
@@ -75,7 +77,9 @@ async def drivecleancb(_, query):
         await query.answer()
         await editMessage(message, "<i>Processing Drive Clean / Trash...</i>")
         drive = GoogleDriveHelper()
-        msg = await sync_to_async(drive.driveclean, data[2], trash=len(data) == 4)
+        msg = await sync_to_async(
+            drive.driveclean, data[2], trash=len(data) == 4, pool="io-long"
+        )
         await editMessage(message, msg)
     elif data[1] == "stop":
         await query.answer()
@@ -44,6 +44,7 @@ async def _list_drive(key, message, user_id, item_type, isRecursive):
         isRecursive=isRecursive,
         itemType=item_type,
         userId=user_id,
+        pool="io-long",
     )
     if telegraph_content:
         try:
@@ -4,7 +4,7 @@ from html import escape
 from traceback import format_exc
 from base64 import b64encode
 from re import match as re_match
-from asyncio import sleep, wrap_future
+from asyncio import wrap_future
 from aiofiles import open as aiopen
 from aiofiles.os import path as aiopath
 from cloudscraper import create_scraper
@@ -70,14 +70,17 @@ from bot.helper.ext_utils.help_messages import (
     YT_HELP_MESSAGE,
     help_string,
 )
-from bot.helper.ext_utils.bulk_links import extract_bulk_links
+from bot.helper.ext_utils.bulk_links import (
+    bulk_same_dir,
+    extract_bulk_links,
+    ingest_tasks,
+    uses_same_dir,
+)
 from bot.modules.gen_pyro_sess import get_decrypt_key
 
 
 @new_task
-async def _mirror_leech(
-    client, message, isQbit=False, isLeech=False, sameDir=None, bulk=[]
-):
+async def _mirror_leech(client, message, isQbit=False, isLeech=False, sameDir=None):
     text = message.text.split("\n")
     input_list = text[0].split(" ")
 
@@ -190,6 +193,8 @@ async def _mirror_leech(
         folder_name = f"/{folder_name}"
         if sameDir is None:
             sameDir = {"total": multi, "tasks": set(), "name": folder_name}
+        elif not sameDir["name"]:
+            sameDir["name"] = folder_name
         sameDir["tasks"].add(message.id)
 
     if isBulk:
@@ -203,44 +208,30 @@ async def _mirror_leech(
                 "Reply to text file or tg message that have links seperated by new line!",
             )
             return
-        b_msg = input_list[:1]
-        b_msg.append(f"{bulk[0]} -i {len(bulk)}")
-        nextmsg = await sendMessage(message, " ".join(b_msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
-        )
-        nextmsg.from_user = message.from_user
-        _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir, bulk)
+        texts = [f"{input_list[0]} {line}" for line in bulk]
+        sameDir = bulk_same_dir(bulk)
+        async for nextmsg in ingest_tasks(client, message, texts):
+            if sameDir and uses_same_dir(nextmsg.text):
+                sameDir["tasks"].add(nextmsg.id)
+                _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir)
+            else:
+                _mirror_leech(client, nextmsg, isQbit, isLeech)
         return
 
-    if len(bulk) != 0:
-        del bulk[0]
-
     @new_task
     async def __run_multi():
         if multi <= 1:
             return
-        await sleep(5)
-        if len(bulk) != 0:
-            msg = input_list[:1]
-            msg.append(f"{bulk[0]} -i {multi - 1}")
-            nextmsg = await sendMessage(message, " ".join(msg))
-        else:
-            msg = [s.strip() for s in input_list]
-            index = msg.index("-i")
-            msg[index + 1] = f"{multi - 1}"
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=message.reply_to_message_id + 1
-            )
-            nextmsg = await sendMessage(nextmsg, " ".join(msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
-        )
-        if folder_name:
-            sameDir["tasks"].add(nextmsg.id)
-        nextmsg.from_user = message.from_user
-        await sleep(5)
-        _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir, bulk)
+        msg = [s.strip() for s in input_list]
+        index = msg.index("-i")
+        del msg[index : index + 2]
+        reply_ids = [message.reply_to_message_id + i for i in range(1, multi)]
+        async for nextmsg in ingest_tasks(
+            client, message, [" ".join(msg)] * len(reply_ids), reply_ids
+        ):
+            if folder_name:
+                sameDir["tasks"].add(nextmsg.id)
+            _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir)
 
     __run_multi()
 
@@ -357,7 +348,7 @@ async def _mirror_leech(
             try:
                 if not is_magnet(link) and (ussr or pssw):
                     link = (link, (ussr, pssw))
-                link = await sync_to_async(direct_link_generator, link)
+                link = await sync_to_async(direct_link_generator, link, pool="io-long")
                 if isinstance(link, tuple):
                     link, headers = link
                 elif isinstance(link, str):
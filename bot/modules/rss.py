@@ -2,11 +2,11 @@
 from feedparser import parse as feedparse
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 from pyrogram.filters import command, regex, create
-from asyncio import Lock, sleep
+from asyncio import Lock, Semaphore, gather, sleep
 from datetime import datetime, timedelta
 from time import time
 from functools import partial
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from apscheduler.triggers.interval import IntervalTrigger
 from re import split as re_split
 from io import BytesIO
@@ -22,12 +22,20 @@ from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.telegram_helper.button_build import ButtonMaker
-from bot.helper.ext_utils.bot_utils import new_thread
+from bot.helper.ext_utils.bot_utils import new_thread, sync_to_async
 from bot.helper.ext_utils.exceptions import RssShutdownException
 from bot.helper.ext_utils.help_messages import RSS_HELP_MESSAGE
 
 rss_dict_lock = Lock()
 handler_dict = {}
+rss_session = None
+rss_validators = {}
+rss_chat_locks = {}
+rss_chat_sent = {}
+
+RSS_FETCH_LIMIT = 20
+RSS_HOST_LIMIT = 4
+RSS_SEND_INTERVAL = 3
 
 
 async def rssMenu(event):
@@ -120,10 +128,7 @@ async def rssSub(client, message, pre_event):
             exf = None
             cmd = None
         try:
-            async with ClientSession(trust_env=True) as session:
-                async with session.get(feed_link) as res:
-                    html = await res.text()
-            rss_d = feedparse(html)
+            rss_d, _ = await fetchFeed(feed_link)
             last_title = rss_d.entries[0]["title"]
             msg += "<b>Subscribed!</b>"
             msg += f"\n<b>Title: </b><code>{title}</code>\n<b>Feed Url: </b>{feed_link}"
@@ -312,10 +317,7 @@ async def rssGet(client, message, pre_event):
                 msg = await sendMessage(
                     message, f"Getting the last <b>{count}</b> item(s) from {title}"
                 )
-                async with ClientSession(trust_env=True) as session:
-                    async with session.get(data["link"]) as res:
-                        html = await res.text()
-                rss_d = feedparse(html)
+                rss_d, _ = await fetchFeed(data["link"])
                 item_info = ""
                 for item_num in range(count):
                     try:
@@ -620,6 +622,117 @@ Timeout: 60 sec. Argument -c for command and options
             await query.answer(text="Already Running!", show_alert=True)
 
 
+async def getRssSession():
+    global rss_session
+    if rss_session is None or rss_session.closed:
+        rss_session = ClientSession(
+            connector=TCPConnector(
+                limit=RSS_FETCH_LIMIT, limit_per_host=RSS_HOST_LIMIT
+            ),
+            timeout=ClientTimeout(total=60),
+            trust_env=True,
+        )
+    return rss_session
+
+
+async def fetchFeed(link, validators=None):
+    session = await getRssSession()
+    headers = {}
+    if validators:
+        if etag := validators.get("etag"):
+            headers["If-None-Match"] = etag
+        if modified := validators.get("modified"):
+            headers["If-Modified-Since"] = modified
+    async with session.get(link, headers=headers) as res:
+        if res.status == 304:
+            return None, validators
+        html = await res.text()
+        validators = {
+            "etag": res.headers.get("ETag"),
+            "modified": res.headers.get("Last-Modified"),
+        }
+    return await sync_to_async(feedparse, html, pool="cpu"), validators
+
+
+async def sendRssThrottled(text):
+    chat = config_dict["RSS_CHAT"]
+    if chat not in rss_chat_locks:
+        rss_chat_locks[chat] = Lock()
+    async with rss_chat_locks[chat]:
+        if (wait := rss_chat_sent.get(chat, 0) + RSS_SEND_INTERVAL - time()) > 0:
+            try:
+                await sleep(wait)
+            except Exception:
+                raise RssShutdownException("Rss Monitor Stopped!")
+        await sendRss(text)
+        rss_chat_sent[chat] = time()
+
+
+async def rssFeedCheck(user, title, data, semaphore):
+    # per subscription, a shared feed may be up to date for one and not another
+    key = (user, title, data["link"])
+    async with semaphore:
+        rss_d, validators = await fetchFeed(data["link"], rss_validators.get(key))
+    if rss_d is None:
+        return
+    try:
+        last_link = rss_d.entries[0]["links"][1]["href"]
+    except IndexError:
+        last_link = rss_d.entries[0]["link"]
+    last_title = rss_d.entries[0]["title"]
+    if data["last_feed"] == last_link or data["last_title"] == last_title:
+        rss_validators[key] = validators
+        return
+    feed_count = 0
+    while True:
+        try:
+            item_title = rss_d.entries[feed_count]["title"]
+            try:
+                url = rss_d.entries[feed_count]["links"][1]["href"]
+            except IndexError:
+                url = rss_d.entries[feed_count]["link"]
+            if data["last_feed"] == url or data["last_title"] == item_title:
+                break
+        except IndexError:
+            LOGGER.warning(
+                f"Reached Max index no. {feed_count} for this feed: {title}. Maybe you need to use less RSS_DELAY to not miss some torrents"
+            )
+            break
+        parse = True
+        for flist in data["inf"]:
+            if all(x not in item_title.lower() for x in flist):
+                parse = False
+                feed_count += 1
+                break
+        for flist in data["exf"]:
+            if any(x in item_title.lower() for x in flist):
+                parse = False
+                feed_count += 1
+                break
+        if not parse:
+            continue
+        if command := data["command"]:
+            cmd = command.split(maxsplit=1)
+            cmd.insert(1, url)
+            feed_msg = " ".join(cmd)
+            if not feed_msg.startswith("/"):
+                feed_msg = f"/{feed_msg}"
+        else:
+            feed_msg = f"<b>Name: </b><code>{item_title.replace('>', '').replace('<', '')}</code>\n\n"
+            feed_msg += f"<b>Link: </b><code>{url}</code>"
+        feed_msg += f"\n<b>Tag: </b><code>{data['tag']}</code> <code>{user}</code>"
+        await sendRssThrottled(feed_msg)
+        feed_count += 1
+    async with rss_dict_lock:
+        if user not in rss_dict or not rss_dict[user].get(title, False):
+            return
+        rss_dict[user][title].update({"last_feed": last_link, "last_title": last_title})
+    rss_validators[key] = validators
+    await DbManger().rss_update(user)
+    LOGGER.info(f"Feed Name: {title}")
+    LOGGER.info(f"Last item: {last_link}")
+
+
 async def rssMonitor():
     if not config_dict["RSS_CHAT"]:
         LOGGER.warning("RSS_CHAT not added! Shutting down rss scheduler...")
@@ -628,88 +741,26 @@ async def rssMonitor():
     if len(rss_dict) == 0:
         scheduler.pause()
         return
-    all_paused = True
-    for user, items in list(rss_dict.items()):
-        for title, data in list(items.items()):
-            try:
-                if data["paused"]:
-                    continue
-                async with ClientSession(trust_env=True) as session:
-                    async with session.get(data["link"]) as res:
-                        html = await res.text()
-                rss_d = feedparse(html)
-                try:
-                    last_link = rss_d.entries[0]["links"][1]["href"]
-                except IndexError:
-                    last_link = rss_d.entries[0]["link"]
-                finally:
-                    all_paused = False
-                last_title = rss_d.entries[0]["title"]
-                if data["last_feed"] == last_link or data["last_title"] == last_title:
-                    continue
-                feed_count = 0
-                while True:
-                    try:
-                        await sleep(10)
-                    except Exception:
-                        raise RssShutdownException("Rss Monitor Stopped!")
-                    try:
-                        item_title = rss_d.entries[feed_count]["title"]
-                        try:
-                            url = rss_d.entries[feed_count]["links"][1]["href"]
-                        except IndexError:
-                            url = rss_d.entries[feed_count]["link"]
-                        if data["last_feed"] == url or data["last_title"] == item_title:
-                            break
-                    except IndexError:
-                        LOGGER.warning(
-                            f"Reached Max index no. {feed_count} for this feed: {title}. Maybe you need to use less RSS_DELAY to not miss some torrents"
-                        )
-                        break
-                    parse = True
-                    for flist in data["inf"]:
-                        if all(x not in item_title.lower() for x in flist):
-                            parse = False
-                            feed_count += 1
-                            break
-                    for flist in data["exf"]:
-                        if any(x in item_title.lower() for x in flist):
-                            parse = False
-                            feed_count += 1
-                            break
-                    if not parse:
-                        continue
-                    if command := data["command"]:
-                        cmd = command.split(maxsplit=1)
-                        cmd.insert(1, url)
-                        feed_msg = " ".join(cmd)
-                        if not feed_msg.startswith("/"):
-                            feed_msg = f"/{feed_msg}"
-                    else:
-                        feed_msg = f"<b>Name: </b><code>{item_title.replace('>', '').replace('<', '')}</code>\n\n"
-                        feed_msg += f"<b>Link: </b><code>{url}</code>"
-                    feed_msg += (
-                        f"\n<b>Tag: </b><code>{data['tag']}</code> <code>{user}</code>"
-                    )
-                    await sendRss(feed_msg)
-                    feed_count += 1
-                async with rss_dict_lock:
-                    if user not in rss_dict or not rss_dict[user].get(title, False):
-                        continue
-                    rss_dict[user][title].update(
-                        {"last_feed": last_link, "last_title": last_title}
-                    )
-                await DbManger().rss_update(user)
-                LOGGER.info(f"Feed Name: {title}")
-                LOGGER.info(f"Last item: {last_link}")
-            except RssShutdownException as ex:
-                LOGGER.info(ex)
-                break
-            except Exception as e:
-                LOGGER.error(f"{e} - Feed Name: {title} - Feed Link: {data['link']}")
-                continue
-    if all_paused:
+    feeds = [
+        (user, title, data)
+        for user, items in list(rss_dict.items())
+        for title, data in list(items.items())
+        if not data["paused"]
+    ]
+    if not feeds:
         scheduler.pause()
+        return
+    semaphore = Semaphore(RSS_FETCH_LIMIT)
+    results = await gather(
+        *[rssFeedCheck(user, title, data, semaphore) for user, title, data in feeds],
+        return_exceptions=True,
+    )
+    for (_, title, data), result in zip(feeds, results):
+        if isinstance(result, RssShutdownException):
+            LOGGER.info(result)
+            break
+        if isinstance(result, Exception):
+            LOGGER.error(f"{result} - Feed Name: {title} - Feed Link: {data['link']}")
 
 
 def addJob(delay):
@@ -24,7 +24,7 @@ TELEGRAPH_LIMIT = 300
 
 
 async def initiate_search_tools():
-    qbclient = await sync_to_async(get_client)
+    qbclient = get_client()
     qb_plugins = await sync_to_async(qbclient.search_plugins)
     if SEARCH_PLUGINS := config_dict["SEARCH_PLUGINS"]:
         globals()["PLUGINS"] = []
@@ -37,7 +37,6 @@ async def initiate_search_tools():
         for plugin in qb_plugins:
             await sync_to_async(qbclient.search_uninstall_plugin, names=plugin["name"])
         globals()["PLUGINS"] = []
-    await sync_to_async(qbclient.auth_log_out)
 
     if SEARCH_API_LINK := config_dict["SEARCH_API_LINK"]:
         global SITES
@@ -105,7 +104,7 @@ async def __search(key, site, message, method):
             return
     else:
         LOGGER.info(f"PLUGINS Searching: {key} from {site}")
-        client = await sync_to_async(get_client)
+        client = get_client()
         search = await sync_to_async(
             client.search_start, pattern=key, plugins=site, category="all"
         )
@@ -131,7 +130,6 @@ async def __search(key, site, message, method):
         msg = f"<b>Found {min(total_results, TELEGRAPH_LIMIT)}</b>"
         msg += f" <b>result(s) for <i>{key}</i>\nTorrent Site:- <i>{site.capitalize()}</i></b>"
         await sync_to_async(client.search_delete, search_id=search_id)
-        await sync_to_async(client.auth_log_out)
     link = await __getResult(search_results, key, message, method)
     buttons = ButtonMaker()
     buttons.ubutton("🔎 VIEW", link)
@@ -229,11 +227,10 @@ def __api_buttons(user_id, method):
 async def __plugin_buttons(user_id):
     buttons = ButtonMaker()
     if not PLUGINS:
-        qbclient = await sync_to_async(get_client)
+        qbclient = get_client()
         pl = await sync_to_async(qbclient.search_plugins)
         for name in pl:
             PLUGINS.append(name["name"])
-        await sync_to_async(qbclient.auth_log_out)
     for siteName in PLUGINS:
         buttons.ibutton(siteName.capitalize(), f"torser {user_id} {siteName} plugin")
     buttons.ibutton("All", f"torser {user_id} all plugin")
@@ -49,6 +49,7 @@ from bot.helper.ext_utils.bot_utils import (
     is_gdrive_link,
 )
 from bot.helper.mirror_utils.upload_utils.ddlserver.gofile import Gofile
+from bot.helper.mirror_utils.rclone_utils.rcd import rcd_pool
 from bot.helper.themes import BotTheme
 
 handler_dict = {}
@@ -804,7 +805,9 @@ async def set_thumb(client, message, pre_event, key, direct=False):
         await mkdir(path)
     photo_dir = await message.download()
     des_dir = ospath.join(path, f"{user_id}.jpg")
-    await sync_to_async(Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG")
+    await sync_to_async(
+        Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG", pool="cpu"
+    )
     await aioremove(photo_dir)
     update_user_ldata(user_id, "thumb", des_dir)
     await deleteMessage(message)
@@ -821,6 +824,7 @@ async def add_rclone(client, message, pre_event):
         await mkdir(path)
     des_dir = ospath.join(path, f"{user_id}.conf")
     await message.download(file_name=des_dir)
+    rcd_pool.release(des_dir)
     update_user_ldata(user_id, "rclone", f"rclone/{user_id}.conf")
     await deleteMessage(message)
     await update_user_settings(pre_event, "rcc", "mirror")
@@ -1054,6 +1058,7 @@ async def edit_user_settings(client, query):
         if await aiopath.exists(rclone_path):
             await query.answer()
             await aioremove(rclone_path)
+            rcd_pool.release(rclone_path)
             update_user_ldata(user_id, "rclone", "")
             await update_user_settings(query, "rcc", "mirror")
             if DATABASE_URL:
@@ -1148,6 +1153,7 @@ async def edit_user_settings(client, query):
             await aioremove(thumb_path)
         if await aiopath.exists(rclone_path):
             await aioremove(rclone_path)
+            rcd_pool.release(rclone_path)
         await query.answer()
         update_user_ldata(user_id, None, None)
         await update_user_settings(query)
@@ -1164,6 +1170,7 @@ async def edit_user_settings(client, query):
             await aioremove(thumb_path)
         if await aiopath.exists(rclone_path):
             await aioremove(rclone_path)
+            rcd_pool.release(rclone_path)
         update_user_ldata(user_id, None, None)
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 from pyrogram.filters import command, regex, user
-from asyncio import sleep, wait_for, Event, wrap_future
+from asyncio import wait_for, Event, wrap_future
 from aiohttp import ClientSession
 from aiofiles.os import path as aiopath
 from yt_dlp import YoutubeDL
@@ -41,7 +41,12 @@ from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.listeners.tasks_listener import MirrorLeechListener
 from bot.helper.ext_utils.help_messages import YT_HELP_MESSAGE
-from bot.helper.ext_utils.bulk_links import extract_bulk_links
+from bot.helper.ext_utils.bulk_links import (
+    bulk_same_dir,
+    extract_bulk_links,
+    ingest_tasks,
+    uses_same_dir,
+)
 
 
 @new_task
@@ -272,7 +277,7 @@ async def _mdisk(link, name):
 
 
 @new_task
-async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
+async def _ytdl(client, message, isLeech=False, sameDir=None):
     text = message.text.split("\n")
     input_list = text[0].split(" ")
     qual = ""
@@ -347,6 +352,8 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
         folder_name = f"/{folder_name}"
         if sameDir is None:
             sameDir = {"total": multi, "tasks": set(), "name": folder_name}
+        elif not sameDir["name"]:
+            sameDir["name"] = folder_name
         sameDir["tasks"].add(message.id)
 
     if isBulk:
@@ -360,44 +367,30 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
                 "Reply to text file or tg message that have links seperated by new line!",
             )
             return
-        b_msg = input_list[:1]
-        b_msg.append(f"{bulk[0]} -i {len(bulk)}")
-        nextmsg = await sendMessage(message, " ".join(b_msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
-        )
-        nextmsg.from_user = message.from_user
-        _ytdl(client, nextmsg, isLeech, sameDir, bulk)
+        texts = [f"{input_list[0]} {line}" for line in bulk]
+        sameDir = bulk_same_dir(bulk)
+        async for nextmsg in ingest_tasks(client, message, texts):
+            if sameDir and uses_same_dir(nextmsg.text):
+                sameDir["tasks"].add(nextmsg.id)
+                _ytdl(client, nextmsg, isLeech, sameDir)
+            else:
+                _ytdl(client, nextmsg, isLeech)
         return
 
-    if len(bulk) != 0:
-        del bulk[0]
-
     @new_task
     async def __run_multi():
         if multi <= 1:
             return
-        await sleep(5)
-        if len(bulk) != 0:
-            msg = input_list[:1]
-            msg.append(f"{bulk[0]} -i {multi - 1}")
-            nextmsg = await sendMessage(message, " ".join(msg))
-        else:
-            msg = [s.strip() for s in input_list]
-            index = msg.index("-i")
-            msg[index + 1] = f"{multi - 1}"
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=message.reply_to_message_id + 1
-            )
-            nextmsg = await sendMessage(nextmsg, " ".join(msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
-        )
-        if folder_name:
-            sameDir["tasks"].add(nextmsg.id)
-        nextmsg.from_user = message.from_user
-        await sleep(5)
-        _ytdl(client, nextmsg, isLeech, sameDir, bulk)
+        msg = [s.strip() for s in input_list]
+        index = msg.index("-i")
+        del msg[index : index + 2]
+        reply_ids = [message.reply_to_message_id + i for i in range(1, multi)]
+        async for nextmsg in ingest_tasks(
+            client, message, [" ".join(msg)] * len(reply_ids), reply_ids
+        ):
+            if folder_name:
+                sameDir["tasks"].add(nextmsg.id)
+            _ytdl(client, nextmsg, isLeech, sameDir)
 
     path = f"{DOWNLOAD_DIR}{message.id}{folder_name}"
 
@@ -581,7 +574,7 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
         options["playlist_items"] = "0"
 
     try:
-        result = await sync_to_async(extract_info, link, options)
+        result = await sync_to_async(extract_info, link, options, pool="io-long")
     except Exception as e:
         msg = str(e).replace("<", " ").replace(">", " ")
         await sendMessage(message, f"{tag} {msg}")
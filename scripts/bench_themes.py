@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compares BotTheme rendering through the ThemeRegistry's compiled templates
+with the previous per-call lookup (new WZMLStyle instance + getattr +
+format_map), after checking both render the same text.
+
+Run from the repo root: python3 scripts/bench_themes.py [renders]
+"""
+
+from logging import getLogger
+from os import path as ospath
+from sys import argv, modules, path as syspath
+from timeit import timeit
+from types import ModuleType
+
+ROOT = ospath.dirname(ospath.dirname(ospath.abspath(__file__)))
+syspath.insert(0, ROOT)
+
+# importing the real bot package would boot the whole bot, only the names
+# the themes package needs are provided
+bot = ModuleType("bot")
+bot.__path__ = [ospath.join(ROOT, "bot")]
+bot.config_dict = {"BOT_THEME": "minimal"}
+bot.LOGGER = getLogger("bench")
+modules["bot"] = bot
+
+from bot.helper.themes import AVL_THEMES, BotTheme, wzml_minimal  # noqa: E402
+
+config_dict = bot.config_dict
+
+
+def legacy_bot_theme(var_name, **format_vars):
+    text = None
+    theme_ = config_dict["BOT_THEME"]
+    if theme_ in AVL_THEMES:
+        text = getattr(AVL_THEMES[theme_].WZMLStyle(), var_name, None)
+    if text is None:
+        text = getattr(wzml_minimal.WZMLStyle(), var_name)
+    return text.format_map(format_vars)
+
+
+def render(theme):
+    return theme("STATUS_NAME", Name="ubuntu-22.04-desktop-amd64.iso") + theme(
+        "PROCESSED", Processed="1.2GB of 4.6GB"
+    )
+
+
+if __name__ == "__main__":
+    renders = int(argv[1]) if len(argv) > 1 else 100000
+    assert render(legacy_bot_theme) == render(BotTheme)
+    for name, theme in [("uncached", legacy_bot_theme), ("compiled", BotTheme)]:
+        elapsed = timeit(lambda: render(theme), number=renders // 2)
+        print(f"{name}: {elapsed:.3f}s for {renders} renders")
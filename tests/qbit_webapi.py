@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+from secrets import token_hex
+
+from aiohttp import web
+
+
+class FakeQbitWebApi:
+    """
+    In-process stand-in for the qBittorrent Web API endpoints the bot polls:
+    auth/login, sync/maindata with rid deltas, torrents/reannounce and
+    torrents/recheck. Every change bumps the rid, so maindata answers with
+    only the fields changed since the rid a client sends back.
+    """
+
+    def __init__(self, username="admin", password="adminadmin"):
+        self.username = username
+        self.password = password
+        self.torrents = {}
+        self.reannounced = []
+        self.rechecked = []
+        self.logins = 0
+        self.__sid = None
+        self.__rid = 0
+        self.__changes = {}
+        self.__removed = {}
+        self.__runner = None
+        self.port = None
+
+    def add(self, hash_, **fields):
+        self.torrents[hash_] = {}
+        self.update(hash_, **fields)
+
+    def update(self, hash_, **fields):
+        self.__rid += 1
+        self.torrents[hash_].update(fields)
+        self.__changes.setdefault(hash_, {}).update({key: self.__rid for key in fields})
+
+    def remove(self, hash_):
+        self.__rid += 1
+        del self.torrents[hash_]
+        self.__changes.pop(hash_, None)
+        self.__removed[hash_] = self.__rid
+
+    def __authorized(self, request):
+        return self.__sid is not None and request.cookies.get("SID") == self.__sid
+
+    async def __login(self, request):
+        data = await request.post()
+        if data.get("username") != self.username or (
+            data.get("password") != self.password
+        ):
+            return web.Response(text="Fails.")
+        self.logins += 1
+        self.__sid = token_hex(16)
+        response = web.Response(text="Ok.")
+        response.set_cookie("SID", self.__sid)
+        return response
+
+    async def __maindata(self, request):
+        if not self.__authorized(request):
+            return web.Response(status=403, text="Forbidden")
+        rid = int(request.query.get("rid", 0))
+        if rid == 0:
+            body = {
+                "rid": self.__rid,
+                "full_update": True,
+                "torrents": {h: dict(t) for h, t in self.torrents.items()},
+            }
+            return web.json_response(body)
+        torrents = {}
+        for hash_, fields in self.__changes.items():
+            if delta := {
+                key: self.torrents[hash_][key]
+                for key, changed in fields.items()
+                if changed > rid
+            }:
+                torrents[hash_] = delta
+        body = {"rid": self.__rid, "torrents": torrents}
+        if removed := [h for h, changed in self.__removed.items() if changed > rid]:
+            body["torrents_removed"] = removed
+        return web.json_response(body)
+
+    def __hashes_handler(self, calls):
+        async def handler(request):
+            if not self.__authorized(request):
+                return web.Response(status=403, text="Forbidden")
+            data = await request.post()
+            calls.extend(data.get("hashes", "").split("|"))
+            return web.Response(text="")
+
+        return handler
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/api/v2/auth/login", self.__login)
+        app.router.add_get("/api/v2/sync/maindata", self.__maindata)
+        app.router.add_post(
+            "/api/v2/torrents/reannounce", self.__hashes_handler(self.reannounced)
+        )
+        app.router.add_post(
+            "/api/v2/torrents/recheck", self.__hashes_handler(self.rechecked)
+        )
+        self.__runner = web.AppRunner(app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self.__runner.addresses[0][1]
+        return self
+
+    async def stop(self):
+        if self.__runner is not None:
+            await self.__runner.cleanup()
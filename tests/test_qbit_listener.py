@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+from asyncio import run
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("qbittorrentapi")
+
+from qbit_webapi import FakeQbitWebApi  # noqa: E402
+
+# importing through the bot package would boot the whole bot
+spec = spec_from_file_location(
+    "qbit_client",
+    Path(__file__).parents[1] / "bot" / "helper" / "ext_utils" / "qbit_client.py",
+)
+qbit_client = module_from_spec(spec)
+spec.loader.exec_module(qbit_client)
+
+TICK_STATES = ["metaDL", "stalledDL"]
+
+
+def make_client(fake):
+    return qbit_client.AsyncQbitClient(
+        None,
+        qbit_client.RpcMetrics(),
+        fake.username,
+        fake.password,
+        host="127.0.0.1",
+        port=fake.port,
+    )
+
+
+def test_maindata_rid_deltas():
+    async def scenario():
+        fake = await FakeQbitWebApi().start()
+        client = make_client(fake)
+        try:
+            fake.add("a" * 40, name="one", state="metaDL", tags="1", progress=0)
+            fake.add("b" * 40, name="two", state="downloading", tags="2", progress=0)
+            torrents = {}
+
+            maindata = await client.sync_maindata(rid=0)
+            assert maindata["full_update"]
+            changed = qbit_client.apply_maindata(torrents, maindata)
+            assert changed == {"a" * 40, "b" * 40}
+            assert fake.logins == 1
+
+            fake.update("a" * 40, state="downloading", progress=0.5)
+            maindata = await client.sync_maindata(rid=maindata["rid"])
+            assert maindata["torrents"] == {
+                "a" * 40: {"state": "downloading", "progress": 0.5}
+            }
+            changed = qbit_client.apply_maindata(torrents, maindata)
+            assert changed == {"a" * 40}
+            assert torrents["a" * 40]["name"] == "one"
+            assert torrents["a" * 40]["hash"] == "a" * 40
+
+            fake.remove("b" * 40)
+            maindata = await client.sync_maindata(rid=maindata["rid"])
+            assert maindata["torrents_removed"] == ["b" * 40]
+            assert qbit_client.apply_maindata(torrents, maindata) == set()
+            assert list(torrents) == ["a" * 40]
+
+            await client.torrents_reannounce(["a" * 40])
+            await client.torrents_recheck("a" * 40)
+            assert fake.reannounced == ["a" * 40]
+            assert fake.rechecked == ["a" * 40]
+        finally:
+            await client.close()
+            await fake.stop()
+
+    run(scenario())
+
+
+def test_state_handlers_dispatch():
+    calls = []
+
+    def handler(name):
+        async def handle(client, tor_info, reannounce):
+            calls.append((name, tor_info.hash))
+            if name == "metaDL":
+                reannounce.append(tor_info.hash)
+
+        return handle
+
+    handlers = {state: handler(state) for state in ["metaDL", "downloading"]}
+    default = handler("other")
+    torrents = {}
+    tracked = {"1": {"seen": False}, "2": {"seen": False}, "3": {"seen": False}}
+    maindata = {
+        "full_update": True,
+        "torrents": {
+            "a": {"state": "metaDL", "tags": "1"},
+            "b": {"state": "downloading", "tags": "2"},
+            "c": {"state": "pausedUP", "tags": "3"},
+            "d": {"state": "downloading", "tags": "not-ours"},
+        },
+    }
+
+    async def dispatch(changed):
+        reannounce = []
+        await qbit_client.dispatch_states(
+            torrents,
+            changed,
+            tracked,
+            handlers,
+            default,
+            TICK_STATES,
+            None,
+            reannounce,
+        )
+        return reannounce
+
+    changed = qbit_client.apply_maindata(torrents, maindata)
+    assert run(dispatch(changed)) == ["a"]
+    assert sorted(calls) == [("downloading", "b"), ("metaDL", "a"), ("other", "c")]
+
+    # unchanged torrents only tick while their state needs timeouts
+    calls.clear()
+    assert run(dispatch(set())) == ["a"]
+    assert calls == [("metaDL", "a")]
+
+    calls.clear()
+    changed = qbit_client.apply_maindata(
+        torrents, {"torrents": {"b": {"state": "stalledUP"}}}
+    )
+    run(dispatch(changed))
+    assert sorted(calls) == [("metaDL", "a"), ("other", "b")]
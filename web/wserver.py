@@ -9,6 +9,12 @@ from web.nodes import make_tree
 app = Flask(__name__)
 
 aria2 = ariaAPI(ariaClient(host="http://localhost", port=6800, secret=""))
+qbittorrent_client = qbClient(
+    host="localhost",
+    port=8090,
+    VERIFY_WEBUI_CERTIFICATE=False,
+    REQUESTS_ARGS={"timeout": (30, 60)},
+)
 
 basicConfig(
     format="[%(asctime)s] [%(levelname)s] - %(message)s",
@@ -675,9 +681,7 @@ def re_verfiy(paused, resumed, client, hash_id):
         if verify:
             break
         LOGGER.info("Reverification Failed! Correcting stuff...")
-        client.auth_log_out()
         sleep(1)
-        client = qbClient(host="localhost", port="8090")
         try:
             client.torrents_file_priority(
                 torrent_hash=hash_id, file_ids=paused, priority=0
@@ -717,10 +721,8 @@ def list_torrent_contents(id_):
         return "<h1>Incorrect pin code</h1>"
 
     if len(id_) > 20:
-        client = qbClient(host="localhost", port="8090")
-        res = client.torrents_files(torrent_hash=id_)
+        res = qbittorrent_client.torrents_files(torrent_hash=id_)
         cont = make_tree(res)
-        client.auth_log_out()
     else:
         res = aria2.client.get_files(id_)
         cont = make_tree(res, True)
@@ -749,24 +751,25 @@ def set_priority(id_):
         pause = pause.strip("|")
         resume = resume.strip("|")
 
-        client = qbClient(host="localhost", port="8090")
-
         try:
-            client.torrents_file_priority(torrent_hash=id_, file_ids=pause, priority=0)
+            qbittorrent_client.torrents_file_priority(
+                torrent_hash=id_, file_ids=pause, priority=0
+            )
         except NotFound404Error as e:
             raise NotFound404Error from e
         except Exception as e:
             LOGGER.error(f"{e} Errored in paused")
         try:
-            client.torrents_file_priority(torrent_hash=id_, file_ids=resume, priority=1)
+            qbittorrent_client.torrents_file_priority(
+                torrent_hash=id_, file_ids=resume, priority=1
+            )
         except NotFound404Error as e:
             raise NotFound404Error from e
         except Exception as e:
             LOGGER.error(f"{e} Errored in resumed")
         sleep(1)
-        if not re_verfiy(pause, resume, client, id_):
+        if not re_verfiy(pause, resume, qbittorrent_client, id_):
             LOGGER.error(f"Verification Failed! Hash: {id_}")
-        client.auth_log_out()
     else:
         for i, value in data.items():
             if "filenode" in i and value == "on":